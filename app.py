@@ -1,14 +1,42 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, send_from_directory
+# Açılış süresi ölçümü ilk içe aktarmadan başlar
+from startup import timer as startup_timer, Deferred
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, send_file, abort, make_response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from werkzeug.exceptions import HTTPException
 from datetime import datetime
+import base64
+import binascii
+import hashlib
+import hmac
+import io
+import mimetypes
 import os
 import json
 import random
 import time
 import sys
 import threading
-import webbrowser
 from functools import wraps
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from question_bank import STAGES, QuestionBank
+from event_bus import EventBus
+from db_writer import WriteQueue
+from game_cache import GameCache
+from assets import AssetManifest
+from wheel_engine import WheelEngine, SpinBuffer
+from leaderboard import Standings
+from metrics import Metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from migrations import Migrator
+import bulk_io
+import game_log
+import log_config
+
+startup_timer.mark('imports')
+log_config.configure()
+log = log_config.get_logger('app')
+static_log = log_config.get_logger('static')
 
 # Function to get the base path for resources
 def get_base_path():
@@ -16,81 +44,141 @@ def get_base_path():
     if getattr(sys, 'frozen', False):
         # Running in a PyInstaller bundle
         base = sys._MEIPASS
-        print(f"PyInstaller detected. Using _MEIPASS: {base}")
+        log.debug("PyInstaller detected. Using _MEIPASS: %s", base)
         return base
     else:
         # Running in normal Python environment
         base = os.path.dirname(os.path.abspath(__file__))
-        print(f"Normal Python environment. Using __file__ directory: {base}")
+        log.debug("Normal Python environment. Using __file__ directory: %s", base)
         return base
 
 # Set up Flask with proper template and static folders for PyInstaller
 base_path = get_base_path()
 template_folder = os.path.join(base_path, 'templates')
 static_folder = os.path.join(base_path, 'static')
+build_folder = os.path.join(base_path, 'build')
+template_data_folder = os.path.join(base_path, 'TemplateData')
+
+def index_directory(path):
+    """Klasördeki dosyaları (alt klasörler dahil) göreli yol -> tam yol olarak listele"""
+    files = {}
+    for root, _, names in os.walk(path):
+        for name in names:
+            full_path = os.path.join(root, name)
+            files[os.path.relpath(full_path, path).replace(os.sep, '/')] = full_path
+    return files
+
+def scan_resources():
+    """Kaynak klasörlerini açılışta bir kez tara; istekler sırasında diske sorulmaz.
+
+    Unity build, TemplateData ve static dosyaları indekslenir; sonradan
+    eklenen dosyalar yeniden başlatınca görünür (var olan dosyaların içeriği
+    her istekte güncel okunur).
+    """
+    probes = 0
+    probes += 1
+    if not os.path.isdir(template_folder):
+        log.warning("Template klasörü bulunamadı: %s", template_folder)
+    indexes = {}
+    for group, folder in (('build', build_folder), ('TemplateData', template_data_folder), ('static', static_folder)):
+        probes += 1
+        indexes[group] = index_directory(folder)
+        if not indexes[group]:
+            log.warning("%s klasörü boş ya da bulunamadı: %s", group, folder)
+    log.debug("Base path: %s (%d dosya sistemi kontrolü, %s)", base_path, probes,
+              ', '.join(f'{group}: {len(files)} dosya' for group, files in indexes.items()))
+    return indexes, probes
+
+def load_static_resources():
+    """Kaynak indeksi ve derlenmiş statik dosya manifest'i (python assets.py build).
 
-print(f"Base path: {base_path}")
-print(f"Template folder: {template_folder}")
-print(f"Static folder: {static_folder}")
-print(f"Template folder exists: {os.path.exists(template_folder)}")
-print(f"Static folder exists: {os.path.exists(static_folder)}")
+    Manifest yoksa dosyalar sürümsüz sunulur. PyInstaller paketinde manifest
+    kontrolü dosya içeriklerini hash'leyebildiği için içe aktarırken değil,
+    açılışta arka planda (ya da ilk statik istekte) yapılır.
+    """
+    sources, probes = scan_resources()
+    manifest = AssetManifest.load(base_path)
+    return sources, manifest, probes + manifest.probes
 
-# List contents of base path
-if os.path.exists(base_path):
-    print(f"Contents of base path: {os.listdir(base_path)}")
+static_resources = Deferred('static', load_static_resources)
 
 app = Flask(__name__, 
            template_folder=template_folder,
            static_folder=static_folder)
 
-# Retry decorator for database operations
-def retry_on_database_lock(max_retries=3, delay=0.1):
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            for attempt in range(max_retries):
-                try:
-                    # Force clean session state
-                    db.session.remove()
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    if "database is locked" in str(e).lower() and attempt < max_retries - 1:
-                        print(f"Database lock detected, retrying... (attempt {attempt + 1})")
-                        # Comprehensive cleanup
-                        try:
-                            db.session.rollback()
-                            db.session.remove()
-                            db.session.close()
-                        except:
-                            pass
-                        time.sleep(delay * (2 ** attempt))  # Exponential backoff
-                        continue
-                    # Re-raise if not a lock error or max retries reached
-                    raise
-            return None
-        return wrapper
-    return decorator
+# İstek süresi ve SQL ölçümleri (/api/metrics), ilk isteğe kadar geçen açılış süresi
+metrics = Metrics().install(app)
+startup_timer.install(app)
+
+# Soru bankası: etaplar ilk kullanımda yüklenir; sunucu açılırken arka planda yüklenir ve
+# dosyalar izlenmeye başlanır (değişen dosya doğrulanıp istek yolunun dışında yeniden yüklenir)
+question_bank = QuestionBank(base_path)
+question_bank_warmup = Deferred('question_bank', question_bank.watch)
+
+# Reji ve wall ekranlarına oyun olaylarını iten olay yolları (/api/events), her oyuna bir tane
+_event_buses = {}
+_event_buses_lock = threading.Lock()
+
+def game_bus(game_id):
+    """Oyunun olay yolunu getir, yoksa oluştur"""
+    bus = _event_buses.get(game_id)
+    if bus is None:
+        with _event_buses_lock:
+            bus = _event_buses.setdefault(game_id, EventBus())
+    return bus
+
+# Oyun bazlı okuma önbelleği (yarışmacı listesi, 2. etap şıkları)
+game_cache = GameCache()
 
 # Database configuration
 app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///timetunnel.db'
+# TIMETUNNEL_DATABASE_URL ile başka bir veritabanı kullanılabilir (ör. benchmark için geçici dosya)
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('TIMETUNNEL_DATABASE_URL', 'sqlite:///timetunnel.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-# SQLite-specific engine configuration to prevent locks
+# SQLite: WAL modunda okuyucular yazarı beklemez, yazmalar tek thread'den yapılır
+SQLITE_BUSY_TIMEOUT_MS = 5000
+
 app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
     'pool_pre_ping': True,
     'pool_recycle': 300,
     'connect_args': {
-        'timeout': 30,
+        'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000,
         'check_same_thread': False
     }
 }
 
 db = SQLAlchemy(app)
 
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Her yeni SQLite bağlantısında WAL ve bekleme ayarlarını uygula"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+    cursor.close()
+
+with app.app_context():
+    event.listen(db.engine, 'connect', set_sqlite_pragmas)
+
+# Bütün yazma işlemleri bu kuyruk üzerinden tek thread'de yapılır
+writer = WriteQueue(app, db)
+
 # Database Models
+DEFAULT_GAME_ID = 1  # /api/... adresleri (oyun belirtilmeden) bu oyunu kullanır
+
+class Game(db.Model):
+    """Aynı sunucuda çalışan ayrı yarışma/stüdyo; diğer kayıtlar bir oyuna bağlıdır"""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+def game_id_column(**kwargs):
+    return db.Column(db.Integer, db.ForeignKey('game.id'), nullable=False, index=True, **kwargs)
+
 class WheelSpin(db.Model):
     id = db.Column(db.Integer, primary_key=True)
+    game_id = game_id_column()
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     result = db.Column(db.String(100), nullable=False)
     user_id = db.Column(db.String(50))
@@ -98,20 +186,337 @@ class WheelSpin(db.Model):
 
 class Contestant(db.Model):
     id = db.Column(db.Integer, primary_key=True)
+    game_id = game_id_column()
     name = db.Column(db.String(100), nullable=False)
     score = db.Column(db.Integer, default=0)
     eliminated = db.Column(db.Boolean, default=False)
     active = db.Column(db.Boolean, default=True)
-    photo = db.Column(db.Text)  # Base64 fotoğraf verisi
+    photo = db.Column(db.Text)  # Eski sürümlerden kalma base64 fotoğraf, açılışta Photo tablosuna taşınır
+    photo_hash = db.Column(db.String(64), db.ForeignKey('photo.hash'), index=True)
+
+# Sıralama sorguları (puan azalan, eşitlikte id) indeksten okunur
+db.Index('ix_contestant_game_score', Contestant.game_id, Contestant.score.desc(), Contestant.id)
+db.Index('ix_contestant_game_active_score', Contestant.game_id, Contestant.active, Contestant.score.desc(), Contestant.id)
+
+class Photo(db.Model):
+    """Yarışmacı fotoğrafları; içerik hash'i ile tekilleştirilir"""
+    hash = db.Column(db.String(64), primary_key=True)  # sha256
+    mimetype = db.Column(db.String(50), nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+    thumbnail = db.Column(db.LargeBinary)  # JPEG küçük resim (Pillow varsa)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class GameState(db.Model):
     id = db.Column(db.Integer, primary_key=True)
+    game_id = game_id_column(unique=True)
     current_stage = db.Column(db.Integer, default=0)
-    current_question_id = db.Column(db.Integer, default=0)
-    used_questions = db.Column(db.Text, default='[]')  # JSON array of used question IDs
-    stage2_option_states = db.Column(db.Text, default='{}')  # JSON object for stage 2 option states
+    current_question_id = db.Column(db.Integer, default=0)  # 2. etapta şık durumları gösterilen soru
+    used_questions = db.Column(db.Text, default='[]')  # Eski sürümlerden kalma, yerini QuestionDeck aldı
+    stage2_option_states = db.Column(db.Text, default='{}')  # Eski sürümlerden kalma, yerini Stage2OptionState aldı
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Stage2OptionState(db.Model):
+    """2. etap şık durumu; her şık ayrı satır, değişiklik tek satırlık upsert"""
+    game_id = db.Column(db.Integer, db.ForeignKey('game.id'), primary_key=True)
+    question_id = db.Column(db.Integer, primary_key=True)
+    option_index = db.Column(db.Integer, primary_key=True)
+    state = db.Column(db.String(10), nullable=False)  # 'D', 'Y' veya 'def'
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class QuestionDeck(db.Model):
+    """Etap bazlı karıştırılmış soru destesi.
+
+    Sıralama seed'den soru id'leri üzerinde üretilir; her çekilişte yalnızca
+    position ilerler. Soru kümesi (id'ler) değişince deste yeniden karıştırılır.
+    """
+    game_id = db.Column(db.Integer, db.ForeignKey('game.id'), primary_key=True)
+    stage = db.Column(db.Integer, primary_key=True)
+    seed = db.Column(db.Integer, nullable=False, default=0)
+    position = db.Column(db.Integer, nullable=False, default=0)
+    size = db.Column(db.Integer, nullable=False, default=0)
+    question_hash = db.Column(db.String(16))  # Karıştırılan soru id'lerinin hash'i
+    last_question_id = db.Column(db.Integer)
+
+class GameEvent(db.Model):
+    """Puan, eleme ve şık değişikliklerinin yalnızca eklenen kaydı"""
+    id = db.Column(db.Integer, primary_key=True)
+    game_id = game_id_column()
+    kind = db.Column(db.String(30), nullable=False)
+    contestant_id = db.Column(db.Integer)
+    payload = db.Column(db.Text, nullable=False, default='{}')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class GameSnapshot(db.Model):
+    """last_event_id anındaki yarışmacı ve oyun durumu"""
+    __table_args__ = (db.Index('ix_game_snapshot_game_event', 'game_id', 'last_event_id'),)
+    id = db.Column(db.Integer, primary_key=True)
+    game_id = db.Column(db.Integer, db.ForeignKey('game.id'), nullable=False)
+    last_event_id = db.Column(db.Integer, nullable=False, index=True)
+    state = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Olay kaydı yardımcıları
+SNAPSHOT_INTERVAL = 1000  # Bu kadar olayda bir snapshot alınır
+# Oyun -> son snapshot'ın olay id'si; olay yazarken her seferinde sorgulanmasın (yazar thread'inde güncellenir)
+_snapshot_marks = {}
+
+def capture_state(game_id):
+    """Oyunun tablolardaki güncel durumunu game_log biçiminde oku"""
+    state = game_log.empty_state()
+    for c in Contestant.query.filter_by(game_id=game_id):
+        state['contestants'][str(c.id)] = {
+            'id': c.id,
+            'name': c.name,
+            'score': c.score or 0,
+            'eliminated': bool(c.eliminated),
+            'active': bool(c.active),
+            'photo_hash': c.photo_hash,
+        }
+    state['stage2_question_id'] = db.session.query(GameState.current_question_id).filter_by(game_id=game_id).scalar() or 0
+    for row in Stage2OptionState.query.filter_by(game_id=game_id):
+        state['stage2_options'].setdefault(str(row.question_id), {})[str(row.option_index)] = row.state
+    return state
+
+def take_snapshot(game_id, last_event_id=None):
+    """Oyunun güncel durumunun snapshot'ını mevcut transaction'a ekle"""
+    if last_event_id is None:
+        last_event_id = db.session.query(db.func.max(GameEvent.id)).filter(GameEvent.game_id == game_id).scalar() or 0
+    snapshot = GameSnapshot(game_id=game_id, last_event_id=last_event_id,
+                            state=json.dumps(capture_state(game_id), ensure_ascii=False))
+    db.session.add(snapshot)
+    _snapshot_marks[game_id] = max(_snapshot_marks.get(game_id, 0), last_event_id)
+    return snapshot
+
+def last_snapshot_event_id(game_id):
+    """Oyunun son snapshot'ının olay id'si (ilk kullanımda veritabanından okunur)"""
+    mark = _snapshot_marks.get(game_id)
+    if mark is None:
+        mark = _snapshot_marks[game_id] = db.session.query(db.func.max(GameSnapshot.last_event_id)).filter(
+            GameSnapshot.game_id == game_id).scalar() or 0
+    return mark
+
+def log_events(game_id, *events):
+    """(kind, payload) olaylarını mevcut transaction'a tek INSERT ile ekle, id'lerini döndür"""
+    if not events:
+        return []
+    db.session.flush()
+    now = datetime.utcnow()
+    # ORM nesnesi üretmeden executemany: toplu içe aktarmada binlerce olay tek seferde yazılır
+    ids = db.session.scalars(
+        db.insert(GameEvent).returning(GameEvent.id, sort_by_parameter_order=True),
+        [{'game_id': game_id, 'kind': kind, 'contestant_id': payload.get('id'),
+          'payload': json.dumps(payload, ensure_ascii=False), 'created_at': now}
+         for kind, payload in events]).all()
+    
+    if ids[-1] - last_snapshot_event_id(game_id) >= SNAPSHOT_INTERVAL:
+        take_snapshot(game_id, ids[-1])
+    return ids
+
+def ensure_baseline_snapshots():
+    """Snapshot'ı olmayan oyunlar için mevcut tabloları başlangıç durumu olarak kaydet"""
+    has_snapshot = db.session.query(GameSnapshot.id).filter(GameSnapshot.game_id == Game.id).exists()
+    for (game_id,) in db.session.query(Game.id).filter(~has_snapshot).all():
+        take_snapshot(game_id)
+    db.session.commit()
+
+def reconstruct_state(game_id, event_id=None):
+    """event_id anındaki durumu oyunun son snapshot'ı + sonraki olaylarından üret"""
+    snapshot_query = GameSnapshot.query.filter_by(game_id=game_id)
+    event_query = db.session.query(GameEvent.kind, GameEvent.payload).filter(GameEvent.game_id == game_id)
+    if event_id is not None:
+        snapshot_query = snapshot_query.filter(GameSnapshot.last_event_id <= event_id)
+        event_query = event_query.filter(GameEvent.id <= event_id)
+    snapshot = snapshot_query.order_by(GameSnapshot.last_event_id.desc(), GameSnapshot.id.desc()).first()
+    
+    if snapshot:
+        state = game_log.upgrade_state(json.loads(snapshot.state))
+        event_query = event_query.filter(GameEvent.id > snapshot.last_event_id)
+    else:
+        state = game_log.empty_state()
+    events = ((kind, json.loads(payload)) for kind, payload in event_query.order_by(GameEvent.id))
+    return game_log.replay(state, events)
+
+# Fotoğraf yardımcıları
+PHOTO_CACHE_SECONDS = 365 * 24 * 3600
+THUMBNAIL_SIZE = (256, 256)
+
+def decode_photo(photo):
+    """data URL ya da base64 fotoğrafı (mimetype, bytes) olarak çöz"""
+    mimetype = 'image/jpeg'
+    if photo.startswith('data:'):
+        header, _, photo = photo.partition(',')
+        mimetype = header[5:].split(';')[0] or mimetype
+    if not mimetype.startswith('image/'):
+        raise ValueError(f'Desteklenmeyen fotoğraf tipi: {mimetype}')
+    return mimetype, base64.b64decode(photo)
+
+def load_pillow():
+    """Küçük resim üretimi için Pillow opsiyonel; yoksa orijinal fotoğraf sunulur"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+pillow = Deferred('pillow', load_pillow)
+
+def make_thumbnail(data):
+    """Fotoğrafın küçültülmüş JPEG kopyasını üret (Pillow yoksa None)"""
+    Image = pillow.get()
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail(THUMBNAIL_SIZE)
+            output = io.BytesIO()
+            image.convert('RGB').save(output, 'JPEG', quality=85)
+            return output.getvalue()
+    except Exception as e:
+        log.warning("Küçük resim oluşturulamadı: %s", e)
+        return None
+
+def prepare_photo(photo):
+    """Fotoğrafı çöz, hash'ini ve küçük resmini hazırla (veritabanına dokunmaz)"""
+    if not photo:
+        return None
+    mimetype, data = decode_photo(photo)
+    return {'hash': hashlib.sha256(data).hexdigest(), 'mimetype': mimetype,
+            'data': data, 'thumbnail': make_thumbnail(data)}
+
+def store_photo(prepared):
+    """Hazırlanmış fotoğrafı kaydet ve hash'ini döndür; aynı içerik yalnızca bir kez saklanır"""
+    if not prepared:
+        return None
+    if db.session.get(Photo, prepared['hash']) is None:
+        db.session.add(Photo(**prepared))
+    return prepared['hash']
+
+def delete_unused_photo(photo_hash):
+    """Başka yarışmacı kullanmıyorsa fotoğrafı sil"""
+    if photo_hash and not Contestant.query.filter_by(photo_hash=photo_hash).first():
+        Photo.query.filter_by(hash=photo_hash).delete()
+
+def photo_url(contestant, thumbnail=False):
+    """Yarışmacı fotoğrafının sürümlü (önbelleklenebilir) adresi"""
+    if not contestant.photo_hash:
+        return None
+    params = {'v': contestant.photo_hash[:16]}
+    if thumbnail:
+        params['size'] = 'thumb'
+    return url_for('contestant_photo', game_id=contestant.game_id, contestant_id=contestant.id, **params)
+
+def serialize_contestant(contestant):
+    return {
+        'id': contestant.id,
+        'name': contestant.name,
+        'score': contestant.score,
+        'eliminated': contestant.eliminated,
+        'active': contestant.active,
+        'photo': photo_url(contestant),
+        'thumbnail': photo_url(contestant, thumbnail=True)
+    }
+
+# Şema taşımaları: her adım veritabanında bir kez çalışır (PRAGMA user_version)
+migrations = Migrator()
+
+def table_columns(table):
+    return {row[1] for row in db.session.execute(db.text(f"PRAGMA table_info({table})"))}
+
+@migrations.step(1, 'contestant.photo ve photo_hash kolonları')
+def migrate_photo_columns():
+    """Fotoğraf kolonları olmayan eski contestant tablolarına kolonları ekle (veri silinmez)"""
+    columns = table_columns('contestant')
+    if 'photo' not in columns:
+        db.session.execute(db.text("ALTER TABLE contestant ADD COLUMN photo TEXT"))
+    if 'photo_hash' not in columns:
+        db.session.execute(db.text("ALTER TABLE contestant ADD COLUMN photo_hash VARCHAR(64) REFERENCES photo (hash)"))
+    db.session.commit()
+
+GAME_TABLES = ('contestant', 'game_state', 'wheel_spin', 'game_event', 'game_snapshot')
+
+@migrations.step(2, 'oyunlar: game_id kolonları ve varsayılan oyun')
+def migrate_games():
+    """Tek oyunlu eski veritabanlarındaki kayıtları varsayılan oyuna bağla"""
+    if db.session.get(Game, DEFAULT_GAME_ID) is None:
+        db.session.add(Game(id=DEFAULT_GAME_ID, name='Varsayılan oyun'))
+        db.session.commit()
+    
+    for table in GAME_TABLES:
+        if 'game_id' not in table_columns(table):
+            db.session.execute(db.text(
+                f"ALTER TABLE {table} ADD COLUMN game_id INTEGER NOT NULL DEFAULT {DEFAULT_GAME_ID} REFERENCES game (id)"))
+    
+    # Deste tablosunun birincil anahtarı değişti; desteler yalnızca karıştırma konumu tuttuğu için yeniden oluşturulur
+    if 'game_id' not in table_columns('question_deck'):
+        db.session.execute(db.text("DROP TABLE question_deck"))
+    db.session.commit()
+    db.create_all()
+    
+    # Her oyunun bir durum satırı olsun; yazmalar satırı oluşturmakla uğraşmasın
+    has_state = db.session.query(GameState.id).filter(GameState.game_id == Game.id).exists()
+    for (game_id,) in db.session.query(Game.id).filter(~has_state).all():
+        db.session.add(GameState(game_id=game_id))
+    db.session.commit()
+
+@migrations.step(3, 'eski base64 fotoğrafların Photo tablosuna taşınması')
+def migrate_legacy_photos():
+    """Contestant.photo kolonundaki base64 fotoğrafları Photo tablosuna taşı"""
+    legacy = Contestant.query.filter(Contestant.photo.isnot(None), Contestant.photo != '').all()
+    for contestant in legacy:
+        try:
+            contestant.photo_hash = store_photo(prepare_photo(contestant.photo))
+        except (ValueError, binascii.Error) as e:
+            log.warning("Fotoğraf taşınamadı (yarışmacı %s): %s", contestant.id, e)
+        contestant.photo = None
+    db.session.commit()
+    if legacy:
+        log.info("✅ %d yarışmacı fotoğrafı yeni tabloya taşındı", len(legacy))
+
+@migrations.step(4, 'eksik indeksler')
+def ensure_indexes():
+    """Sonradan eklenen kolonların indekslerini oluştur (create_all var olan tablolara dokunmaz)"""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+@migrations.step(5, "olay kaydı başlangıç snapshot'ları")
+def migrate_baseline_snapshots():
+    """Olay kaydının tekrar oynatılabilmesi için snapshot'ı olmayan oyunlara başlangıç snapshot'ı al"""
+    ensure_baseline_snapshots()
+
+@migrations.step(6, '2. etap şık durumları ayrı tabloya')
+def migrate_stage2_option_states():
+    """game_state.stage2_option_states JSON'unu oyunun güncel sorusunun satırlarına taşı"""
+    rows = []
+    for game_state in GameState.query.filter(GameState.stage2_option_states.notin_(['', '{}'])):
+        try:
+            legacy = json.loads(game_state.stage2_option_states)
+            for option_index, state in legacy.items():
+                rows.append({'game_id': game_state.game_id, 'question_id': game_state.current_question_id or 0,
+                             'option_index': int(option_index), 'state': game_log.option_state(state)})
+        except ValueError as e:
+            log.warning("Şık durumları taşınamadı (oyun %s): %s", game_state.game_id, e)
+        game_state.stage2_option_states = '{}'
+    if rows:
+        db.session.execute(sqlite_insert(Stage2OptionState).on_conflict_do_nothing(), rows)
+    db.session.commit()
+    if rows:
+        log.info("✅ %d şık durumu yeni tabloya taşındı", len(rows))
+
+@migrations.step(7, 'sıralama indeksleri')
+def migrate_leaderboard_indexes():
+    """Puanı boş eski kayıtları 0 yap (sıralama indeksi NULL'ları ayrı tutar) ve indeksleri oluştur"""
+    Contestant.query.filter(Contestant.score.is_(None)).update({'score': 0})
+    db.session.commit()
+    ensure_indexes()
+
+@migrations.step(8, 'soru destelerinde soru kümesi hash\'i')
+def migrate_deck_question_hash():
+    """Destelere soru kümesi hash'i kolonunu ekle; hash'i olmayan desteler sonraki çekilişte yeniden karıştırılır"""
+    if 'question_hash' not in table_columns('question_deck'):
+        db.session.execute(db.text("ALTER TABLE question_deck ADD COLUMN question_hash VARCHAR(16)"))
+    db.session.commit()
+
 # Routes
 @app.route('/')
 def index():
@@ -123,85 +528,178 @@ def wall():
 
 @app.route('/reji')
 def reji():
-    print(f"\n=== REJI ROUTE DEBUG ===")
-    print(f"App template folder: {app.template_folder}")
-    print(f"Template folder exists: {os.path.exists(app.template_folder) if app.template_folder else 'None'}")
-    if app.template_folder and os.path.exists(app.template_folder):
-        print(f"Templates available: {os.listdir(app.template_folder)}")
-    print(f"Looking for reji.html in: {app.template_folder}")
-    reji_template_path = os.path.join(app.template_folder, 'reji.html') if app.template_folder else None
-    if reji_template_path:
-        print(f"Full reji.html path: {reji_template_path}")
-        print(f"reji.html exists: {os.path.exists(reji_template_path)}")
-    print(f"=== END DEBUG ===")
-    
-    contestants = Contestant.query.all()
+    game_id = request.args.get('game', DEFAULT_GAME_ID, type=int)
+    contestants = Contestant.query.filter_by(game_id=game_id).all()
     return render_template('reji.html', contestants=contestants)
 
 
+# Static file routes for Build and TemplateData
+ASSET_CACHE_SECONDS = 365 * 24 * 3600
+LEGACY_ASSET_PREFIXES = {'build': '/Build/', 'TemplateData': '/TemplateData/', 'static': '/static/'}
 
+@app.template_global()
+def asset_url(path):
+    """'build/TimeTunnel.loader.js' gibi bir dosyanın sürümlü (uzun önbellekli) adresi"""
+    group, _, relpath = path.partition('/')
+    _, asset_manifest, _ = static_resources.get()
+    return asset_manifest.url(group, relpath) or LEGACY_ASSET_PREFIXES[group] + relpath
+
+def send_asset(group, filename, immutable=False):
+    """Açılışta indekslenmiş dosyayı gönder; varsa tarayıcının kabul ettiği sıkıştırılmış kopyayı seç.
+
+    İndekste olmayan dosya için diske hiç sorulmaz. ETag ve Range desteği
+    send_file'dan gelir; sürümlü adresler değişmediği için immutable önbelleklenir.
+    """
+    asset_sources, asset_manifest, _ = static_resources.get()
+    path = asset_sources[group].get(filename)
+    if path is None:
+        static_log.debug("Bulunamadı: %s/%s", group, filename)
+        abort(404)
+    
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    max_age = ASSET_CACHE_SECONDS if immutable else None
+    variants, file_hash = asset_manifest.variants(group, filename)
+    response = None
+    for encoding, variant_path in variants:
+        if not request.accept_encodings[encoding]:
+            continue
+        try:
+            response = send_file(variant_path, mimetype=mimetype, etag=f'{file_hash}-{encoding}', max_age=max_age)
+        except FileNotFoundError:
+            # Sunucu çalışırken assets/ yeniden derlendiyse sıkıştırılmamış dosyaya dön
+            static_log.warning("Sıkıştırılmış kopya bulunamadı: %s", variant_path)
+            continue
+        response.headers['Content-Encoding'] = encoding
+        break
+    if response is None:
+        response = send_file(path, mimetype=mimetype, etag=file_hash or True, max_age=max_age)
+    if variants:
+        response.vary.add('Accept-Encoding')
+    static_log.debug("%s/%s -> %s", group, filename, response.headers.get('Content-Encoding', 'identity'))
+    
+    if immutable:
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+@app.route('/assets/<group>/<version>/<path:filename>')
+def versioned_asset(group, version, filename):
+    asset_sources, asset_manifest, _ = static_resources.get()
+    if group not in asset_sources:
+        abort(404)
+    # Eski sürümün adresi istenirse güncel dosya önbelleklenmeden gönderilir
+    return send_asset(group, filename, immutable=version == asset_manifest.group_hash(group))
 
-# Static file routes for Build and TemplateData
 @app.route('/Build/<path:filename>')
 def build_files(filename):
-    build_path = os.path.join(base_path, 'build')  # Changed from 'Build' to 'build'
-    print(f"\n=== BUILD FILE REQUEST ===")
-    print(f"Requested file: {filename}")
-    print(f"Build path: {build_path}")
-    print(f"Build path exists: {os.path.exists(build_path)}")
-    if os.path.exists(build_path):
-        print(f"Files in Build: {os.listdir(build_path)}")
-    full_file_path = os.path.join(build_path, filename)
-    print(f"Full file path: {full_file_path}")
-    print(f"File exists: {os.path.exists(full_file_path)}")
-    print(f"=== END BUILD REQUEST ===")
-    return send_from_directory(build_path, filename)
+    return send_asset('build', filename)
 
 @app.route('/TemplateData/<path:filename>')
 def template_data_files(filename):
-    template_data_path = os.path.join(base_path, 'TemplateData')
-    print(f"\n=== TEMPLATE DATA REQUEST ===")
-    print(f"Requested file: {filename}")
-    print(f"TemplateData path: {template_data_path}")
-    print(f"TemplateData path exists: {os.path.exists(template_data_path)}")
-    if os.path.exists(template_data_path):
-        print(f"Files in TemplateData: {os.listdir(template_data_path)}")
-    print(f"=== END TEMPLATE DATA REQUEST ===")
-    return send_from_directory(template_data_path, filename)
+    return send_asset('TemplateData', filename)
 
 
 
 # API Routes
-@app.route('/api/contestants', methods=['GET', 'POST'])
-def contestants():
+def require_game(game_id):
+    """Oyun yoksa 404 döndür; oyunun bilgisini önbellekten getir"""
+    game = game_cache.get(game_id, 'game', lambda: db.session.query(Game.id, Game.name).filter_by(id=game_id).first())
+    if game is None:
+        abort(404)
+    return game
+
+def game_route(rule, **options):
+    """API adresini hem varsayılan oyun (/api/...) hem de /api/games/<game_id>/... altında kaydet"""
+    def decorator(func):
+        @wraps(func)
+        def view(game_id=DEFAULT_GAME_ID, **kwargs):
+            require_game(game_id)
+            return func(game_id, **kwargs)
+        
+        app.add_url_rule(rule, view_func=view, **options)
+        app.add_url_rule('/api/games/<int:game_id>' + rule[len('/api'):], view_func=view, **options)
+        return view
+    return decorator
+
+def cached_response(game_id, key, loader, build=None):
+    """Önbellekteki veriyi ETag ile döndür; istemcideki kopya güncelse veritabanına hiç sorma"""
+    etag = game_cache.etag(game_id, key)
+    if etag and request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        value = game_cache.get(game_id, key, loader)
+        response = jsonify(build(value) if build else value)
+    if etag:
+        response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+def serialize_game(game):
+    return {'id': game.id, 'name': game.name}
+
+@app.route('/api/games', methods=['GET', 'POST'])
+def games():
+    """Oyunları listele / yeni oyun (stüdyo, prova) oluştur"""
+    if request.method == 'POST':
+        data = request.get_json() or {}
+        name = (data.get('name') or '').strip()
+        if not name:
+            return jsonify({'success': False, 'error': 'Oyun adı gerekli'}), 400
+        
+        def create():
+            game = Game(name=name)
+            db.session.add(game)
+            db.session.flush()
+            db.session.add(GameState(game_id=game.id))
+            take_snapshot(game.id, 0)
+            return game.id
+        
+        game_id = writer.run(create)
+        return jsonify({'success': True, 'game': {'id': game_id, 'name': name}})
+    
+    return jsonify({'success': True, 'games': [serialize_game(g) for g in Game.query.order_by(Game.id)]})
+
+@game_route('/api/contestants', methods=['GET', 'POST'])
+def contestants(game_id):
     if request.method == 'POST':
         data = request.get_json()
         name = data.get('name')
         photo = data.get('photo')  # Base64 fotoğraf verisi
         if name:
             try:
-                contestant = Contestant(name=name, photo=photo)
+                prepared_photo = prepare_photo(photo)
+            except (ValueError, binascii.Error) as e:
+                return jsonify({'success': False, 'error': f'Geçersiz fotoğraf: {str(e)}'})
+            
+            def create():
+                photo_hash = store_photo(prepared_photo)
+                contestant = Contestant(game_id=game_id, name=name, photo_hash=photo_hash)
                 db.session.add(contestant)
-                db.session.commit()
-                return jsonify({'success': True, 'id': contestant.id})
+                db.session.flush()
+                event_ids = log_events(game_id, ('contestant_added', {'id': contestant.id, 'name': name, 'photo_hash': photo_hash}))
+                return contestant.id, event_ids[-1]
+            
+            try:
+                contestant_id, event_id = writer.run(create)
+                game_cache.invalidate(game_id, 'contestants')
+                contestant_data = serialize_contestant(db.session.get(Contestant, contestant_id))
+                standings = game_cache.peek(game_id, 'leaderboard')
+                if standings is not None:
+                    standings.put(event_id, contestant_data)
+                game_bus(game_id).publish('contestant_added', contestant_data)
+                return jsonify({'success': True, 'id': contestant_id, 'contestant': contestant_data})
             except Exception as e:
-                db.session.rollback()
-                print(f"Contestant creation error: {e}")
+                log.exception("Contestant creation error: %s", e)
                 return jsonify({'success': False, 'error': f'Veritabanı hatası: {str(e)}'})
         return jsonify({'success': False, 'error': 'Name required'})
     else:
         try:
-            contestants_list = Contestant.query.all()
-            return jsonify([{
-                'id': c.id,
-                'name': c.name,
-                'score': c.score,
-                'eliminated': c.eliminated,
-                'active': c.active,
-                'photo': getattr(c, 'photo', None)  # photo kolonu yoksa None döndür
-            } for c in contestants_list])
+            return cached_response(game_id, 'contestants', lambda: [
+                serialize_contestant(c) for c in Contestant.query.filter_by(game_id=game_id)])
         except Exception as e:
-            print(f"Contestants list error: {e}")
+            log.exception("Contestants list error: %s", e)
             if "no such column" in str(e).lower():
                 return jsonify({
                     'error': 'Veritabanı şema hatası. Lütfen uygulamayı yeniden başlatın.',
@@ -209,114 +707,444 @@ def contestants():
                 }), 500
             return jsonify({'error': f'Veritabanı hatası: {str(e)}'}), 500
 
-@app.route('/api/contestants/<int:contestant_id>/score', methods=['POST'])
-def update_score(contestant_id):
+@game_route('/api/events')
+def events(game_id):
+    """Oyun olay akışı (Server-Sent Events)"""
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    response = Response(game_bus(game_id).stream(last_event_id), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@game_route('/api/contestants/<int:contestant_id>/photo')
+def contestant_photo(game_id, contestant_id):
+    """Yarışmacı fotoğrafını ETag ve önbellek başlıklarıyla sun"""
+    photo_hash = db.session.query(Contestant.photo_hash).filter_by(id=contestant_id, game_id=game_id).scalar()
+    if not photo_hash:
+        abort(404)
+    
+    wants_thumbnail = request.args.get('size') == 'thumb'
+    etag = f'{photo_hash}-thumb' if wants_thumbnail else photo_hash
+    # Tarayıcıdaki kopya güncelse fotoğrafı veritabanından hiç okuma
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        photo = db.session.get(Photo, photo_hash)
+        if wants_thumbnail and photo.thumbnail:
+            response = make_response(photo.thumbnail)
+            response.mimetype = 'image/jpeg'
+        else:
+            response = make_response(photo.data)
+            response.mimetype = photo.mimetype
+    response.set_etag(etag)
+    
+    # Sürümlü adres içerik hash'ine bağlı olduğu için hiç değişmez
+    if request.args.get('v') == photo_hash[:16]:
+        response.cache_control.public = True
+        response.cache_control.max_age = PHOTO_CACHE_SECONDS
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+# Toplu içe/dışa aktarma
+EXPORT_BATCH_SIZE = 500  # Dışa aktarırken veritabanından bir seferde okunan satır
+CONTESTANT_EXPORT_FIELDS = ('id', 'name', 'score', 'eliminated', 'active', 'photo_hash')
+WHEEL_SPIN_EXPORT_FIELDS = ('id', 'timestamp', 'result', 'user_id')
+
+def export_response(records, fmt, fields, filename):
+    """Kayıtları okundukça NDJSON/CSV olarak gönderen yanıt"""
+    mimetype, extension = bulk_io.FORMATS[fmt]
+    response = Response(stream_with_context(bulk_io.chunks(records, fmt, fields)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}.{extension}'
+    response.cache_control.no_store = True
+    return response
+
+@game_route('/api/contestants/bulk', methods=['POST'])
+def import_contestants(game_id):
+    """NDJSON (application/x-ndjson) ya da CSV (text/csv) yarışmacı listesini tek transaction'da ekle.
+
+    Alanlar: name (zorunlu), score, eliminated, photo (data URL/base64) ya da
+    bu sunucuda kayıtlı bir photo_hash. Kayıtlardaki id yok sayılır, yeni id verilir.
+    """
+    fmt = bulk_io.detect_format(request.mimetype, request.args.get('format'))
+    if fmt is None:
+        return jsonify({'success': False, 'error': 'İçerik tipi application/x-ndjson ya da text/csv olmalı'}), 415
+    
+    rows = []
+    try:
+        for line, record in bulk_io.read_records(request.stream, fmt):
+            name = str(record.get('name') or '').strip()
+            if not name:
+                raise bulk_io.BulkFormatError(line, 'name gerekli')
+            try:
+                rows.append({
+                    'name': name,
+                    'score': bulk_io.parse_int(record.get('score')),
+                    'eliminated': bulk_io.parse_bool(record.get('eliminated')),
+                    'photo': prepare_photo(record.get('photo')),
+                    'photo_hash': record.get('photo_hash') or None,
+                })
+            except (ValueError, binascii.Error) as e:
+                raise bulk_io.BulkFormatError(line, str(e)) from None
+    except bulk_io.BulkFormatError as e:
+        return jsonify({'success': False, 'error': str(e), 'line': e.line}), 400
+    except UnicodeDecodeError:
+        return jsonify({'success': False, 'error': 'Dosya UTF-8 olmalı'}), 400
+    if not rows:
+        return jsonify({'success': False, 'error': 'Kayıt bulunamadı'}), 400
+    
+    def insert():
+        # İş yeniden denenebilir; rows değiştirilmez
+        stored = set()
+        values = []
+        for row in rows:
+            photo_hash = row['photo_hash']
+            if row['photo']:
+                photo_hash = row['photo']['hash']
+                if photo_hash not in stored:
+                    store_photo(row['photo'])
+            elif photo_hash and photo_hash not in stored and db.session.get(Photo, photo_hash) is None:
+                photo_hash = None
+            if photo_hash:
+                stored.add(photo_hash)
+            values.append({'game_id': game_id, 'name': row['name'], 'score': row['score'],
+                           'eliminated': row['eliminated'], 'active': not row['eliminated'],
+                           'photo_hash': photo_hash})
+        
+        ids = db.session.scalars(
+            db.insert(Contestant).returning(Contestant.id, sort_by_parameter_order=True), values).all()
+        events = []
+        for contestant_id, value in zip(ids, values):
+            events.append(('contestant_added', {'id': contestant_id, 'name': value['name'],
+                                                'photo_hash': value['photo_hash'], 'score': value['score']}))
+            if value['eliminated']:
+                events.append(('eliminated', {'id': contestant_id}))
+        log_events(game_id, *events)
+        return ids
+    
+    try:
+        ids = writer.run(insert)
+    except IntegrityError as e:
+        log.warning("Toplu içe aktarma reddedildi: %s", e)
+        return jsonify({'success': False, 'error': f'Kayıtlar eklenemedi: {e.orig}'}), 400
+    except Exception as e:
+        log.exception("Toplu içe aktarma hatası: %s", e)
+        return jsonify({'success': False, 'error': f'Veritabanı hatası: {str(e)}'}), 500
+    game_cache.invalidate(game_id, 'contestants', 'leaderboard')
+    # Tek tek olay yerine tek bir olay: ekranlar listeyi bir kez yeniden yükler
+    game_bus(game_id).publish('contestants_imported', {'count': len(ids)})
+    return jsonify({'success': True, 'count': len(ids), 'ids': ids})
+
+@game_route('/api/contestants/export')
+def export_contestants(game_id):
+    """Yarışmacıları ve puanlarını NDJSON (varsayılan) ya da CSV olarak akıt; ?photos=1 fotoğrafları da ekler"""
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in bulk_io.FORMATS:
+        return jsonify({'success': False, 'error': 'format ndjson ya da csv olmalı'}), 400
+    include_photos = bulk_io.parse_bool(request.args.get('photos'), False)
+    fields = CONTESTANT_EXPORT_FIELDS + (('photo',) if include_photos else ())
+    
+    query = (db.session.query(Contestant.id, Contestant.name, Contestant.score, Contestant.eliminated,
+                              Contestant.active, Contestant.photo_hash)
+             .filter(Contestant.game_id == game_id).order_by(Contestant.id))
+    if include_photos:
+        query = query.outerjoin(Photo, Photo.hash == Contestant.photo_hash).add_columns(Photo.mimetype, Photo.data)
+    
+    def records():
+        for row in query.execution_options(yield_per=EXPORT_BATCH_SIZE):
+            record = {field: getattr(row, field) for field in CONTESTANT_EXPORT_FIELDS}
+            record['score'] = record['score'] or 0
+            if include_photos:
+                record['photo'] = (f'data:{row.mimetype};base64,{base64.b64encode(row.data).decode("ascii")}'
+                                   if row.data else None)
+            yield record
+    
+    return export_response(records(), fmt, fields, f'contestants-{game_id}')
+
+def add_points(game_id, contestant_id, points):
+    """Puanı tek bir UPDATE ile atomik olarak ekle, yeni puanı döndür (yarışmacı yoksa None)"""
+    return db.session.execute(
+        db.update(Contestant)
+        .where(Contestant.id == contestant_id, Contestant.game_id == game_id)
+        .values(score=db.func.coalesce(Contestant.score, 0) + points)
+        .returning(Contestant.score)
+    ).scalar()
+
+@game_route('/api/contestants/<int:contestant_id>/score', methods=['POST'])
+def update_score(game_id, contestant_id):
     data = request.get_json()
-    points = data.get('points', 0)
-    contestant = Contestant.query.get_or_404(contestant_id)
-    contestant.score += points
-    db.session.commit()
-    return jsonify({'success': True, 'new_score': contestant.score})
+    try:
+        points = int(data.get('points', 0))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Geçersiz puan'}), 400
+    
+    def apply():
+        new_score = add_points(game_id, contestant_id, points)
+        if new_score is None:
+            abort(404)
+        event_ids = log_events(game_id, ('score', {'id': contestant_id, 'delta': points, 'score': new_score}))
+        return new_score, event_ids[-1]
+    
+    new_score, event_id = writer.run(apply)
+    game_cache.invalidate(game_id, 'contestants')
+    update_standings(game_id, event_id, contestant_id, score=new_score)
+    game_bus(game_id).publish('score', {'id': contestant_id, 'delta': points, 'score': new_score})
+    return jsonify({'success': True, 'new_score': new_score})
 
-@app.route('/api/contestants/<int:contestant_id>/eliminate', methods=['POST'])
-def eliminate_contestant(contestant_id):
-    contestant = Contestant.query.get_or_404(contestant_id)
-    contestant.eliminated = True
-    contestant.active = False
-    db.session.commit()
+@game_route('/api/scores/batch', methods=['POST'])
+def update_scores_batch(game_id):
+    """Birden fazla yarışmacının puanını tek transaction içinde güncelle"""
+    data = request.get_json() or {}
+    try:
+        updates = [(int(item['id']), int(item.get('points', 0))) for item in data.get('scores', [])]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'scores listesi [{id, points}] biçiminde olmalı'}), 400
+    
+    class MissingContestant(Exception):
+        pass
+    
+    def apply():
+        results = []
+        for contestant_id, points in updates:
+            new_score = add_points(game_id, contestant_id, points)
+            if new_score is None:
+                raise MissingContestant(contestant_id)
+            results.append({'id': contestant_id, 'delta': points, 'score': new_score})
+        event_ids = log_events(game_id, *(('score', result) for result in results))
+        return results, event_ids
+    
+    try:
+        results, event_ids = writer.run(apply)
+    except MissingContestant as e:
+        return jsonify({'success': False, 'error': f'Yarışmacı bulunamadı: {e.args[0]}'}), 404
+    
+    game_cache.invalidate(game_id, 'contestants')
+    bus = game_bus(game_id)
+    for result, event_id in zip(results, event_ids):
+        update_standings(game_id, event_id, result['id'], score=result['score'])
+        bus.publish('score', result)
+    return jsonify({'success': True, 'scores': results})
+
+@game_route('/api/contestants/<int:contestant_id>/eliminate', methods=['POST'])
+def eliminate_contestant(game_id, contestant_id):
+    def apply():
+        contestant = Contestant.query.filter_by(id=contestant_id, game_id=game_id).first_or_404()
+        contestant.eliminated = True
+        contestant.active = False
+        event_ids = log_events(game_id, ('eliminated', {'id': contestant_id}))
+        return contestant.name, event_ids[-1]
+    
+    name, event_id = writer.run(apply)
+    game_cache.invalidate(game_id, 'contestants')
+    update_standings(game_id, event_id, contestant_id, eliminated=True, active=False)
+    game_bus(game_id).publish('eliminated', {'id': contestant_id, 'name': name})
     return jsonify({'success': True})
 
-@app.route('/api/contestants/<int:contestant_id>', methods=['DELETE'])
-def delete_contestant(contestant_id):
+@game_route('/api/contestants/<int:contestant_id>', methods=['DELETE'])
+def delete_contestant(game_id, contestant_id):
     """Yarışmacıyı tamamen sil"""
-    try:
-        contestant = Contestant.query.get_or_404(contestant_id)
+    def apply():
+        contestant = Contestant.query.filter_by(id=contestant_id, game_id=game_id).first_or_404()
         contestant_name = contestant.name  # Silmeden önce adını sakla
+        photo_hash = contestant.photo_hash
         
         db.session.delete(contestant)
-        db.session.commit()
+        db.session.flush()
+        delete_unused_photo(photo_hash)
+        event_ids = log_events(game_id, ('contestant_deleted', {'id': contestant_id}))
+        return contestant_name, event_ids[-1]
+    
+    try:
+        contestant_name, event_id = writer.run(apply)
+        game_cache.invalidate(game_id, 'contestants')
+        standings = game_cache.peek(game_id, 'leaderboard')
+        if standings is not None:
+            standings.remove(event_id, contestant_id)
+        game_bus(game_id).publish('contestant_deleted', {'id': contestant_id})
         
         return jsonify({
             'success': True, 
             'message': f'{contestant_name} başarıyla silindi',
             'deleted_id': contestant_id
         })
+    except HTTPException:
+        raise
     except Exception as e:
-        db.session.rollback()
-        print(f"Contestant deletion error: {e}")
+        log.exception("Contestant deletion error: %s", e)
         return jsonify({
             'success': False, 
             'error': f'Yarışmacı silinirken hata oluştu: {str(e)}'
         }), 500
 
+# Sıralama: tek süreçte bellekteki sıralı yapıdan, çok worker'da indeksli sorgulardan
+LEADERBOARD_LIMIT = 10
+LEADERBOARD_MAX_LIMIT = 1000
+
+def load_standings(game_id):
+    """Oyunun sıralamasını tablolardan kur (önbellek için)"""
+    # Olay id'si yarışmacılardan önce okunur: bu id'ye kadarki yazmaların hepsi okunan satırlarda vardır
+    built_at = db.session.query(db.func.max(GameEvent.id)).filter(GameEvent.game_id == game_id).scalar() or 0
+    return Standings([serialize_contestant(c) for c in Contestant.query.filter_by(game_id=game_id)], built_at)
+
+def update_standings(game_id, event_id, contestant_id, **changes):
+    """Önbellekteki sıralamada yarışmacıyı güncelle; yarışmacı orada yoksa sıralama yeniden kurulur"""
+    standings = game_cache.peek(game_id, 'leaderboard')
+    if standings is not None and not standings.update(event_id, contestant_id, **changes):
+        game_cache.invalidate(game_id, 'leaderboard')
+
+def ranked_query(game_id, active_only):
+    query = Contestant.query.filter(Contestant.game_id == game_id)
+    if active_only:
+        query = query.filter(Contestant.active.is_(True))
+    return query
+
+def query_rank(game_id, contestant, active_only):
+    """Yarışmacının sırası, indeksten sayılarak (önbellek kapalıyken)"""
+    ahead = ranked_query(game_id, active_only).filter(Contestant.score > contestant.score)
+    tied_ahead = ranked_query(game_id, active_only).filter(Contestant.score == contestant.score,
+                                                           Contestant.id < contestant.id)
+    rank = ahead.count() + 1
+    return {**serialize_contestant(contestant), 'rank': rank, 'position': rank + tied_ahead.count()}
+
+def query_leaderboard(game_id, limit, offset, active_only):
+    """Sıralamanın bir sayfası, indeksten okunarak (önbellek kapalıyken)"""
+    query = ranked_query(game_id, active_only)
+    rows = query.order_by(Contestant.score.desc(), Contestant.id).offset(offset).limit(limit).all()
+    entries = []
+    for index, contestant in enumerate(rows):
+        if index == 0:
+            rank = ranked_query(game_id, active_only).filter(Contestant.score > contestant.score).count() + 1
+        elif contestant.score != rows[index - 1].score:
+            rank = offset + index + 1
+        entries.append({**serialize_contestant(contestant), 'rank': rank, 'position': offset + index + 1})
+    return entries, query.count()
+
+def leaderboard_args():
+    active_only = bulk_io.parse_bool(request.args.get('active'))
+    limit = min(max(bulk_io.parse_int(request.args.get('limit'), LEADERBOARD_LIMIT), 0), LEADERBOARD_MAX_LIMIT)
+    offset = max(bulk_io.parse_int(request.args.get('offset')), 0)
+    return active_only, limit, offset
+
+@game_route('/api/leaderboard')
+def leaderboard(game_id):
+    """Puan sıralaması: limit/offset sayfası, active=1 ile yalnızca elenmemişler.
+
+    Eşit puanda önce kaydolan önde; ``rank`` eşit puanlılarda aynıdır, ``position`` değildir.
+    """
+    try:
+        active_only, limit, offset = leaderboard_args()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    standings = game_cache.get(game_id, 'leaderboard', lambda: load_standings(game_id)) if game_cache.enabled else None
+    if standings is not None:
+        entries, total = standings.top(limit, offset, active_only)
+    else:
+        entries, total = query_leaderboard(game_id, limit, offset, active_only)
+    return jsonify({'success': True, 'total': total, 'offset': offset, 'active': active_only, 'leaderboard': entries})
+
+@game_route('/api/contestants/<int:contestant_id>/rank')
+def contestant_rank(game_id, contestant_id):
+    """Yarışmacının sıralamadaki yeri (active=1: elenmemişler arasında)"""
+    try:
+        active_only = bulk_io.parse_bool(request.args.get('active'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    if game_cache.enabled:
+        standings = game_cache.get(game_id, 'leaderboard', lambda: load_standings(game_id))
+        entry = standings.rank(contestant_id, active_only)
+    else:
+        contestant = Contestant.query.filter_by(id=contestant_id, game_id=game_id).first()
+        entry = query_rank(game_id, contestant, active_only) if contestant and (contestant.active or not active_only) else None
+    if entry is None:
+        return jsonify({'success': False, 'error': 'Yarışmacı sıralamada yok'}), 404
+    return jsonify({'success': True, 'active': active_only, 'contestant': entry})
+
 # Soru yönetimi fonksiyonları
 def load_questions(stage=1):
-    """JSON dosyasından soruları yükle"""
-    try:
-        # Use base_path for PyInstaller compatibility
-        filename = os.path.join(base_path, f'etap{stage}_50soru.json')
-        print(f"Soru dosyası arıyor: {filename}")
-        
-        if not os.path.exists(filename):
-            print(f"Dosya bulunamadı: {filename}")
-            return []
-        
-        print(f"Dosya bulundu, okunuyor: {filename}")
-        with open(filename, 'r', encoding='utf-8') as f:
-            questions = json.load(f)
-        print(f"Toplam {len(questions)} soru yüklendi")
-        return questions
-    except Exception as e:
-        print(f"Soru yükleme hatası: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+    """Etabın sorularını bellekteki soru bankasından getir"""
+    return question_bank.questions(stage)
 
-def get_random_question(stage=1):
-    """Rastgele bir soru getir (daha önce kullanılmamış)"""
-    questions = load_questions(stage)
-    if not questions:
+@app.route('/api/questions/status')
+def questions_status():
+    """Soru dosyalarının yüklenen sürümü, izleme durumu ve son yükleme hatası"""
+    return jsonify({'success': True, **question_bank.status()})
+
+@app.route('/api/questions/reload', methods=['POST'])
+def questions_reload():
+    """Soru dosyalarını hemen kontrol et (izleyicinin sıradaki turunu beklemeden)"""
+    question_bank.check()
+    status = question_bank.status()
+    return jsonify({'success': not any(stage.get('error') for stage in status['stages'].values()), **status})
+
+# Etabın soru kümesi: etap -> (soru kümesi nesnesi, sıralı id'ler, hash); küme yeniden yüklenince yenilenir
+_question_sets = {}
+
+def question_set(stage):
+    """Etabın güncel soru kümesi, sıralı soru id'leri ve id'lerin hash'i"""
+    pool = question_bank.stage(stage)
+    cached = _question_sets.get(stage)
+    if cached is not None and cached[0] is pool:
+        return cached
+    ids = sorted(q['id'] for q in pool.questions)
+    digest = hashlib.sha256(','.join(map(str, ids)).encode('ascii')).hexdigest()[:16]
+    cached = _question_sets[stage] = (pool, ids, digest)
+    return cached
+
+# Deste sıralamaları: (oyun, etap) -> (seed, soru kümesi hash'i, karıştırılmış soru id'leri)
+_deck_orders = {}
+
+def deck_order(game_id, stage, seed, ids, digest):
+    """Destenin karıştırılmış soru id'lerini getir (her seed ve soru kümesi için bir kez hesaplanır)"""
+    cached = _deck_orders.get((game_id, stage))
+    if cached is not None and cached[:2] == (seed, digest):
+        return cached[2]
+    order = list(ids)
+    random.Random(seed).shuffle(order)
+    # Oyunun bu etaptaki eski destesinin sıralaması üzerine yazılır
+    _deck_orders[(game_id, stage)] = (seed, digest, order)
+    return order
+
+def get_random_question(game_id, stage=1):
+    """Rastgele bir soru getir (deste bitene kadar tekrar etmez)"""
+    pool, ids, digest = question_set(stage)
+    if not ids:
         return None
     
-    # Oyun durumunu al
-    game_state = GameState.query.first()
-    if not game_state:
-        game_state = GameState()
-        db.session.add(game_state)
-        db.session.commit()
-    
-    # Mevcut etap bilgisini güncelle
-    game_state.current_stage = stage
-    
-    # Kullanılmış soruları al (etap bazlı)
-    used_questions_data = json.loads(game_state.used_questions) if game_state.used_questions else {}
-    stage_key = f"stage_{stage}"
-    used_questions = used_questions_data.get(stage_key, [])
-    
-    # Kullanılmamış soruları filtrele
-    available_questions = [q for q in questions if q['id'] not in used_questions]
-    
-    if not available_questions:
-        # Tüm sorular kullanıldı, listeyi sıfırla
-        used_questions = []
-        available_questions = questions
-    
-    # Rastgele soru seç
-    question = random.choice(available_questions)
-    
-    # Kullanılmış sorular listesine ekle (etap bazlı)
-    used_questions.append(question['id'])
-    used_questions_data[stage_key] = used_questions
-    game_state.used_questions = json.dumps(used_questions_data)
-    game_state.current_question_id = question['id']
-    db.session.commit()
+    def draw():
+        deck = db.session.get(QuestionDeck, (game_id, stage))
+        if not deck:
+            deck = QuestionDeck(game_id=game_id, stage=stage)
+            db.session.add(deck)
+        
+        if deck.question_hash != digest or deck.position >= deck.size:
+            # Deste bitti ya da soru kümesi değişti (sıra değişikliği pozisyonları bozmaz): yeniden karıştır
+            deck.seed = random.getrandbits(31)
+            deck.position = 0
+            deck.size = len(ids)
+            deck.question_hash = digest
+        
+        question = pool.get(deck_order(game_id, stage, deck.seed, ids, digest)[deck.position])
+        deck.position += 1
+        deck.last_question_id = question['id']
+        
+        # Oyunun güncel etabı ve sorusu (2. etap şıkları questionId verilmezse bu soruya yazılır)
+        game_state = get_or_create_game_state(game_id)
+        game_state.current_stage = stage
+        game_state.current_question_id = question['id']
+        log_events(game_id, ('question_drawn', {'stage': stage, 'questionId': question['id']}))
+        return question
     
+    question = writer.run(draw)
+    game_cache.invalidate(game_id, 'game_state')
     return question
 
-@app.route('/api/questions/<int:stage>')
-def get_question(stage):
+@game_route('/api/questions/<int:stage>')
+def get_question(game_id, stage):
     """Belirtilen etap için rastgele soru getir"""
-    question = get_random_question(stage)
+    question = get_random_question(game_id, stage)
     if question:
         return jsonify({
             'success': True,
@@ -328,18 +1156,39 @@ def get_question(stage):
             'error': f'{stage}. etap için soru bulunamadı'
         })
 
-@app.route('/api/questions/<int:stage>/<date>')
-def get_question_by_date(stage, date):
+@game_route('/api/questions/<int:stage>/reset-deck', methods=['POST'])
+def reset_question_deck(game_id, stage):
+    """Etabın soru destesini sıfırla - sonraki çekilişte yeniden karıştırılır"""
+    writer.run(lambda: QuestionDeck.query.filter_by(game_id=game_id, stage=stage).delete())
+    return jsonify({'success': True, 'message': f'{stage}. etap soru destesi sıfırlandı'})
+
+@game_route('/api/questions/<int:stage>/<int:question_id>/display')
+def question_display(game_id, stage, question_id):
+    """Wall'un Unity köprüsüne gönderilecek hazır soru mesajı (etap yüklenirken hazırlanır, ETag ile)"""
+    payload, version = question_bank.display(stage, question_id)
+    if payload is None:
+        return jsonify({'success': False, 'error': f'{stage}. etapta {question_id} numaralı soru bulunamadı'}), 404
+    
+    etag = f'q{stage}-{question_id}-{version}'
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = jsonify({'success': True, **payload})
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+@game_route('/api/questions/<int:stage>/<date>')
+def get_question_by_date(game_id, stage, date):
     """Belirtilen tarihe ait soru getir"""
-    questions = load_questions(stage)
-    if not questions:
+    if not load_questions(stage):
         return jsonify({
             'success': False,
             'error': f'{stage}. etap için soru dosyası bulunamadı'
         })
     
-    # Tarihe göre soru ara
-    matching_questions = [q for q in questions if q['tarih'] == date]
+    # Tarih indeksinden soruları al
+    matching_questions = question_bank.by_date(stage, date)
     
     if not matching_questions:
         return jsonify({
@@ -356,124 +1205,457 @@ def get_question_by_date(stage, date):
         'date': date
     })
 
-@app.route('/api/wheel-spin', methods=['POST'])
-@retry_on_database_lock(max_retries=3, delay=0.1)
-def wheel_spin():
+# Çark: dilim tabloları bellekte, kayıtlar toplu yazılır.
+# TIMETUNNEL_WHEEL_WEIGHTING: 'questions' (tarihin soru sayısı) ya da 'uniform';
+# TIMETUNNEL_WHEEL_NO_REPEAT=1 ile tarihler tükenene kadar tekrar gelmez
+app.config['WHEEL_WEIGHTING'] = os.environ.get('TIMETUNNEL_WHEEL_WEIGHTING', 'questions')
+app.config['WHEEL_NO_REPEAT'] = bulk_io.parse_bool(os.environ.get('TIMETUNNEL_WHEEL_NO_REPEAT'))
+DEFAULT_WHEEL_STAGE = 1  # Etap verilmezse (ya da 0 ise) çevrilen etap
+wheel = WheelEngine(weighting=app.config['WHEEL_WEIGHTING'], no_repeat=app.config['WHEEL_NO_REPEAT'])
+
+def write_spins(rows):
+    """Biriken çark kayıtlarını tek transaction'da yaz, id'lerini döndür"""
+    def insert():
+        spins = [WheelSpin(id=row.get('id'), game_id=row['game_id'], result=row['result'], user_id=row['user_id'])
+                 for row in rows]
+        db.session.add_all(spins)
+        db.session.flush()
+        return [spin.id for spin in spins]
+    
+    return writer.run(insert)
+
+def set_current_stage(game_id, stage):
+    """Oyunun etabını hemen yaz; çark kaydı tamponda beklerken okunan etap da güncel olsun"""
+    if game_cache.get(game_id, 'game_state', lambda: load_game_state(game_id))['current_stage'] == stage:
+        return
+    
+    def update():
+        get_or_create_game_state(game_id).current_stage = stage
+    
+    writer.run(update)
+    game_cache.invalidate(game_id, 'game_state')
+
+spin_buffer = SpinBuffer(write_spins, lambda: db.session.query(db.func.max(WheelSpin.id)).scalar())
+
+@game_route('/api/wheel-spin', methods=['POST'])
+def wheel_spin(game_id):
     try:
         data = request.get_json()
         if not data:
             return jsonify({'success': False, 'error': 'JSON verisi alınamadı'}), 400
         
-        stage = data.get('stage', 1)
+        stage = data.get('stage')
+        if stage in (0, None) and not isinstance(stage, bool):
+            # Reji etap başlatılmadan (currentStage 0) çevirdiğinde varsayılan etap kullanılır
+            stage = DEFAULT_WHEEL_STAGE
+        if isinstance(stage, bool) or stage not in STAGES:
+            return jsonify({'success': False, 'error': f'Geçersiz etap: {stage!r}'}), 400
         user_id = data.get('user_id', 'anonymous')
         
-        # Tek transaction içinde her şeyi yap
-        game_state = GameState.query.first()
-        if not game_state:
-            game_state = GameState()
-            db.session.add(game_state)
-        game_state.current_stage = stage
-        
-        # JSON dosyasından rastgele tarih al
-        questions = load_questions(stage)
-        if questions:
-            random_question = random.choice(questions)
-            result = random_question['tarih']
-        else:
+        # Önceden hesaplanmış dilim tablosundan tarih seç
+        result = wheel.spin(game_id, stage, load_questions(stage))
+        if result is None:
             result = f'{stage}. Etap Test Sonucu'
         
-        # Aynı transaction'da wheel spin ekle
-        new_spin = WheelSpin(result=result, user_id=user_id)
-        db.session.add(new_spin)
-        
-        # Tek commit
-        db.session.commit()
+        set_current_stage(game_id, stage)
+        spin_id = spin_buffer.add({'game_id': game_id, 'result': result, 'user_id': user_id})
+        game_bus(game_id).publish('wheel_spin', {'spin_id': spin_id, 'result': result, 'stage': stage})
         
-        return jsonify({'success': True, 'spin_id': new_spin.id, 'result': result, 'stage': stage})
+        return jsonify({'success': True, 'spin_id': spin_id, 'result': result, 'stage': stage})
     
     except Exception as e:
-        db.session.rollback()  # Hata durumunda rollback
-        print(f"Wheel spin hatası: {e}")
+        log.exception("Wheel spin hatası: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@game_route('/api/wheel/segments/<int:stage>')
+def wheel_segments(game_id, stage):
+    """Etabın çark dilimleri (tarih, soru sayısı, ağırlık)"""
+    segments = wheel.segments(stage, load_questions(stage))
+    return jsonify({'success': True, 'stage': stage, 'segments': segments.as_dict()})
 
-@app.route('/api/reset-game', methods=['POST'])
-def reset_game():
-    """Oyunu tamamen sıfırla - tüm yarışmacıları ve oyun durumunu sil"""
-    try:
-        # Tüm yarışmacıları sil
-        Contestant.query.delete()
+@game_route('/api/wheel-spins/export')
+def export_wheel_spins(game_id):
+    """Çark geçmişini NDJSON (varsayılan) ya da CSV olarak akıt; ?after=<id> yalnızca sonraki kayıtları verir"""
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in bulk_io.FORMATS:
+        return jsonify({'success': False, 'error': 'format ndjson ya da csv olmalı'}), 400
+    after = request.args.get('after', 0, type=int)
+    
+    # Tamponda bekleyen dönüşler de dışa aktarılsın
+    spin_buffer.flush()
+    query = (db.session.query(WheelSpin.id, WheelSpin.timestamp, WheelSpin.result, WheelSpin.user_id)
+             .filter(WheelSpin.game_id == game_id, WheelSpin.id > after).order_by(WheelSpin.id))
+    
+    def records():
+        for row in query.execution_options(yield_per=EXPORT_BATCH_SIZE):
+            yield {'id': row.id, 'timestamp': row.timestamp.isoformat() if row.timestamp else None,
+                   'result': row.result, 'user_id': row.user_id}
+    
+    return export_response(records(), fmt, WHEEL_SPIN_EXPORT_FIELDS, f'wheel-spins-{game_id}')
+
+@game_route('/api/reset-game', methods=['POST'])
+def reset_game(game_id):
+    """Oyunu tamamen sıfırla - oyunun yarışmacılarını ve oyun durumunu sil (diğer oyunlara dokunmaz)"""
+    def reset():
+        photo_hashes = {h for (h,) in db.session.query(Contestant.photo_hash)
+                        .filter(Contestant.game_id == game_id, Contestant.photo_hash.isnot(None))}
+        
+        # Oyunun yarışmacılarını sil
+        Contestant.query.filter_by(game_id=game_id).delete()
         
-        # Oyun durumunu sıfırla
-        GameState.query.delete()
+        # Oyun durumunu sıfırla (satır silinmez, her oyunun tek durum satırı kalır)
+        GameState.query.filter_by(game_id=game_id).update(
+            {'current_stage': 0, 'current_question_id': 0, 'used_questions': '[]'})
+        Stage2OptionState.query.filter_by(game_id=game_id).delete()
         
         # Çark sonuçlarını sil (isteğe bağlı)
-        WheelSpin.query.delete()
+        WheelSpin.query.filter_by(game_id=game_id).delete()
         
-        # Değişiklikleri kaydet
-        db.session.commit()
+        # Soru destelerini sıfırla
+        QuestionDeck.query.filter_by(game_id=game_id).delete()
+        
+        # Tamponda bekleyen çark kayıtları da sıfırlamayla birlikte gider
+        spin_buffer.discard(game_id)
+        
+        # Başka oyunlarda kullanılmayan fotoğrafları sil
+        for photo_hash in photo_hashes:
+            delete_unused_photo(photo_hash)
+        
+        # Olay kaydı silinmez, sıfırlama da bir olay olarak eklenir
+        log_events(game_id, ('game_reset', {}))
+    
+    try:
+        # Sıfırlama sürerken tampon yazılmaz: yazılmakta olan bir toplu kayıt sıfırlamadan sonra işlenemez
+        with spin_buffer.paused():
+            writer.run(reset)
+        wheel.reset(game_id)
+        game_cache.invalidate(game_id, 'contestants', 'game_state', 'leaderboard')
+        game_bus(game_id).publish('game_reset')
         
         return jsonify({'success': True, 'message': 'Oyun tamamen sıfırlandı'})
     except Exception as e:
-        db.session.rollback()
-        print(f"Oyun sıfırlama hatası: {e}")
+        log.exception("Oyun sıfırlama hatası: %s", e)
         return jsonify({'success': False, 'error': str(e)})
 
-@app.route('/api/stage2/option-state', methods=['GET', 'POST'])
-def stage2_option_state():
-    """2. etap şık durumlarını al/güncelle"""
-    game_state = GameState.query.first()
+def get_or_create_game_state(game_id):
+    """Oyunun durum satırını getir, yoksa oluştur (yazar thread'inde çağrılmalı)"""
+    game_state = GameState.query.filter_by(game_id=game_id).first()
     if not game_state:
-        game_state = GameState()
+        game_state = GameState(game_id=game_id)
         db.session.add(game_state)
-        db.session.commit()
-    
+    return game_state
+
+# 2. etap şıkları: (oyun, soru, şık) anahtarlı satırlar
+STAGE2_MAX_OPTIONS = 16
+
+def load_option_states(game_id, question_id):
+    """Sorunun şık durumlarını {şık: durum} olarak oku"""
+    rows = db.session.query(Stage2OptionState.option_index, Stage2OptionState.state).filter_by(
+        game_id=game_id, question_id=question_id)
+    return {str(option_index): state for option_index, state in rows}
+
+def load_game_state(game_id):
+    """Oyunun etabı ve güncel 2. etap sorusunun şık durumları (önbellek için)"""
+    game_state = db.session.query(GameState.current_stage, GameState.current_question_id).filter_by(game_id=game_id).first()
+    if not game_state:
+        return {'current_stage': 0, 'stage2_question_id': 0, 'stage2_option_states': {}}
+    question_id = game_state.current_question_id or 0
+    return {
+        'current_stage': game_state.current_stage or 0,
+        'stage2_question_id': question_id,
+        'stage2_option_states': load_option_states(game_id, question_id)
+    }
+
+@game_route('/api/game-state')
+def game_state(game_id):
+    """Oyunun güncel etabı ve 2. etap şık durumları (ETag ile)"""
+    return cached_response(game_id, 'game_state', lambda: load_game_state(game_id),
+                           lambda state: {'success': True, **state})
+
+def parse_option_states(items):
+    """[{optionIndex, state}, ...] ya da {şık: durum} listesini [(şık, durum), ...] olarak doğrula"""
+    if isinstance(items, dict):
+        items = [{'optionIndex': key, 'state': value} for key, value in items.items()]
+    if not isinstance(items, list) or not items:
+        raise ValueError('options boş olmayan bir liste olmalı')
+    options = {}
+    for item in items:
+        if not isinstance(item, dict) or item.get('optionIndex') is None or item.get('state') is None:
+            raise ValueError('Her şık için optionIndex ve state gerekli')
+        option_index = bulk_io.parse_int(item['optionIndex'])
+        if not 0 <= option_index < STAGE2_MAX_OPTIONS:
+            raise ValueError(f'Geçersiz şık: {option_index}')
+        options[option_index] = game_log.option_state(item['state'])
+    return list(options.items())
+
+def set_option_states(game_id, question_id, options):
+    """Şık durumlarını tek executemany upsert ile yaz; yazılan sorunun id'sini döndür (yazar thread'inde)"""
+    if question_id is None:
+        question_id = db.session.query(GameState.current_question_id).filter_by(game_id=game_id).scalar() or 0
+    else:
+        # Başka bir soruya yazılıyorsa o soru güncel soru olur
+        GameState.query.filter(GameState.game_id == game_id, GameState.current_question_id != question_id).update(
+            {'current_question_id': question_id}, synchronize_session=False)
+    now = datetime.utcnow()
+    upsert = sqlite_insert(Stage2OptionState)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=['game_id', 'question_id', 'option_index'],
+        set_={'state': upsert.excluded.state, 'updated_at': upsert.excluded.updated_at})
+    db.session.execute(upsert, [{'game_id': game_id, 'question_id': question_id, 'option_index': option_index,
+                                 'state': state, 'updated_at': now} for option_index, state in options])
+    log_events(game_id, *[('stage2_option', {'questionId': question_id, 'optionIndex': option_index, 'state': state})
+                          for option_index, state in options])
+    return question_id
+
+def publish_option_states(game_id, question_id, options):
+    game_cache.invalidate(game_id, 'game_state')
+    bus = game_bus(game_id)
+    for option_index, state in options:
+        bus.publish('stage2_option', {'questionId': question_id, 'optionIndex': option_index, 'state': state})
+
+def request_question_id(data):
+    """İstekteki questionId (verilmezse None: oyunun güncel sorusu)"""
+    question_id = data.get('questionId')
+    return None if question_id is None else bulk_io.parse_int(question_id)
+
+@game_route('/api/stage2/option-state', methods=['GET', 'POST'])
+def stage2_option_state(game_id):
+    """2. etap şık durumlarını al/güncelle (questionId verilmezse güncel soru)"""
     if request.method == 'POST':
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         option_index = data.get('optionIndex')
-        state = data.get('state')  # 'D', 'Y', veya 'def'
+        state = data.get('state')  # 'D', 'Y', 'def' ya da true/false
         
         if option_index is None or state is None:
             return jsonify({'success': False, 'error': 'optionIndex ve state gerekli'})
+        try:
+            question_id = request_question_id(data)
+            options = parse_option_states([data])
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
-        # Mevcut durumları al
-        option_states = json.loads(game_state.stage2_option_states) if game_state.stage2_option_states else {}
-        
-        # Durumu güncelle
-        option_states[str(option_index)] = state
-        
-        # Veritabanına kaydet
-        game_state.stage2_option_states = json.dumps(option_states)
-        db.session.commit()
+        question_id = writer.run(lambda: set_option_states(game_id, question_id, options))
+        publish_option_states(game_id, question_id, options)
         
-        return jsonify({'success': True, 'optionIndex': option_index, 'state': state})
+        option_index, state = options[0]
+        return jsonify({'success': True, 'questionId': question_id, 'optionIndex': option_index, 'state': state})
     
     else:
         # GET - Mevcut durumları getir
-        option_states = json.loads(game_state.stage2_option_states) if game_state.stage2_option_states else {}
-        return jsonify({'success': True, 'optionStates': option_states})
+        question_id = request.args.get('questionId', type=int)
+        if question_id is not None:
+            return jsonify({'success': True, 'questionId': question_id,
+                            'optionStates': load_option_states(game_id, question_id)})
+        return cached_response(game_id, 'game_state', lambda: load_game_state(game_id),
+                               lambda state: {'success': True, 'questionId': state['stage2_question_id'],
+                                              'optionStates': state['stage2_option_states']})
 
-@app.route('/api/stage2/reset-options', methods=['POST'])
-def reset_stage2_options():
-    """2. etap şık durumlarını sıfırla"""
-    game_state = GameState.query.first()
-    if not game_state:
-        game_state = GameState()
-        db.session.add(game_state)
-        db.session.commit()  # Commit the new GameState first
+@game_route('/api/stage2/option-states', methods=['POST'])
+def stage2_option_states_batch(game_id):
+    """Birden fazla şıkkın durumunu tek istekte, tek transaction'da güncelle (ör. cevapların açılması).
+
+    Gövde: ``{"questionId": 12, "options": [{"optionIndex": 0, "state": "D"}, ...]}``
+    ya da ``"options": {"0": "D", "1": "Y"}``.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        question_id = request_question_id(data)
+        options = parse_option_states(data.get('options'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     
-    game_state.stage2_option_states = '{}'
-    db.session.commit()
+    question_id = writer.run(lambda: set_option_states(game_id, question_id, options))
+    publish_option_states(game_id, question_id, options)
+    
+    return jsonify({'success': True, 'questionId': question_id,
+                    'optionStates': {str(option_index): state for option_index, state in options}})
+
+@game_route('/api/stage2/reset-options', methods=['POST'])
+def reset_stage2_options(game_id):
+    """2. etap şık durumlarını sıfırla (questionId verilirse yalnızca o soru, ve o soru güncel soru olur)"""
+    data = request.get_json(silent=True) or {}
+    try:
+        question_id = request_question_id(data)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    def reset():
+        query = Stage2OptionState.query.filter_by(game_id=game_id)
+        if question_id is None:
+            query.delete()
+            log_events(game_id, ('stage2_reset', {}))
+        else:
+            query.filter_by(question_id=question_id).delete()
+            get_or_create_game_state(game_id).current_question_id = question_id
+            log_events(game_id, ('stage2_reset', {'questionId': question_id}))
+    
+    writer.run(reset)
+    game_cache.invalidate(game_id, 'game_state')
+    game_bus(game_id).publish('stage2_reset', {} if question_id is None else {'questionId': question_id})
     
     return jsonify({'success': True, 'message': '2. etap şık durumları sıfırlandı'})
 
 
-def open_browser():
+# Olay geçmişi: denetim, tekrar oynatma ve geri alma
+@game_route('/api/history')
+def history(game_id):
+    """Oyunun olay kaydını getir (after: bu id'den sonraki olaylar)"""
+    after = request.args.get('after', 0, type=int)
+    limit = min(request.args.get('limit', 500, type=int), 5000)
+    rows = (GameEvent.query.filter(GameEvent.game_id == game_id, GameEvent.id > after)
+            .order_by(GameEvent.id).limit(limit).all())
+    return jsonify({'success': True, 'events': [{
+        'id': e.id,
+        'kind': e.kind,
+        'payload': json.loads(e.payload),
+        'created_at': e.created_at.isoformat() if e.created_at else None
+    } for e in rows]})
+
+@game_route('/api/history/state')
+def history_state(game_id):
+    """Verilen olay anındaki durumu yeniden oluştur (event_id yoksa güncel durum)"""
+    event_id = request.args.get('event_id', type=int)
+    return jsonify({'success': True, 'event_id': event_id, 'state': reconstruct_state(game_id, event_id)})
+
+@game_route('/api/history/snapshot', methods=['POST'])
+def history_snapshot(game_id):
+    """Elle snapshot al"""
+    def snapshot():
+        snapshot = take_snapshot(game_id)
+        db.session.flush()
+        return snapshot.id, snapshot.last_event_id
+    
+    snapshot_id, last_event_id = writer.run(snapshot)
+    return jsonify({'success': True, 'snapshot_id': snapshot_id, 'last_event_id': last_event_id})
+
+@game_route('/api/history/restore', methods=['POST'])
+def history_restore(game_id):
+    """Yarışmacıları ve 2. etap şıklarını verilen olay anındaki duruma geri al"""
+    data = request.get_json() or {}
+    event_id = data.get('event_id')
+    if not isinstance(event_id, int):
+        return jsonify({'success': False, 'error': 'event_id gerekli'}), 400
+    
+    def restore():
+        state = reconstruct_state(game_id, event_id)
+        
+        existing = {c.id: c for c in Contestant.query.filter_by(game_id=game_id)}
+        for key, values in state['contestants'].items():
+            contestant = existing.pop(int(key), None)
+            if contestant is None:
+                contestant = Contestant(id=int(key), game_id=game_id)
+                db.session.add(contestant)
+            contestant.name = values['name']
+            contestant.score = values['score']
+            contestant.eliminated = values['eliminated']
+            contestant.active = values['active']
+            # Fotoğraf o arada silindiyse referansı bırakma
+            photo_hash = values.get('photo_hash')
+            contestant.photo_hash = photo_hash if photo_hash and db.session.get(Photo, photo_hash) else None
+        for contestant in existing.values():
+            db.session.delete(contestant)
+        
+        get_or_create_game_state(game_id).current_question_id = state['stage2_question_id']
+        Stage2OptionState.query.filter_by(game_id=game_id).delete()
+        db.session.add_all(Stage2OptionState(game_id=game_id, question_id=int(question_id), option_index=int(key), state=value)
+                           for question_id, options in state['stage2_options'].items() for key, value in options.items())
+        
+        # Geri alma da kaydedilir; hemen ardından alınan snapshot tekrar oynatmanın başlangıcı olur
+        db.session.flush()
+        event_ids = log_events(game_id, ('restored', {'event_id': event_id}))
+        take_snapshot(game_id, event_ids[-1])
+        return event_ids[-1]
+    
+    try:
+        restored_event_id = writer.run(restore)
+        game_cache.invalidate(game_id, 'contestants', 'game_state', 'leaderboard')
+        game_bus(game_id).publish('game_restored', {'event_id': event_id})
+        
+        return jsonify({'success': True, 'event_id': event_id, 'restored_event_id': restored_event_id})
+    except Exception as e:
+        log.exception("Geri alma hatası: %s", e)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+# Ölçümler: diğer modüllerin sayaçları okunduğu anda toplanır
+metrics.register('db_writer_commits_total', 'counter', 'Yazma kuyruğunun commit sayısı', lambda: writer.commits)
+metrics.register('db_writer_jobs_total', 'counter', 'Yazma kuyruğunda çalışan iş sayısı', lambda: writer.jobs)
+metrics.register('db_lock_retries_total', 'counter', 'SQLite "database is locked" yeniden denemeleri',
+                 lambda: writer.lock_retries)
+metrics.register('db_writer_queue_depth', 'gauge', 'Yazma kuyruğunda bekleyen işler', lambda: writer.queue_depth)
+metrics.register('cache_hits_total', 'counter', 'Oyun önbelleği isabetleri', lambda: game_cache.hits)
+metrics.register('cache_misses_total', 'counter', 'Oyun önbelleği ıskaları (veritabanından okuma)',
+                 lambda: game_cache.misses)
+metrics.register('question_bank_loads_total', 'counter', 'Soru JSON dosyası yüklemeleri', lambda: question_bank.loads)
+metrics.register('question_bank_load_seconds_total', 'counter', 'Soru JSON dosyalarını okuma ve ayrıştırma süresi',
+                 lambda: question_bank.load_seconds)
+metrics.register('question_bank_failures_total', 'counter', 'Geçersiz ya da okunamayan soru dosyası yüklemeleri',
+                 lambda: question_bank.failures)
+metrics.register('spin_buffer_pending', 'gauge', 'Veritabanına yazılmayı bekleyen çark dönüşleri',
+                 spin_buffer.pending)
+metrics.register('sse_subscribers', 'gauge', 'Bağlı olay akışı (SSE) istemcileri',
+                 lambda: {(('game', game_id),): bus.subscriber_count for game_id, bus in list(_event_buses.items())})
+metrics.register('startup_fs_probes', 'gauge', 'Statik dosya indeksi için yapılan dosya sistemi kontrolleri',
+                 lambda: static_resources.get()[2] if static_resources.loaded else 0)
+metrics.register('startup_phase_seconds', 'gauge', 'Açılış adımlarının süresi (arka plan yüklemeleri dahil)',
+                 lambda: {(('phase', name),): seconds for name, seconds in
+                          list(startup_timer.phases.items()) + list(startup_timer.background.items())})
+metrics.register('startup_first_request_seconds', 'gauge', 'Açılıştan ilk isteğin tamamlanmasına kadar geçen süre',
+                 lambda: startup_timer.first_request or 0)
+
+# Ölçümler ve profiler yalnızca sunucunun kendisinden ya da TIMETUNNEL_METRICS_TOKEN
+# verildiyse "Authorization: Bearer <token>" başlığıyla okunur
+METRICS_TOKEN = os.environ.get('TIMETUNNEL_METRICS_TOKEN') or None
+LOCAL_ADDRESSES = ('127.0.0.1', '::1')
+
+def metrics_access(func):
+    @wraps(func)
+    def view(*args, **kwargs):
+        if request.remote_addr not in LOCAL_ADDRESSES:
+            scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+            if not METRICS_TOKEN or scheme.lower() != 'bearer' or not hmac.compare_digest(token.strip().encode(), METRICS_TOKEN.encode()):
+                return jsonify({'success': False, 'error': 'Ölçümlere yalnızca sunucudan ya da token ile erişilebilir'}), 403
+        return func(*args, **kwargs)
+    return view
+
+@app.route('/api/metrics')
+@metrics_access
+def metrics_endpoint():
+    """Prometheus metin biçiminde ölçümler"""
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/api/metrics/profile', methods=['GET', 'POST'])
+@metrics_access
+def metrics_profile():
+    """Örnekleyici profiler: POST bir sonraki isteği profillemek için kurar, GET son sonucu verir"""
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        try:
+            interval = float(data.get('interval_ms', 1)) / 1000
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'interval_ms sayı olmalı'}), 400
+        armed = metrics.profiler.arm(data.get('path'), interval)
+        return jsonify({'success': True, 'armed': armed})
+    
+    profile = metrics.profiler.last
+    if profile is None:
+        return jsonify({'success': False, 'error': 'Henüz profil alınmadı'}), 404
+    if request.args.get('format') == 'folded':
+        return Response('\n'.join(profile['folded']) + '\n', mimetype='text/plain')
+    return jsonify({'success': True, 'profile': profile})
+
+
+def open_browser(port=5000):
     """Automatically open browser to Reji panel"""
-    time.sleep(1.5)  # Wait for Flask to start
-    webbrowser.open('http://127.0.0.1:5000/reji')
+    import webbrowser
+    time.sleep(1.5)  # Wait for server to start
+    webbrowser.open(f'http://127.0.0.1:{port}/reji')
 
-if __name__ == '__main__':
+def init_database():
+    """Şemayı oluştur ve eski veritabanlarını taşı.
+
+    Sunucu başlamadan önce tek süreçte bir kez çağrılır; çok worker'lı
+    modda worker'lar bu süreçten çatallandığı için şema işlemleri yarışmaz.
+    """
     with app.app_context():
         try:
             # Force clean startup state
@@ -483,71 +1665,130 @@ if __name__ == '__main__':
             except:
                 pass
             
-            # Test veritabanı bağlantısı ve şema uyumlu olup olmadığını kontrol et
-            db.create_all()
-            
-            # Contestant tablosunun photo kolonu olup olmadığını test et
-            try:
-                test_query = db.session.execute(db.text("SELECT photo FROM contestant LIMIT 1"))
-                test_query.close()  # CRITICAL: Close the query result
-                db.session.commit()  # CRITICAL: Commit the transaction
-                print("Veritabanı şeması güncel!")
-            except Exception as schema_error:
-                if ("no such column: contestant.photo" in str(schema_error).lower() or 
-                    "no such column: photo" in str(schema_error).lower() or
-                    ("no such column" in str(schema_error).lower() and "photo" in str(schema_error).lower())):
-                    print("\n⚠️  VERITABANI ŞEMA HATASI TESPİT EDİLDİ!")
-                    print(f"Hata: {schema_error}")
-                    print("Photo kolonu mevcut değil. Veritabanı yeniden oluşturuluyor...")
-                    
-                    # Veritabanı dosyasını sil ve yeniden oluştur
-                    import os
-                    
-                    # Olası veritabanı dosya yolları
-                    db_paths = [
-                        'instance/timetunnel.db',
-                        'timetunnel.db',
-                        'instance/timetunnel.sqlite',
-                        'timetunnel.sqlite'
-                    ]
-                    
-                    for db_path in db_paths:
-                        if os.path.exists(db_path):
-                            try:
-                                os.remove(db_path)
-                                print(f"✅ Eski veritabanı dosyası silindi: {db_path}")
-                            except Exception as delete_error:
-                                print(f"❌ Silinirken hata: {db_path} - {delete_error}")
-                    
-                    # Session'ı kapat ve yeni veritabanını oluştur
-                    try:
-                        db.session.rollback()  # Rollback any pending transactions
-                        db.session.close()
-                        db.session.remove()
-                    except:
-                        pass
-                    
-                    # Yeni veritabanını oluştur
-                    db.drop_all()
-                    db.create_all()
-                    print("✅ Yeni veritabanı başarıyla oluşturuldu!")
-                    print("ℹ️  Not: Tüm eski veriler silindi. Yarışmacıları yeniden eklemeniz gerekiyor.")
-                else:
-                    # Başka bir veritabanı hatası
-                    print(f"❌ Beklenmeyen veritabanı hatası: {schema_error}")
-                    raise
-            
-            print("Veritabanı hazır!")
-            print("🚀 Reji Paneli otomatik olarak açılacak...")
-            
-            # Only open browser when running as executable (PyInstaller)
-            if getattr(sys, 'frozen', False):
-                # Start browser opening in a separate thread
-                threading.Timer(1.5, open_browser).start()
+            # Güncel veritabanında yalnızca şema sürümü okunur; eski sürümler yerinde taşınır.
+            # Eksik tablolar (yeni veritabanı, sonradan eklenen modeller) taşımalardan önce oluşturulur.
+            migrations.run(db.session, prepare=db.create_all)
             
+            log.info("Veritabanı hazır!")
+        
         except Exception as e:
-            print(f"❌ Veritabanı başlatma hatası: {e}")
-            print("Uygulama başlatılamadı. Lütfen veritabanı ayarlarını kontrol edin.")
+            log.error("❌ Veritabanı başlatma hatası: %s", e)
+            log.error("Uygulama başlatılamadı. Lütfen veritabanı ayarlarını kontrol edin.")
             sys.exit(1)
+        
+        # Çatallanan worker'lar bu sürecin SQLite bağlantılarını devralmasın
+        db.engine.dispose()
+
+SERVE_THREADS = 32  # Her wall/reji ekranının SSE bağlantısı bir thread tutar
+
+def serve(host='0.0.0.0', port=5000, workers=1, threads=SERVE_THREADS):
+    """Uygulamayı üretim sunucusunda çalıştır (debug ve reloader kapalı).
+
+    Tek worker'da waitress (Windows ve PyInstaller ile de çalışır), birden
+    fazla worker'da gunicorn kullanılır.
+    """
+    if workers > 1:
+        # Olay yolu ve okuma önbelleği süreç içinde tutulur; worker'lar birbirinin yazmalarını görmez
+        log.warning("⚠️  Çok worker'lı mod: okuma önbelleği kapatıldı. Canlı olaylar (/api/events) yalnızca "
+                    "aynı worker'a bağlı ekranlara ulaşır; tüm ekranların eşit kalması için tek worker ve "
+                    "--threads tercih edin.")
+        game_cache.enabled = False
+        spin_buffer.enabled = False
+        serve_gunicorn(host, port, workers, threads)
+        return
+    
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        log.warning("⚠️  waitress kurulu değil, Werkzeug sunucusu (debug kapalı) kullanılıyor: pip install waitress")
+        app.run(host=host, port=port, threaded=True, debug=False, use_reloader=False)
+        return
+    log.info("🚀 Sunucu: http://%s:%s (waitress, %d thread)", host, port, threads)
+    waitress_serve(app, host=host, port=port, threads=threads)
+
+def serve_gunicorn(host, port, workers, threads):
+    from gunicorn.app.base import BaseApplication
+    
+    class TimeTunnelServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread')
+            # SSE bağlantıları uzun sürer; worker'ı zaman aşımıyla öldürme
+            self.cfg.set('timeout', 0)
+            self.cfg.set('post_fork', lambda server, worker: start_worker())
+        
+        def load(self):
+            return app
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    log.info("🚀 Sunucu: http://%s:%s (gunicorn, %d worker x %d thread)", host, port, workers, threads)
+    TimeTunnelServer().run()
+
+def warm_up(background=True):
+    """Statik dosya indeksini, manifest'i ve soru bankasını önceden yükle.
+
+    Tek süreçte arka planda yüklenir ve soru dosyaları izlenmeye başlanır,
+    sunucu bu sırada istek kabul eder. Worker süreçleri çatallanmadan önce
+    ise yüklemenin bitmesi beklenir (yarım kalmış bir yükleme kilidi çocuk
+    süreçlere geçmesin); izleyici her worker'da ``start_worker`` ile başlar.
+    """
+    if background:
+        static_resources.start()
+        question_bank_warmup.start()
+    else:
+        static_resources.get()
+        question_bank.load_all()
+
+def dispose_engine():
+    with app.app_context():
+        db.engine.dispose()
+
+def start_worker():
+    """Çatallanan worker süreci: bağlantıları bırak, soru izleyicisini (thread'ler çatallanmaz) başlat"""
+    dispose_engine()
+    question_bank.watch()
+
+def main(argv=None):
+    """Komut satırı: serve (varsayılan, üretim) ya da dev (debug + reloader)"""
+    import argparse
+    
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--host', default='0.0.0.0')
+    common.add_argument('--port', type=int, default=5000)
+    
+    parser = argparse.ArgumentParser(prog='timetunnel', description='Time Tunnel yarışma sunucusu')
+    commands = parser.add_subparsers(dest='command')
+    serve_parser = commands.add_parser('serve', parents=[common], help='Üretim sunucusu (varsayılan)')
+    serve_parser.add_argument('--workers', type=int, default=1,
+                              help='Süreç sayısı (>1 için gunicorn gerekir, yalnızca Linux/macOS)')
+    serve_parser.add_argument('--threads', type=int, default=SERVE_THREADS, help='Süreç başına thread sayısı')
+    commands.add_parser('dev', parents=[common], help='Geliştirme sunucusu (debug ve otomatik yeniden yükleme)')
+    
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args(['serve'])
+    
+    # Geliştirme modunda istek başına kayıtlar da yazılır (ortam değişkenleri yine önceliklidir)
+    if args.command == 'dev':
+        log_config.configure(default_level='DEBUG')
+    
+    init_database()
+    startup_timer.mark('database')
+    warm_up(background=args.command == 'dev' or args.workers <= 1)
+    log.info("🚀 Reji Paneli otomatik olarak açılacak...")
+    
+    # Only open browser when running as executable (PyInstaller)
+    if getattr(sys, 'frozen', False):
+        # Start browser opening in a separate thread
+        threading.Thread(target=open_browser, args=(args.port,), daemon=True).start()
+    
+    if args.command == 'dev':
+        app.run(debug=True, host=args.host, port=args.port)
+    else:
+        serve(args.host, args.port, args.workers, args.threads)
+
+startup_timer.mark('app')
+
+if __name__ == '__main__':
+    main()
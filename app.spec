@@ -1,11 +1,16 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
+# Derlenmiş soru bankası (python question_bank.py compile) varsa pakete ekle
+compiled_questions = [('questions.ttqb', '.')] if os.path.exists('questions.ttqb') else []
+# Sıkıştırılmış ve sürümlü statik dosyalar (python assets.py build) varsa pakete ekle
+compiled_assets = [('assets', 'assets')] if os.path.exists('assets/manifest.json') else []
 
 a = Analysis(
     ['app.py'],
     pathex=[],
     binaries=[],
-    datas=[('templates', 'templates'), ('static', 'static'), ('build/TimeTunnel.data', 'build'), ('build/TimeTunnel.framework.js', 'build'), ('build/TimeTunnel.loader.js', 'build'), ('build/TimeTunnel.wasm', 'build'), ('TemplateData', 'TemplateData'), ('etap1_50soru.json', '.'), ('etap2_50soru.json', '.'), ('etap3_50soru.json', '.')],
+    datas=[('templates', 'templates'), ('static', 'static'), ('build/TimeTunnel.data', 'build'), ('build/TimeTunnel.framework.js', 'build'), ('build/TimeTunnel.loader.js', 'build'), ('build/TimeTunnel.wasm', 'build'), ('TemplateData', 'TemplateData'), ('etap1_50soru.json', '.'), ('etap2_50soru.json', '.'), ('etap3_50soru.json', '.')] + compiled_questions + compiled_assets,
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,227 @@
+"""Statik dosya hattı: Unity build, TemplateData ve static dosyalarını
+derleme anında sıkıştırır ve içerik hash'iyle sürümler.
+
+    python assets.py build
+
+Her grup (``build``, ``TemplateData``, ``static``) için dosyaların gzip ve
+(``brotli`` kuruluysa) brotli kopyaları ``assets/<grup>/`` altına yazılır,
+``assets/manifest.json`` dosyası her dosyanın hash'ini ve sıkıştırılmış
+boyutlarını tutar. Sürüm, dosya adına değil grubun adresine eklenir
+(``/assets/<grup>/<grup hash>/<yol>``); böylece CSS ``url()`` ve ES modül
+``import`` gibi göreli referanslar aynı sürüm içinde çözülür. Grubun
+herhangi bir dosyası değişince grubun hash'i ve adresleri değişir.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+from log_config import get_logger
+
+log = get_logger('assets')
+
+ASSET_DIR = 'assets'
+MANIFEST_FILENAME = 'manifest.json'
+MANIFEST_VERSION = 1
+GROUPS = ('build', 'TemplateData', 'static')
+
+# Sıkıştırılmış dosyalar bu uzantılar için üretilir (png/jpg gibi zaten sıkıştırılmış olanlar atlanır)
+COMPRESSIBLE = {'.js', '.mjs', '.css', '.html', '.json', '.wasm', '.data', '.svg', '.txt', '.map', '.xml', '.ico'}
+MIN_SIZE = 1024      # Bundan küçük dosyalar sıkıştırılmaz
+MAX_RATIO = 0.95     # Sıkıştırılmış kopya en az %5 küçük değilse saklanmaz
+
+# Accept-Encoding adı -> dosya uzantısı, tercih sırasına göre
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def group_folder(base_path, group):
+    return os.path.join(base_path, group)
+
+
+def iter_files(folder):
+    """Klasördeki dosyaları (göreli yol, tam yol) olarak sıralı döndür"""
+    for root, dirs, names in os.walk(folder):
+        dirs.sort()
+        for name in sorted(names):
+            full_path = os.path.join(root, name)
+            yield os.path.relpath(full_path, folder).replace(os.sep, '/'), full_path
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def load_brotli():
+    """brotli opsiyoneldir ve yalnızca derlemede gerekir; sunucu açılışında içe aktarılmaz"""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def compress(data, encoding):
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    brotli = load_brotli() if encoding == 'br' else None
+    if brotli is not None:
+        return brotli.compress(data, quality=11)
+    return None
+
+
+def build_assets(base_path, output_path=None, groups=GROUPS):
+    """Grupların sıkıştırılmış kopyalarını ve manifest dosyasını üret"""
+    output_path = output_path or os.path.join(base_path, ASSET_DIR)
+    if load_brotli() is None:
+        log.warning("brotli kurulu değil, yalnızca gzip kopyaları üretilecek: pip install brotli")
+
+    manifest = {'version': MANIFEST_VERSION, 'groups': {}}
+    for group in groups:
+        folder = group_folder(base_path, group)
+        target = os.path.join(output_path, group)
+        shutil.rmtree(target, ignore_errors=True)
+
+        files = {}
+        group_digest = hashlib.sha256()
+        for relpath, full_path in iter_files(folder):
+            with open(full_path, 'rb') as f:
+                data = f.read()
+            stat = os.stat(full_path)
+            digest = hashlib.sha256(data).hexdigest()
+            group_digest.update(f'{relpath}\0{digest}\0'.encode('utf-8'))
+
+            encodings = {}
+            if os.path.splitext(relpath)[1].lower() in COMPRESSIBLE and len(data) >= MIN_SIZE:
+                for encoding, suffix in ENCODINGS:
+                    compressed = compress(data, encoding)
+                    if compressed is None or len(compressed) > len(data) * MAX_RATIO:
+                        continue
+                    variant_path = os.path.join(target, relpath + suffix)
+                    os.makedirs(os.path.dirname(variant_path), exist_ok=True)
+                    with open(variant_path, 'wb') as f:
+                        f.write(compressed)
+                    encodings[encoding] = len(compressed)
+
+            files[relpath] = {'hash': digest[:16], 'size': stat.st_size,
+                              'mtime_ns': stat.st_mtime_ns, 'encodings': encodings}
+
+        manifest['groups'][group] = {'hash': group_digest.hexdigest()[:12], 'files': files}
+
+    os.makedirs(output_path, exist_ok=True)
+    manifest_path = os.path.join(output_path, MANIFEST_FILENAME)
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    return manifest_path
+
+
+class AssetManifest:
+    """Derlenmiş manifest'in çalışma zamanı görünümü.
+
+    Açılışta bir kez yüklenir ve her dosyanın boyutu/mtime değeri kaynakla
+    karşılaştırılır; derlemeden sonra değişmiş dosyası olan grup sürümlü
+    adres almaz (eski adreslerle sunulmaya devam eder). Manifest yoksa
+    bütün gruplar sıkıştırılmamış ve sürümsüz sunulur.
+    """
+
+    def __init__(self, base_path, output_path=None):
+        self.base_path = base_path
+        self.output_path = output_path or os.path.join(base_path, ASSET_DIR)
+        self.groups = {}
+        self.probes = 0
+
+    @classmethod
+    def load(cls, base_path, output_path=None):
+        manifest = cls(base_path, output_path)
+        path = os.path.join(manifest.output_path, MANIFEST_FILENAME)
+        manifest.probes += 1
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError) as e:
+            log.error("Asset manifest okunamadı (%s): %s", path, e)
+            return manifest
+        if data.get('version') != MANIFEST_VERSION:
+            log.warning("Asset manifest sürümü desteklenmiyor: %s", data.get('version'))
+            return manifest
+
+        for group, entry in data.get('groups', {}).items():
+            stale = manifest._stale_file(group, entry['files'])
+            if stale:
+                log.warning("%s/%s derlemeden sonra değişmiş; '%s' grubu sürümsüz sunulacak "
+                            "(python assets.py build)", group, stale, group)
+                continue
+            manifest.groups[group] = entry
+        return manifest
+
+    def _stale_file(self, group, files):
+        folder = group_folder(self.base_path, group)
+        self.probes += 1
+        added = sorted({relpath for relpath, _ in iter_files(folder)} - files.keys())
+        if added:
+            return added[0]
+        for relpath, info in files.items():
+            self.probes += 1
+            try:
+                stat = os.stat(os.path.join(folder, relpath))
+            except OSError:
+                return relpath
+            if stat.st_size != info['size']:
+                return relpath
+            # PyInstaller paketten çıkarırken mtime değişir; o durumda içeriği karşılaştır
+            if stat.st_mtime_ns != info['mtime_ns'] and file_hash(os.path.join(folder, relpath)) != info['hash']:
+                return relpath
+        return None
+
+    def group_hash(self, group):
+        entry = self.groups.get(group)
+        return entry['hash'] if entry else None
+
+    def url(self, group, relpath):
+        """Dosyanın sürümlü adresi; manifest'te yoksa None"""
+        entry = self.groups.get(group)
+        if entry is None or relpath not in entry['files']:
+            return None
+        return f'/{ASSET_DIR}/{group}/{entry["hash"]}/{relpath}'
+
+    def variants(self, group, relpath):
+        """(encoding, dosya yolu) çiftleri tercih sırasına göre ve dosyanın hash'i"""
+        entry = self.groups.get(group)
+        info = entry['files'].get(relpath) if entry else None
+        if info is None:
+            return [], None
+        variants = [(encoding, os.path.join(self.output_path, group, relpath + suffix))
+                    for encoding, suffix in ENCODINGS if encoding in info['encodings']]
+        return variants, info['hash']
+
+
+def main(argv=None):
+    default_base = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='TimeTunnel statik dosya hattı')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help='build/, TemplateData/ ve static/ dosyalarını sıkıştır ve sürümle')
+    build_parser.add_argument('--base', default=default_base, help='kaynak klasörlerin bulunduğu klasör')
+    build_parser.add_argument('-o', '--output', help=f'çıktı klasörü (varsayılan: <base>/{ASSET_DIR})')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        manifest_path = build_assets(args.base, args.output)
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        for group, entry in manifest['groups'].items():
+            original = sum(info['size'] for info in entry['files'].values())
+            compressed = sum(min(info['encodings'].values(), default=info['size']) for info in entry['files'].values())
+            print(f"{group}: {len(entry['files'])} dosya, sürüm {entry['hash']}, "
+                  f"{original // 1024} KB -> {compressed // 1024} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,472 @@
+"""Yarışma API'sinin sıcak yolları için tekrarlanabilir benchmark.
+
+    python benchmark.py                         # test client + HTTP, sonuç stdout'a
+    python benchmark.py --mode http -o bench.json
+    python benchmark.py --contestants 200 --requests 2000 --concurrency 16
+    python benchmark.py --startup 5 --startup-only   # ilk yanıta kadar geçen açılış süresi
+
+Uygulama geçici bir SQLite dosyasıyla (``TIMETUNNEL_DATABASE_URL``) açılır;
+gerçek ``instance/timetunnel.db`` dosyasına dokunulmaz. Her senaryo hem
+Flask test client'ı ile süreç içinde hem de yerel bir sunucuya (waitress,
+yoksa Werkzeug) açılan keep-alive HTTP bağlantılarıyla koşturulabilir.
+
+Sonuç JSON'u her senaryo için p50/p95/p99 gecikmeyi (ms), saniyedeki istek
+sayısını, hata sayısını ve senaryo boyunca yazma kuyruğunun commit, iş ve
+SQLite kilit yeniden deneme sayılarını içerir; ``meta`` bölümü sürümü
+(git commit) ve ortamı kaydeder, böylece sürümler arası karşılaştırılabilir.
+"""
+import argparse
+import base64
+import http.client
+import itertools
+import json
+import logging
+import math
+import os
+import platform
+import random
+import shutil
+import socket
+import sqlite3
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+
+import startup
+
+SCENARIOS = ('contestants_list', 'contestants_304', 'question_draw', 'wheel_spin',
+             'score_burst', 'stage2_toggle', 'stage2_reveal', 'leaderboard')
+STAGES = (1, 2, 3)
+STARTUP_POLL_INTERVAL = 0.005
+STARTUP_TIMEOUT = 60
+
+
+def tiny_png(seed, size=16):
+    """Her seed için farklı (tekilleştirmeye takılmayan) küçük bir PNG"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    rng = random.Random(seed)
+    rows = b''.join(b'\x00' + bytes(rng.randrange(256) for _ in range(size * 3)) for _ in range(size))
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(rows))
+            + chunk(b'IEND', b''))
+
+
+def percentile(sorted_values, fraction):
+    """Sıralı listede en yakın sıra yöntemiyle yüzdelik (ceil(p * n). değer)"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class ClientTransport:
+    """Flask test client'ı ile süreç içi istekler"""
+    name = 'client'
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+
+    def session(self):
+        client = self.flask_app.test_client()
+
+        def send(method, path, body=None, headers=None):
+            response = client.open(path, method=method, json=body, headers=headers)
+            response.get_data()
+            return response.status_code, response.headers.get('ETag')
+        return send
+
+    def close(self):
+        pass
+
+
+class HttpTransport:
+    """Yerel sunucuya keep-alive HTTP bağlantılarıyla istekler"""
+    name = 'http'
+
+    def __init__(self, flask_app, threads):
+        self.host = '127.0.0.1'
+        try:
+            from waitress.server import create_server
+            self.server = create_server(flask_app, host=self.host, port=0, threads=threads,
+                                        connection_limit=max(100, threads * 4))
+            self.port = self.server.effective_port
+            self.server_name = 'waitress'
+            self._stop = self._stop_waitress
+            self._stopped = threading.Event()
+            self._thread = threading.Thread(target=self._run_waitress, daemon=True)
+            # Yük altında her istekte yazılan "Task queue depth" uyarıları sonucu etkilemesin
+            logging.getLogger('waitress.queue').setLevel(logging.ERROR)
+        except ImportError:
+            from werkzeug.serving import make_server
+            self.server = make_server(self.host, 0, flask_app, threaded=True)
+            self.port = self.server.server_port
+            self.server_name = 'werkzeug'
+            self._stop = self.server.shutdown
+            self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def _run_waitress(self):
+        # server.run() durdurulamaz; döngü kısa adımlarla çalıştırılıp bayrakla bitirilir
+        while not self._stopped.is_set():
+            self.server.asyncore.loop(timeout=0.1, map=self.server._map, count=1)
+
+    def _stop_waitress(self):
+        self._stopped.set()
+        self._thread.join()
+        self.server.task_dispatcher.shutdown()
+        self.server.asyncore.close_all(self.server._map)
+
+    def session(self):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+
+        def send(method, path, body=None, headers=None):
+            headers = dict(headers or {})
+            payload = None
+            if body is not None:
+                payload = json.dumps(body).encode('utf-8')
+                headers['Content-Type'] = 'application/json'
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status, response.getheader('ETag')
+        return send
+
+    def close(self):
+        try:
+            self._stop()
+        except Exception:
+            pass
+
+
+def run_requests(transport, requests, concurrency):
+    """İstekleri ``concurrency`` iş parçacığıyla gönder, gecikmeleri topla"""
+    counter = itertools.count()
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def worker():
+        send = transport.session()
+        local_latencies, local_errors = [], 0
+        while True:
+            index = next(counter)
+            if index >= len(requests):
+                break
+            method, path, body, headers = requests[index]
+            started = time.perf_counter()
+            try:
+                status, _ = send(method, path, body, headers)
+            except Exception:
+                status = None
+            local_latencies.append(time.perf_counter() - started)
+            if status is None or status >= 400:
+                local_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors.append(local_errors)
+
+    threads = [threading.Thread(target=worker) for _ in range(max(1, concurrency))]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, sum(errors), time.perf_counter() - started
+
+
+class Benchmark:
+    def __init__(self, timetunnel, contestants, requests, concurrency, photos, seed):
+        self.tt = timetunnel
+        self.contestants = contestants
+        self.requests = requests
+        self.concurrency = concurrency
+        self.photos = photos
+        self.rng = random.Random(seed)
+        self.contestant_ids = []
+
+    def setup(self):
+        """Yarışmacıları (fotoğraflarıyla) API üzerinden oluştur"""
+        send = ClientTransport(self.tt.app).session()
+        for i in range(self.contestants):
+            body = {'name': f'Yarışmacı {i + 1}'}
+            if self.photos:
+                body['photo'] = 'data:image/png;base64,' + base64.b64encode(tiny_png(i)).decode('ascii')
+            send('POST', '/api/contestants', body)
+        with self.tt.app.app_context():
+            self.contestant_ids = [c.id for c in self.tt.Contestant.query.filter_by(
+                game_id=self.tt.DEFAULT_GAME_ID).order_by(self.tt.Contestant.id)]
+
+    def build(self, scenario, transport):
+        """Senaryonun istek listesi ve eşzamanlılığı"""
+        n = self.requests
+        if scenario == 'contestants_list':
+            return [('GET', '/api/contestants', None, None)] * n, self.concurrency
+        if scenario == 'contestants_304':
+            _, etag = transport.session()('GET', '/api/contestants')
+            headers = {'If-None-Match': etag} if etag else None
+            return [('GET', '/api/contestants', None, headers)] * n, self.concurrency
+        if scenario == 'question_draw':
+            # Soru çekme tek operatör işidir; destelerin tükenip yeniden karıştırılmasını da kapsar
+            return [('GET', f'/api/questions/{STAGES[i % len(STAGES)]}', None, None) for i in range(n)], 1
+        if scenario == 'wheel_spin':
+            return [('POST', '/api/wheel-spin', {'stage': STAGES[i % len(STAGES)], 'user_id': 'bench'}, None)
+                    for i in range(n)], self.concurrency
+        if scenario == 'score_burst':
+            ids = self.contestant_ids or [0]
+            return [('POST', f'/api/contestants/{self.rng.choice(ids)}/score', {'points': 10}, None)
+                    for _ in range(n)], self.concurrency
+        if scenario == 'stage2_toggle':
+            requests = []
+            for i in range(n):
+                if i % 4 == 3:
+                    requests.append(('GET', '/api/stage2/option-state', None, None))
+                else:
+                    requests.append(('POST', '/api/stage2/option-state',
+                                     {'optionIndex': i % 6, 'state': self.rng.choice(('D', 'Y', 'def'))}, None))
+            return requests, self.concurrency
+        if scenario == 'stage2_reveal':
+            # Sorunun 6 şıkkının cevapları tek istekte açılır
+            return [('POST', '/api/stage2/option-states',
+                     {'questionId': i % 50, 'options': [{'optionIndex': k, 'state': self.rng.choice(('D', 'Y'))}
+                                                        for k in range(6)]}, None)
+                    for i in range(n)], self.concurrency
+        if scenario == 'leaderboard':
+            # Puan değişiklikleri arasında sıralama okumaları (ilk 10 ve yarışmacının sırası)
+            ids = self.contestant_ids or [0]
+            requests = []
+            for i in range(n):
+                if i % 4 == 0:
+                    requests.append(('POST', f'/api/contestants/{self.rng.choice(ids)}/score', {'points': 10}, None))
+                elif i % 4 == 1:
+                    requests.append(('GET', f'/api/contestants/{self.rng.choice(ids)}/rank', None, None))
+                else:
+                    requests.append(('GET', '/api/leaderboard?limit=10&active=1', None, None))
+            return requests, self.concurrency
+        raise ValueError(f'Bilinmeyen senaryo: {scenario}')
+
+    def run(self, scenario, transport):
+        requests, concurrency = self.build(scenario, transport)
+        self.tt.spin_buffer.flush()
+        writer = self.tt.writer
+        before = (writer.commits, writer.jobs, writer.lock_retries)
+        latencies, errors, elapsed = run_requests(transport, requests, concurrency)
+        self.tt.spin_buffer.flush()
+        latencies.sort()
+        ms = [value * 1000 for value in latencies]
+        return {
+            'scenario': scenario,
+            'mode': transport.name,
+            'requests': len(latencies),
+            'concurrency': concurrency,
+            'errors': errors,
+            'elapsed_s': round(elapsed, 4),
+            'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+            'latency_ms': {
+                'mean': round(statistics.fmean(ms), 3) if ms else None,
+                'p50': round(percentile(ms, 0.50), 3) if ms else None,
+                'p95': round(percentile(ms, 0.95), 3) if ms else None,
+                'p99': round(percentile(ms, 0.99), 3) if ms else None,
+                'max': round(ms[-1], 3) if ms else None,
+            },
+            'db': {
+                'commits': writer.commits - before[0],
+                'jobs': writer.jobs - before[1],
+                'lock_retries': writer.lock_retries - before[2],
+            },
+        }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def startup_phases(port):
+    """Sunucunun kendi ölçtüğü açılış adımlarını /api/metrics'ten oku"""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    connection.request('GET', '/api/metrics')
+    body = connection.getresponse().read().decode('utf-8')
+    connection.close()
+    phases = {}
+    for line in body.splitlines():
+        if line.startswith('timetunnel_startup_phase_seconds{'):
+            labels, _, value = line.rpartition(' ')
+            phases[labels.split('"')[1]] = round(float(value), 4)
+        elif line.startswith('timetunnel_startup_first_request_seconds '):
+            phases['first_request'] = round(float(line.rpartition(' ')[2]), 4)
+    return phases
+
+
+def measure_startup(base_path, runs, workdir):
+    """``python -m timetunnel serve`` sürecini soğuk başlatıp ilk yanıta kadar geçen süreyi ölç.
+
+    İlk çalıştırma boş veritabanıyla (bütün şema taşımaları çalışır),
+    sonrakiler aynı, güncel veritabanıyla yapılır.
+    """
+    env = dict(os.environ, TIMETUNNEL_LOG_LEVEL='WARNING',
+               TIMETUNNEL_DATABASE_URL='sqlite:///' + os.path.join(workdir, 'startup.db'))
+    results = []
+    for run in range(runs):
+        port = free_port()
+        started = time.perf_counter()
+        process = subprocess.Popen([sys.executable, '-m', 'timetunnel', 'serve', '--host', '127.0.0.1',
+                                    '--port', str(port)], cwd=base_path, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        first_response, phases = None, {}
+        try:
+            while first_response is None and process.poll() is None \
+                    and time.perf_counter() - started < STARTUP_TIMEOUT:
+                try:
+                    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+                    connection.request('GET', '/api/game-state')
+                    response = connection.getresponse()
+                    response.read()
+                    connection.close()
+                    if response.status == 200:
+                        first_response = time.perf_counter() - started
+                except OSError:
+                    time.sleep(STARTUP_POLL_INTERVAL)
+            if first_response is not None:
+                phases = startup_phases(port)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+        results.append({'run': run + 1, 'fresh_database': run == 0,
+                        'first_response_s': round(first_response, 4) if first_response is not None else None,
+                        'server_phases_s': phases})
+        print(f"startup #{run + 1}: {results[-1]['first_response_s']} s", file=sys.stderr)
+    return results
+
+
+def git_version(base_path):
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=base_path,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(args, base_path, workdir):
+    """Açılış ölçümü ve API senaryolarını ``workdir`` içindeki veritabanlarıyla çalıştır, raporu döndür"""
+    # Uygulama içe aktarılmadan önce geçici veritabanı ve sessiz log seviyesi ayarlanır
+    os.environ['TIMETUNNEL_DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.environ.setdefault('TIMETUNNEL_LOG_LEVEL', 'WARNING')
+    random.seed(args.seed)
+
+    startup_report = None
+    if args.startup:
+        runs = measure_startup(base_path, args.startup, workdir)
+        # Boş veritabanıyla ilk açılış taşımaları da içerir; hedef güncel veritabanıyla açılışa uygulanır
+        measured = [r['first_response_s'] for r in runs[1:] or runs]
+        p50 = None if None in measured else statistics.median(measured)
+        startup_report = {
+            'target_s': args.startup_target,
+            'first_response_p50_s': round(p50, 4) if p50 is not None else None,
+            'within_target': p50 is not None and p50 <= args.startup_target,
+            'runs': runs,
+        }
+
+    results = []
+    server = None
+    setup_elapsed = None
+    modes = () if args.startup_only else (('client', 'http') if args.mode == 'both' else (args.mode,))
+    if modes:
+        import app as timetunnel
+        timetunnel.log_config.configure()
+        timetunnel.init_database()
+
+        bench = Benchmark(timetunnel, args.contestants, args.requests, args.concurrency, args.photos, args.seed)
+        setup_started = time.perf_counter()
+        bench.setup()
+        setup_elapsed = time.perf_counter() - setup_started
+
+    scenarios = args.scenario or SCENARIOS
+    for mode in modes:
+        if mode == 'client':
+            transport = ClientTransport(timetunnel.app)
+        else:
+            transport = HttpTransport(timetunnel.app, threads=max(args.concurrency, 4))
+            server = transport.server_name
+        try:
+            for scenario in scenarios:
+                results.append(bench.run(scenario, transport))
+                print(f"{mode:6} {scenario:17} p50 {results[-1]['latency_ms']['p50']} ms, "
+                      f"{results[-1]['throughput_rps']} req/s", file=sys.stderr)
+        finally:
+            transport.close()
+
+    if modes:
+        timetunnel.spin_buffer.flush()
+        timetunnel.dispose_engine()
+
+    report = {
+        'meta': {
+            'version': git_version(base_path),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'server': server,
+            'contestants': args.contestants,
+            'photos': args.photos,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'seed': args.seed,
+            'setup_s': round(setup_elapsed, 4) if setup_elapsed is not None else None,
+        },
+        'results': results,
+        'startup': startup_report,
+    }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TimeTunnel API benchmark')
+    parser.add_argument('--mode', choices=('client', 'http', 'both'), default='both')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS,
+                        help='yalnızca verilen senaryolar (birden fazla verilebilir)')
+    parser.add_argument('--contestants', type=int, default=50, help='oluşturulacak yarışmacı sayısı')
+    parser.add_argument('--no-photos', dest='photos', action='store_false', help='yarışmacılar fotoğrafsız')
+    parser.add_argument('--requests', type=int, default=500, help='senaryo başına istek sayısı')
+    parser.add_argument('--concurrency', type=int, default=8, help='eşzamanlı istemci sayısı')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--startup', type=int, default=0, metavar='N',
+                        help='sunucuyu N kez soğuk başlatıp ilk yanıta kadar geçen süreyi ölç')
+    parser.add_argument('--startup-only', action='store_true', help='API senaryolarını çalıştırma')
+    parser.add_argument('--startup-target', type=float, default=startup.timer.target,
+                        help='ilk yanıt için hedef süre (sn); aşılırsa çıkış kodu 1 olur')
+    parser.add_argument('-o', '--output', help='sonuç JSON dosyası (varsayılan: stdout)')
+    args = parser.parse_args(argv)
+    base_path = os.path.dirname(os.path.abspath(__file__))
+
+    # Geçici veritabanları iş bitince (hata olsa da) silinir
+    workdir = tempfile.mkdtemp(prefix='timetunnel-bench-')
+    try:
+        report = run_benchmarks(args, base_path, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    startup_report = report['startup']
+    output = json.dumps(report, ensure_ascii=False, indent=1)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    if startup_report is not None and not startup_report['within_target']:
+        print(f"İlk yanıt hedefi aşıldı: {startup_report['first_response_p50_s']} s > "
+              f"{startup_report['target_s']} s", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
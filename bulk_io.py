@@ -0,0 +1,140 @@
+"""Toplu içe/dışa aktarma: NDJSON ve CSV okuma ve yazma.
+
+Okuyucu kayıtları gelen akıştan satır satır üretir. Yazıcılar kayıtları
+``CHUNK_SIZE`` büyüklüğünde parçalar halinde döndüren generator'lardır;
+Flask yanıtı kayıtlar veritabanından okundukça gönderilir, liste bellekte
+birikmez.
+"""
+import csv
+import io
+import json
+
+CHUNK_SIZE = 16 * 1024
+
+# Biçim -> yanıt mimetype'ı ve dosya uzantısı
+FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+}
+# İstek Content-Type -> biçim
+MIMETYPE_FORMATS = {
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'application/x-jsonlines': 'ndjson',
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+}
+
+TRUE_VALUES = {'1', 'true', 'yes', 'evet', 'e', 'y'}
+FALSE_VALUES = {'', '0', 'false', 'no', 'hayır', 'hayir', 'h', 'n'}
+
+
+class BulkFormatError(ValueError):
+    """Okunan kayıtlardaki hata; mesaj satır numarasını içerir"""
+
+    def __init__(self, line, message):
+        super().__init__(f'{line}. satır: {message}')
+        self.line = line
+
+
+def detect_format(mimetype, requested=None):
+    """``?format=`` ya da Content-Type'a göre 'ndjson'/'csv' (tanınmazsa None)"""
+    if requested:
+        return requested if requested in FORMATS else None
+    return MIMETYPE_FORMATS.get((mimetype or '').lower())
+
+
+def parse_bool(value, default=False):
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False if text else default
+    raise ValueError(f'Geçersiz mantıksal değer: {value!r}')
+
+
+def parse_int(value, default=0):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return default
+    if isinstance(value, bool):
+        raise ValueError(f'Geçersiz sayı: {value!r}')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'Geçersiz sayı: {value!r}') from None
+
+
+def read_records(stream, fmt):
+    """İkili akıştan (satır numarası, kayıt sözlüğü) çiftleri üret"""
+    if isinstance(stream, io.RawIOBase):
+        stream = io.BufferedReader(stream)
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'ndjson':
+        for number, line in enumerate(text, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise BulkFormatError(number, f'geçersiz JSON ({e})') from None
+            if not isinstance(record, dict):
+                raise BulkFormatError(number, 'her satır bir JSON nesnesi olmalı')
+            yield number, record
+    elif fmt == 'csv':
+        reader = csv.DictReader(text)
+        for record in reader:
+            if not any(record.values()):
+                continue
+            yield reader.line_num, {key.strip(): value for key, value in record.items() if key}
+    else:
+        raise ValueError(f'Desteklenmeyen biçim: {fmt}')
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return value
+
+
+def ndjson_chunks(records):
+    """Kayıtları NDJSON satırları olarak parça parça üret"""
+    buffer = []
+    size = 0
+    for record in records:
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def csv_chunks(records, fields):
+    """Kayıtları başlık satırıyla birlikte CSV olarak parça parça üret"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for record in records:
+        writer.writerow([_csv_value(record.get(field)) for field in fields])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def chunks(records, fmt, fields):
+    return ndjson_chunks(records) if fmt == 'ndjson' else csv_chunks(records, fields)
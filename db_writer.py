@@ -0,0 +1,126 @@
+"""Tek yazar thread'i: tüm veritabanı yazmaları sırayla ve toplu commit ile yapılır."""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy.exc import OperationalError
+
+from log_config import get_logger
+
+log = get_logger('db_writer')
+
+MAX_BATCH = 64
+LOCK_RETRIES = 5
+LOCK_RETRY_DELAY = 0.05
+
+
+def is_lock_error(error):
+    return isinstance(error, OperationalError) and 'database is locked' in str(error).lower()
+
+
+class WriteQueue:
+    """Yazma işlerini tek bir thread'de çalıştırır.
+
+    Kuyrukta birikmiş işler aynı transaction'da çalıştırılıp tek commit ile
+    yazılır (group commit). Toplu commit başarısız olursa işler tek tek
+    yeniden denenir; böylece hatalı bir iş diğerlerini düşürmez. İşler
+    yalnızca veritabanı işlemi yapmalı ve ORM nesnesi değil düz veri
+    döndürmelidir, çünkü oturum her toplu commit'ten sonra kapatılır.
+    """
+
+    def __init__(self, app, db, max_batch=MAX_BATCH):
+        self.app = app
+        self.db = db
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.commits = 0
+        self.jobs = 0
+        self.lock_retries = 0
+
+    @property
+    def queue_depth(self):
+        """Kuyrukta bekleyen iş sayısı"""
+        return self._queue.qsize()
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, func, *args, **kwargs):
+        """İşi kuyruğa ekle ve sonucunu taşıyan Future döndür"""
+        if threading.current_thread() is self._thread:
+            # Yazar thread'i içinden gelen iç içe çağrılar doğrudan çalışır
+            future = Future()
+            future.set_result(func(*args, **kwargs))
+            return future
+        self._ensure_started()
+        future = Future()
+        self._queue.put((future, func, args, kwargs))
+        return future
+
+    def run(self, func, *args, **kwargs):
+        """İşi kuyruğa ekle ve commit edilene kadar bekle"""
+        return self.submit(func, *args, **kwargs).result()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            batch = [job for job in batch if job[0].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            with self.app.app_context():
+                try:
+                    self._execute(batch)
+                finally:
+                    self.db.session.remove()
+
+    def _execute(self, batch):
+        if len(batch) > 1:
+            try:
+                results = self._attempt(batch)
+            except Exception:
+                pass
+            else:
+                for (future, *_), result in zip(batch, results):
+                    future.set_result(result)
+                return
+
+        # Tek iş ya da toplu commit'i başarısız olan işler tek tek çalıştırılır
+        for job in batch:
+            try:
+                result = self._attempt([job])[0]
+            except Exception as e:
+                job[0].set_exception(e)
+            else:
+                job[0].set_result(result)
+
+    def _attempt(self, jobs):
+        """İşleri çalıştırıp commit et; başka bir süreç kilit tutuyorsa baştan tekrar dene"""
+        session = self.db.session
+        for attempt in range(LOCK_RETRIES):
+            try:
+                results = [func(*args, **kwargs) for _, func, args, kwargs in jobs]
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                if not is_lock_error(e) or attempt == LOCK_RETRIES - 1:
+                    raise
+                self.lock_retries += 1
+                log.debug("Veritabanı kilitli, %d. kez yeniden deneniyor", attempt + 1)
+                time.sleep(LOCK_RETRY_DELAY * (2 ** attempt))
+            else:
+                self.commits += 1
+                self.jobs += len(jobs)
+                return results
@@ -0,0 +1,97 @@
+"""Oyun olaylarını bağlı ekranlara Server-Sent Events ile iten olay yolu."""
+import json
+import queue
+import threading
+from collections import deque
+
+from log_config import get_logger
+
+log = get_logger('event_bus')
+
+HEARTBEAT_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 256
+REPLAY_SIZE = 256
+
+
+class EventBus:
+    """Küçük fark olaylarını tüm abonelere dağıtır.
+
+    Her olay artan bir id alır; yeniden bağlanan istemci ``Last-Event-ID``
+    gönderirse kaçırdığı son olaylar tekrar gönderilir. Kuyruğu dolan yavaş
+    abone düşürülür, istemci yeniden bağlanınca baştan eşitlenir.
+    """
+
+    def __init__(self, replay_size=REPLAY_SIZE):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._recent = deque(maxlen=replay_size)
+        self._last_id = 0
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def publish(self, event_type, data=None):
+        """Olayı yayınla ve id'sini döndür"""
+        with self._lock:
+            self._last_id += 1
+            message = format_sse(event_type, data or {}, self._last_id)
+            self._recent.append((self._last_id, message))
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                self._drop(subscriber)
+        return self._last_id
+
+    def _drop(self, subscriber):
+        log.info("Yavaş abone düşürüldü (kuyruk dolu)")
+        with self._lock:
+            self._subscribers.discard(subscriber)
+        try:
+            subscriber.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def subscribe(self, last_event_id=None):
+        """Yeni bir abone kuyruğu aç; kaçırılan olaylar kuyruğa önceden eklenir"""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            if last_event_id is not None:
+                for event_id, message in self._recent:
+                    if event_id > last_event_id:
+                        subscriber.put_nowait(message)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def stream(self, last_event_id=None, heartbeat=HEARTBEAT_SECONDS):
+        """SSE yanıt gövdesi üreten generator"""
+        subscriber = self.subscribe(last_event_id)
+        try:
+            yield 'retry: 2000\n\n'
+            while True:
+                try:
+                    message = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    # Proxy'lerin bağlantıyı kapatmaması için yorum satırı gönder
+                    yield ': ping\n\n'
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscriber)
+
+
+def format_sse(event_type, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event_type}')
+    lines.append(f'data: {json.dumps(data, ensure_ascii=False, separators=(",", ":"))}')
+    return '\n'.join(lines) + '\n\n'
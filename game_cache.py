@@ -0,0 +1,83 @@
+"""Oyun bazlı bellek içi durum önbelleği."""
+import secrets
+import threading
+
+
+class GameCache:
+    """Her oyunun okunmuş durumunu (yarışmacı listesi, oyun durumu...) ayrı tutar.
+
+    Girdiler ``(game_id, key)`` ile tutulur; bir oyunun yazmaları yalnızca
+    kendi girdilerini geçersiz kılar, böylece bir oyunun okunması ya da
+    sıfırlanması aynı anda kaç oyun çalıştığından etkilenmez. Her girdinin
+    bir sürümü vardır ve her geçersiz kılma sürümü artırır; eski sürümle
+    okunan değer önbelleğe yazılmaz. ``None`` değerler önbelleğe alınmaz.
+
+    ``etag()`` girdinin güncel sürümünü veritabanına sormadan verir;
+    istemci aynı ETag'i gönderirse 304 dönülebilir. ETag'ler süreç başına
+    rastgele bir önek taşır, yeniden başlatmadan sonra eski ETag eşleşmez.
+
+    Önbellek süreç içindedir; başka süreçlerin yazmalarını görmez. Birden
+    fazla worker süreciyle çalışırken ``enabled`` kapatılır (ETag de verilmez).
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.token = secrets.token_hex(4)
+        self._lock = threading.Lock()
+        self._entries = {}      # game_id -> {key: value}
+        self._versions = {}     # (game_id, key) -> sürüm
+        self._generations = {}  # game_id -> tüm girdileri geçersiz kılma sayısı
+        self.hits = 0
+        self.misses = 0
+
+    def _version(self, game_id, key):
+        return self._generations.get(game_id, 0), self._versions.get((game_id, key), 0)
+
+    def etag(self, game_id, key):
+        """Girdinin güncel sürümünü gösteren ETag (önbellek kapalıysa None)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            generation, version = self._version(game_id, key)
+        return f'{self.token}-{game_id}-{key}-{generation}.{version}'
+
+    def get(self, game_id, key, loader):
+        """Önbellekteki değeri döndür, yoksa loader() ile oku ve sakla"""
+        if not self.enabled:
+            return loader()
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is not None and key in entry:
+                self.hits += 1
+                return entry[key]
+            self.misses += 1
+            version = self._version(game_id, key)
+
+        value = loader()
+
+        if value is not None:
+            with self._lock:
+                if self._version(game_id, key) == version:
+                    self._entries.setdefault(game_id, {})[key] = value
+        return value
+
+    def peek(self, game_id, key):
+        """Önbellekteki değer; yoksa ya da önbellek kapalıysa None (veritabanından okumaz)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(game_id)
+            return entry.get(key) if entry is not None else None
+
+    def invalidate(self, game_id, *keys):
+        """Oyunun verilen girdilerini (key verilmezse hepsini) geçersiz kıl"""
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if keys:
+                for key in keys:
+                    self._versions[(game_id, key)] = self._versions.get((game_id, key), 0) + 1
+                    if entry is not None:
+                        entry.pop(key, None)
+            else:
+                self._generations[game_id] = self._generations.get(game_id, 0) + 1
+                self._entries.pop(game_id, None)
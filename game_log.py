@@ -0,0 +1,87 @@
+"""Oyun olay kaydının tekrar oynatılması.
+
+Durum, JSON'a çevrilebilir basit bir sözlüktür; snapshot'lar bu sözlüğün
+kendisini saklar ve snapshot'tan sonraki olaylar ``apply_event`` ile
+sırayla uygulanarak herhangi bir andaki durum elde edilir.
+
+2. etap şık durumları soru bazında tutulur
+(``stage2_options[soru id][şık] = 'D' | 'Y' | 'def'``);
+``stage2_question_id`` ekranda şıkları gösterilen sorudur. Soru bilgisi
+olmayan eski olaylar ve snapshot'lar o anki soruya uygulanır.
+"""
+
+# İstemcilerin gönderdiği değer -> saklanan durum (doğru/yanlış düğmeleri true/false gönderir)
+OPTION_STATES = {'D': 'D', 'Y': 'Y', 'def': 'def', True: 'D', False: 'Y'}
+
+
+def option_state(value):
+    """Şık durumunu 'D'/'Y'/'def' olarak döndür; geçersizse ValueError"""
+    try:
+        return OPTION_STATES[value]
+    except (KeyError, TypeError):
+        raise ValueError(f'Geçersiz şık durumu: {value!r}') from None
+
+
+def empty_state():
+    return {'contestants': {}, 'stage2_question_id': 0, 'stage2_options': {}}
+
+
+def upgrade_state(state):
+    """Şık durumlarını tek sözlükte tutan eski snapshot'ları soru bazlı biçime çevir"""
+    if 'stage2_options' not in state:
+        legacy = state.pop('stage2_option_states', None) or {}
+        state['stage2_question_id'] = 0
+        state['stage2_options'] = {'0': {key: option_state(value) for key, value in legacy.items()}} if legacy else {}
+    return state
+
+
+def apply_event(state, kind, payload):
+    """Tek bir olayı duruma uygula (durum yerinde değişir)"""
+    contestants = state['contestants']
+    key = str(payload.get('id'))
+
+    if kind == 'contestant_added':
+        contestants[key] = {
+            'id': payload['id'],
+            'name': payload['name'],
+            'score': payload.get('score', 0),
+            'eliminated': False,
+            'active': True,
+            'photo_hash': payload.get('photo_hash'),
+        }
+    elif kind == 'score':
+        if key in contestants:
+            contestants[key]['score'] += payload['delta']
+    elif kind == 'eliminated':
+        if key in contestants:
+            contestants[key]['eliminated'] = True
+            contestants[key]['active'] = False
+    elif kind == 'contestant_deleted':
+        contestants.pop(key, None)
+    elif kind == 'stage2_option':
+        question_id = payload.get('questionId', state['stage2_question_id'])
+        options = state['stage2_options'].setdefault(str(question_id), {})
+        options[str(payload['optionIndex'])] = option_state(payload['state'])
+        state['stage2_question_id'] = question_id
+    elif kind == 'question_drawn':
+        # Çekilen soru güncel soru olur; questionId verilmeyen şık durumları ona yazılır
+        state['stage2_question_id'] = payload['questionId']
+    elif kind == 'stage2_reset':
+        if 'questionId' in payload:
+            state['stage2_options'].pop(str(payload['questionId']), None)
+            state['stage2_question_id'] = payload['questionId']
+        else:
+            state['stage2_options'] = {}
+    elif kind == 'game_reset':
+        state.clear()
+        state.update(empty_state())
+    # 'restored' olayları her zaman bir snapshot ile birlikte yazılır,
+    # tekrar oynatma o snapshot'tan başladığı için burada yapılacak bir şey yok
+    return state
+
+
+def replay(state, events):
+    """(kind, payload) çiftlerini sırayla uygula"""
+    for kind, payload in events:
+        apply_event(state, kind, payload)
+    return state
@@ -0,0 +1,61 @@
+"""Seviyeli günlük kaydı ve modül bazlı aç/kapa.
+
+Tüm modüller ``get_logger(<modül>)`` ile ``timetunnel.<modül>`` altında
+kayıt tutar. Genel seviye ``TIMETUNNEL_LOG_LEVEL`` ile, tek tek modüller
+``TIMETUNNEL_LOG`` ile ayarlanır::
+
+    TIMETUNNEL_LOG_LEVEL=WARNING
+    TIMETUNNEL_LOG=static=debug,question_bank=off
+
+Üretimde varsayılan seviye INFO'dur: yalnızca açılış mesajları ve hatalar
+yazılır, istek başına kayıtlar DEBUG seviyesindedir.
+"""
+import logging
+import os
+import sys
+
+ROOT_LOGGER = 'timetunnel'
+LEVEL_ENV = 'TIMETUNNEL_LOG_LEVEL'
+MODULES_ENV = 'TIMETUNNEL_LOG'
+OFF = logging.CRITICAL + 10
+LOG_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+
+
+def get_logger(name):
+    return logging.getLogger(f'{ROOT_LOGGER}.{name}')
+
+
+def parse_level(value):
+    """'debug', 'INFO', 'off' ya da sayı biçimindeki seviyeyi çöz"""
+    value = str(value).strip().upper()
+    if value in ('OFF', 'NONE', 'FALSE', '0'):
+        return OFF
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value)
+    if not isinstance(level, int):
+        raise ValueError(f'Geçersiz log seviyesi: {value}')
+    return level
+
+
+def configure(default_level='INFO', modules=None):
+    """Kök logger'ı kur; ortam değişkenleri varsayılanları ezer.
+
+    ``modules`` "modül=seviye" çiftlerinin virgülle ayrılmış listesidir;
+    seviyesi verilmeyen modül DEBUG olarak açılır.
+    """
+    root = logging.getLogger(ROOT_LOGGER)
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT, '%H:%M:%S'))
+        root.addHandler(handler)
+        root.propagate = False
+    root.setLevel(parse_level(os.environ.get(LEVEL_ENV) or default_level))
+
+    if modules is None:
+        modules = os.environ.get(MODULES_ENV, '')
+    for item in modules.split(','):
+        name, _, level = item.partition('=')
+        if name.strip():
+            get_logger(name.strip()).setLevel(parse_level(level or 'DEBUG'))
+    return root
@@ -0,0 +1,292 @@
+"""İstek süresi, veritabanı sorgu ve önbellek ölçümleri (Prometheus metin biçimi).
+
+``Metrics.install(app)`` her isteğin süresini rota şablonuna göre
+(``/api/games/<int:game_id>/contestants`` gibi) histogramda toplar ve
+SQLAlchemy motor olaylarıyla sorgu sayısını ve süresini ölçer. Sorgular
+istek thread'inde çalıştıysa rotaya, yazar thread'inde çalıştıysa
+``writer`` kaynağına yazılır. Diğer modüllerin sayaçları ``register()``
+ile eklenen toplayıcılar üzerinden okunur; ölçümler süreç içindedir,
+birden fazla worker sürecinde her süreç kendi değerlerini verir.
+
+``SamplingProfiler`` bir seferde tek bir isteği örnekler: ``arm()`` ile
+kurulur, yolu eşleşen ilk istek çalışırken thread'inin yığını belirli
+aralıklarla okunur ve sonuç "folded stack" biçiminde saklanır
+(flamegraph.pl ve speedscope ile açılabilir).
+"""
+import bisect
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from log_config import get_logger
+
+log = get_logger('metrics')
+
+PREFIX = 'timetunnel'
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PROFILE_INTERVAL = 0.001
+PROFILE_MAX_SECONDS = 30.0
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in labels) + '}'
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+class Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value, buckets=LATENCY_BUCKETS):
+        self.counts[bisect.bisect_left(buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    """Süreç içi ölçümler ve Prometheus çıktısı"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._requests = Counter()   # (rota, metot, durum) -> istek sayısı
+        self._durations = {}         # (rota, metot) -> Histogram
+        self._route_db = {}          # rota -> [sorgu sayısı, süre]
+        self._db = {}                # kaynak -> [sorgu sayısı, süre]
+        self._collectors = []        # (ad, tip, açıklama, fonksiyon)
+        self.started = time.time()
+        self.profiler = SamplingProfiler()
+
+    def register(self, name, kind, help_text, func):
+        """Ölçümü okunduğu anda hesaplanan bir toplayıcı ekle.
+
+        ``func`` tek bir sayı ya da ``{(('etiket', 'değer'), ...): sayı}``
+        sözlüğü döndürür.
+        """
+        self._collectors.append((f'{PREFIX}_{name}', kind, help_text, func))
+
+    def install(self, app):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        return self
+
+    # --- İstekler -------------------------------------------------------
+
+    def _before_request(self):
+        local = self._local
+        local.route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        local.queries = 0
+        local.db_seconds = 0.0
+        g.metrics_started = time.perf_counter()
+        if not request.path.startswith('/api/metrics'):
+            self.profiler.maybe_start(request.path, request.method)
+
+    def _after_request(self, response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        local = self._local
+        route = getattr(local, 'route', 'unmatched')
+        profile = self.profiler.maybe_stop(response.status_code)
+        if profile is not None:
+            response.headers['X-Profile-Samples'] = str(profile['samples'])
+        with self._lock:
+            self._requests[(route, request.method, response.status_code)] += 1
+            histogram = self._durations.get((route, request.method))
+            if histogram is None:
+                histogram = self._durations[(route, request.method)] = Histogram()
+            histogram.observe(elapsed)
+            totals = self._route_db.setdefault(route, [0, 0.0])
+            totals[0] += local.queries
+            totals[1] += local.db_seconds
+        return response
+
+    def _teardown_request(self, error=None):
+        self._local.route = None
+        # İstek yanıt üretilemeden biterse profil açık kalmasın
+        self.profiler.maybe_stop(None)
+
+    # --- Veritabanı -----------------------------------------------------
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get('metrics_started')
+        if not stack:
+            return
+        elapsed = time.perf_counter() - stack.pop()
+        local = self._local
+        route = getattr(local, 'route', None)
+        if route is not None:
+            local.queries += 1
+            local.db_seconds += elapsed
+            source = 'request'
+        elif threading.current_thread().name == 'db-writer':
+            source = 'writer'
+        else:
+            source = 'background'
+        with self._lock:
+            totals = self._db.setdefault(source, [0, 0.0])
+            totals[0] += 1
+            totals[1] += elapsed
+
+    # --- Çıktı ----------------------------------------------------------
+
+    def render(self):
+        """Bütün ölçümleri Prometheus metin biçiminde döndür"""
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for suffix, labels, value in samples:
+                lines.append(f'{name}{suffix}{format_labels(labels)} {format_value(value)}')
+
+        with self._lock:
+            requests = sorted(self._requests.items())
+            durations = sorted((key, list(h.counts), h.total, h.count) for key, h in self._durations.items())
+            route_db = sorted((route, tuple(totals)) for route, totals in self._route_db.items())
+            db = sorted((source, tuple(totals)) for source, totals in self._db.items())
+
+        family(f'{PREFIX}_http_requests_total', 'counter', 'Tamamlanan HTTP istekleri',
+               [('', (('route', route), ('method', method), ('status', status)), count)
+                for (route, method, status), count in requests])
+
+        samples = []
+        for (route, method), counts, total, count in durations:
+            labels = (('route', route), ('method', method))
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS + (float('inf'),), counts):
+                cumulative += bucket_count
+                samples.append(('_bucket', labels + (('le', format_value(float(bound))),), cumulative))
+            samples.append(('_sum', labels, total))
+            samples.append(('_count', labels, count))
+        family(f'{PREFIX}_http_request_duration_seconds', 'histogram', 'İstek işleme süresi', samples)
+
+        family(f'{PREFIX}_http_request_db_queries_total', 'counter', 'İstek thread\'inde çalışan SQL sorguları',
+               [('', (('route', route),), totals[0]) for route, totals in route_db])
+        family(f'{PREFIX}_http_request_db_seconds_total', 'counter', 'İstek thread\'inde SQL sorgularında geçen süre',
+               [('', (('route', route),), totals[1]) for route, totals in route_db])
+        family(f'{PREFIX}_db_queries_total', 'counter', 'Kaynağa göre SQL sorguları (request, writer, background)',
+               [('', (('source', source),), totals[0]) for source, totals in db])
+        family(f'{PREFIX}_db_query_seconds_total', 'counter', 'Kaynağa göre SQL sorgularında geçen süre',
+               [('', (('source', source),), totals[1]) for source, totals in db])
+
+        for name, kind, help_text, func in self._collectors:
+            try:
+                value = func()
+            except Exception as e:
+                log.warning("Ölçüm okunamadı (%s): %s", name, e)
+                continue
+            if isinstance(value, dict):
+                family(name, kind, help_text, [('', labels, v) for labels, v in sorted(value.items())])
+            else:
+                family(name, kind, help_text, [('', (), value)])
+
+        family(f'{PREFIX}_process_start_time_seconds', 'gauge', 'Sürecin başlama zamanı (unix)',
+               [('', (), self.started)])
+        family(f'{PREFIX}_profiler_armed', 'gauge', 'Örnekleyici profiler bir sonraki istek için kurulu mu',
+               [('', (), int(self.profiler.armed is not None))])
+        return '\n'.join(lines) + '\n'
+
+
+class SamplingProfiler:
+    """Bir seferde tek bir isteği örnekleyen profiler.
+
+    Kurulu değilken isteklere maliyeti yalnızca bir öznitelik kontrolüdür.
+    Örnekleme ayrı bir thread'den ``sys._current_frames()`` ile yapılır;
+    ölçülen kod değiştirilmez, tek istek için kurulduğundan diğer isteklerin
+    süresini etkilemez.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.armed = None      # {'path': önek ya da None, 'interval': saniye}
+        self.last = None       # son profil sonucu
+        self._active = None    # (thread ident, stop Event, Counter, sampler thread, bilgi)
+
+    def arm(self, path=None, interval=PROFILE_INTERVAL):
+        """Yolu ``path`` ile başlayan (verilmezse herhangi bir) ilk isteği profille"""
+        with self._lock:
+            self.armed = {'path': path or None, 'interval': max(float(interval), 0.0001)}
+            return dict(self.armed)
+
+    def maybe_start(self, path, method):
+        armed = self.armed
+        if armed is None or (armed['path'] and not path.startswith(armed['path'])):
+            return
+        with self._lock:
+            if self.armed is not armed or self._active is not None:
+                return
+            self.armed = None
+            stop = threading.Event()
+            stacks = Counter()
+            ident = threading.get_ident()
+            sampler = threading.Thread(target=self._sample, args=(ident, armed['interval'], stop, stacks),
+                                       name='profiler', daemon=True)
+            info = {'path': path, 'method': method, 'interval_ms': armed['interval'] * 1000,
+                    'started': time.perf_counter()}
+            self._active = (ident, stop, stacks, sampler, info)
+        sampler.start()
+
+    def maybe_stop(self, status):
+        active = self._active
+        if active is None or active[0] != threading.get_ident():
+            return None
+        with self._lock:
+            if self._active is not active:
+                return None
+            self._active = None
+        ident, stop, stacks, sampler, info = active
+        stop.set()
+        sampler.join()
+        info['duration_ms'] = round((time.perf_counter() - info.pop('started')) * 1000, 3)
+        info['status'] = status
+        info['samples'] = sum(stacks.values())
+        info['folded'] = [f'{stack} {count}' for stack, count in stacks.most_common()]
+        self.last = info
+        log.info("Profil alındı: %s %s, %.1f ms, %d örnek", info['method'], info['path'],
+                 info['duration_ms'], info['samples'])
+        return info
+
+    @staticmethod
+    def _sample(ident, interval, stop, stacks):
+        deadline = time.monotonic() + PROFILE_MAX_SECONDS
+        while not stop.wait(interval) and time.monotonic() < deadline:
+            frame = sys._current_frames().get(ident)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f'{code.co_name} ({os.path.basename(code.co_filename)})')
+                frame = frame.f_back
+            if names:
+                stacks[';'.join(reversed(names))] += 1
@@ -0,0 +1,62 @@
+"""Sürümlü şema taşımaları (SQLite ``PRAGMA user_version``).
+
+Her adım bir sürüm numarasıyla kaydedilir ve veritabanında yalnızca bir
+kez, yerinde (veri silinmeden) çalışır; adım başarıyla bittiğinde
+``user_version`` o adımın sürümüne yükseltilir. Güncel bir veritabanında
+açılış yalnızca tek bir ``PRAGMA user_version`` okumasıdır. Sürüm takibinden
+önceki veritabanları 0 sürümündedir; adımlar bu yüzden mevcut şemayı
+kontrol ederek çalışır (kolon zaten varsa eklemez).
+"""
+import time
+
+from sqlalchemy import text
+
+from log_config import get_logger
+
+log = get_logger('migrations')
+
+
+class Migrator:
+    def __init__(self):
+        self.steps = []  # (sürüm, açıklama, fonksiyon), sürüme göre sıralı
+
+    @property
+    def latest(self):
+        return self.steps[-1][0] if self.steps else 0
+
+    def step(self, version, description):
+        """Fonksiyonu ``version`` sürümünün taşıma adımı olarak kaydet (dekoratör)"""
+        def register(func):
+            if self.steps and version <= self.latest:
+                raise ValueError(f'Taşıma sürümleri artan sırada olmalı: {version} <= {self.latest}')
+            self.steps.append((version, description, func))
+            return func
+        return register
+
+    @staticmethod
+    def version(session):
+        return session.execute(text('PRAGMA user_version')).scalar() or 0
+
+    def run(self, session, prepare=None):
+        """Bekleyen adımları sırayla çalıştır; çalışan adımların sürümlerini döndür.
+
+        ``prepare`` yalnızca bekleyen adım varsa, adımlardan önce çağrılır
+        (ör. eksik tabloları oluşturmak için).
+        """
+        current = self.version(session)
+        if current > self.latest:
+            log.warning("Veritabanı şema sürümü (%d) bu sürümden (%d) yeni", current, self.latest)
+        pending = [step for step in self.steps if step[0] > current]
+        if not pending:
+            log.debug("Şema güncel (sürüm %d)", current)
+            return []
+
+        if prepare is not None:
+            prepare()
+        for version, description, func in pending:
+            started = time.perf_counter()
+            func()
+            session.execute(text(f'PRAGMA user_version = {int(version)}'))
+            session.commit()
+            log.info("Şema sürümü %d: %s (%.0f ms)", version, description, (time.perf_counter() - started) * 1000)
+        return [version for version, _, _ in pending]
@@ -0,0 +1,735 @@
+"""Soru bankası: etap dosyalarını bir kez yükler, id ve tarihe göre indeksler.
+
+Büyük soru bankaları için etap dosyaları tek bir derlenmiş dosyaya
+(``questions.ttqb``) çevrilebilir:
+
+    python question_bank.py compile
+
+Derlenmiş dosya sabit boyutlu bir kayıt tablosu, tarih indeksi ve bir
+string havuzundan oluşur; uygulama dosyayı mmap ile açar, açılışta hiçbir
+şey ayrıştırmaz ve aynı sayfalar worker süreçleri arasında paylaşılır.
+
+Sunucu çalışırken ``QuestionBank.watch()`` dosyaları arka plandaki bir
+thread'de izler: değişen dosya okunur, ``validate_questions`` ile
+doğrulanır ve geçerliyse etabın soru kümesi tek atamayla yenisiyle
+değiştirilir. Geçersiz bir düzenleme son sağlam sürümü bozmaz; durum
+``status()`` ile okunur. İstekler dosya sistemine hiç dokunmaz.
+
+Wall ekranındaki Unity köprüsüne (``WebGLBridge``) gönderilecek soru
+mesajı (``display_payload``) her soru için etap yüklenirken bir kez
+hazırlanır; ekran soruyu id ile alıp olduğu gibi iletir.
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import weakref
+from collections.abc import Sequence
+from datetime import datetime
+
+from log_config import get_logger
+
+log = get_logger('question_bank')
+
+STAGES = (1, 2, 3)
+COMPILED_FILENAME = 'questions.ttqb'
+# Soru dosyalarının değişip değişmediği en fazla bu sıklıkla (saniye) kontrol edilir
+RELOAD_CHECK_INTERVAL = 1.0
+MAX_REPORTED_ERRORS = 20
+
+# Soru tipleri: harfli şıklar (1. ve 3. etap) ve D/Y ifadeleri (2. etap)
+KIND_CHOICE = 0
+KIND_TRUE_FALSE = 1
+
+OPTION_LETTERS = 'abcdefgh'
+MAX_OPTIONS = len(OPTION_LETTERS)
+# Etap dosyasındaki soruların tipi
+STAGE_KINDS = {1: KIND_CHOICE, 2: KIND_TRUE_FALSE, 3: KIND_CHOICE}
+# tarih biçimleri: gün-ay-yıl (1. etap), gün-ay (2. etap), yıl (3. etap)
+DATE_FORMATS = (
+    (re.compile(r'\d{2}-\d{2}-\d{4}'), '%d-%m-%Y'),
+    (re.compile(r'\d{2}-\d{2}'), '%d-%m'),
+    (re.compile(r'\d{4}'), '%Y'),
+)
+
+# Etap -> Unity köprüsünde soruyu gösteren metot ve geri sayım (saniye, reji ile aynı)
+DISPLAY_METHODS = {1: 'ShowQuestion', 2: 'ShowRightWrong', 3: 'ShowSelectTrueStatements'}
+DISPLAY_COUNTDOWN = {1: 25, 2: 10}
+
+# Derlenmiş dosya düzeni (little-endian):
+#   header | stage tablosu | kayıtlar | tarih indeksi | string havuzu
+# Kayıtlar (etap, id) sırasındadır; tarih indeksi her etabın kendi aralığında
+# (tarih, id) sırasına göre kayıt numaralarını tutar. Kaynak dosyanın boyutu
+# ve içerik özeti saklanır; mtime kopyalamada (PyInstaller paketi) korunmaz.
+MAGIC = b'TTQB'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<4sHHIIII')    # magic, version, stage sayısı, kayıt sayısı, kayıt/indeks/havuz offsetleri
+STAGE_ENTRY = struct.Struct('<IIIQ16s')   # etap, ilk kayıt, kayıt sayısı, kaynak dosya boyutu ve sha256 özeti
+_RECORD_FIXED = '<IBBBxHi'             # id, etap, tip, şık sayısı, doğru cevap maskesi, puan
+RECORD = struct.Struct(_RECORD_FIXED + 'II' * (3 + MAX_OPTIONS))   # + tarih, metin, ipucu ve şık referansları
+DATE_ENTRY = struct.Struct('<I')
+_ID = struct.Struct('<I')
+_STRING_REF = struct.Struct('<II')
+_TARIH_OFFSET = struct.calcsize(_RECORD_FIXED)   # RECORD içinde tarih (offset, uzunluk) çiftinin yeri
+
+
+def question_file(base_path, stage):
+    """Etap soru dosyasının yolunu döndür"""
+    return os.path.join(base_path, f'etap{stage}_50soru.json')
+
+
+def source_digest(path):
+    """Kaynak dosyanın boyutu ve sha256 özetinin ilk 16 baytı"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.digest()[:16]
+
+
+def normalize_question(raw, stage=None):
+    """Etaba özgü soru sözlüğünü ortak şemaya çevir"""
+    if 'secenekler' in raw:
+        kind = KIND_TRUE_FALSE
+        options, answers = [], []
+        for option in raw['secenekler']:
+            if isinstance(option, dict):
+                options.append(option.get('metin', ''))
+                answers.append(option.get('dogru_mu') == 'D')
+            else:
+                options.append(str(option))
+                answers.append(False)
+    else:
+        kind = KIND_CHOICE
+        options = [raw[f'secenek_{letter}'] for letter in OPTION_LETTERS if f'secenek_{letter}' in raw]
+        correct = str(raw.get('dogru_cevap', '')).lower()
+        answers = [letter == correct for letter in OPTION_LETTERS[:len(options)]]
+
+    return {
+        'id': int(raw['id']),
+        'stage': int(raw.get('etap', stage or 0)),
+        'kind': kind,
+        'tarih': str(raw['tarih']),
+        'text': raw.get('soru_metni', ''),
+        'options': options,
+        'answers': answers,
+        'points': int(raw.get('puan', 0)),
+        'hint': raw.get('ipucu') or '',
+    }
+
+
+class QuestionValidationError(ValueError):
+    """Soru dosyası şemaya uymuyor; ``errors`` bütün hataları içerir"""
+
+    def __init__(self, path, errors):
+        self.errors = errors
+        shown = '; '.join(errors[:3]) + (f' (+{len(errors) - 3} hata)' if len(errors) > 3 else '')
+        super().__init__(f'{path}: {shown}')
+
+
+def valid_date(tarih):
+    for pattern, fmt in DATE_FORMATS:
+        if pattern.fullmatch(tarih):
+            if fmt == '%d-%m':
+                # Yılsız tarih artık yıl ile denenir (29-02 geçerli)
+                tarih, fmt = tarih + '-2000', '%d-%m-%Y'
+            try:
+                datetime.strptime(tarih, fmt)
+                return True
+            except ValueError:
+                return False
+    return False
+
+
+def validate_questions(raw, stage=None):
+    """Etap dosyasının içeriğini doğrula, hataların listesini döndür (boşsa geçerli).
+
+    Sayı metni olarak yazılmış id'ler ("12") yerinde int'e çevrilir; indeksler
+    ve istekler id'yi int olarak arar.
+    """
+    if not isinstance(raw, list):
+        return ['dosya bir soru listesi olmalı']
+    errors = []
+    seen = set()
+    for number, q in enumerate(raw, 1):
+        where = f'{number}. soru'
+        if not isinstance(q, dict):
+            errors.append(f'{where}: nesne olmalı')
+            continue
+        question_id = q.get('id')
+        if isinstance(question_id, str) and question_id.strip().isdigit():
+            question_id = q['id'] = int(question_id)
+        if isinstance(question_id, bool) or not isinstance(question_id, int):
+            errors.append(f'{where}: id tam sayı olmalı')
+        else:
+            where = f'soru {question_id}'
+            if question_id in seen:
+                errors.append(f'{where}: id tekrar ediyor')
+            seen.add(question_id)
+
+        if not isinstance(q.get('soru_metni'), str) or not q['soru_metni'].strip():
+            errors.append(f'{where}: soru_metni boş')
+        tarih = q.get('tarih')
+        if not isinstance(tarih, str) or not valid_date(tarih):
+            errors.append(f'{where}: geçersiz tarih {tarih!r} (GG-AA-YYYY, GG-AA ya da YYYY)')
+        if 'puan' in q and (isinstance(q['puan'], bool) or not isinstance(q['puan'], int)):
+            errors.append(f'{where}: puan tam sayı olmalı')
+        if stage is not None and 'etap' in q and q['etap'] != stage:
+            errors.append(f"{where}: etap {q['etap']!r}, dosya {stage}. etabın")
+
+        kind = KIND_TRUE_FALSE if 'secenekler' in q else KIND_CHOICE
+        if stage in STAGE_KINDS and kind != STAGE_KINDS[stage]:
+            expected = 'secenekler (D/Y ifadeleri)' if STAGE_KINDS[stage] == KIND_TRUE_FALSE else 'secenek_a.. şıkları'
+            errors.append(f'{where}: {stage}. etap soruları {expected} içermeli')
+        elif kind == KIND_TRUE_FALSE:
+            options = q['secenekler']
+            if not isinstance(options, list) or not 0 < len(options) <= MAX_OPTIONS:
+                errors.append(f'{where}: secenekler 1-{MAX_OPTIONS} elemanlı liste olmalı')
+            else:
+                for i, option in enumerate(options):
+                    if not isinstance(option, dict) or not isinstance(option.get('metin'), str):
+                        errors.append(f'{where}: {i + 1}. ifadenin metni yok')
+                    elif option.get('dogru_mu') not in ('D', 'Y'):
+                        errors.append(f"{where}: {i + 1}. ifadenin dogru_mu değeri D ya da Y olmalı")
+        else:
+            letters = [letter for letter in OPTION_LETTERS if f'secenek_{letter}' in q]
+            if len(letters) < 2 or ''.join(letters) != OPTION_LETTERS[:len(letters)]:
+                errors.append(f'{where}: şıklar secenek_a\'dan başlayıp sırayla gitmeli (en az 2)')
+            correct = q.get('dogru_cevap')
+            if not isinstance(correct, str) or correct.lower() not in letters:
+                errors.append(f'{where}: dogru_cevap {correct!r} şıklardan biri değil')
+    return errors
+
+
+def read_question_file(path, stage=None):
+    """Etap dosyasını oku ve doğrula; geçersizse QuestionValidationError"""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            raw = json.load(f)
+        except ValueError as e:
+            raise QuestionValidationError(path, [f'geçersiz JSON: {e}']) from None
+    errors = validate_questions(raw, stage)
+    if errors:
+        raise QuestionValidationError(path, errors)
+    return raw
+
+
+def legacy_question(question):
+    """Ortak şemadaki soruyu etap dosyalarındaki biçime geri çevir"""
+    legacy = {
+        'id': question['id'],
+        'tarih': question['tarih'],
+        'soru_metni': question['text'],
+    }
+    if question['kind'] == KIND_TRUE_FALSE:
+        legacy['secenekler'] = [
+            {'metin': text, 'dogru_mu': 'D' if answer else 'Y'}
+            for text, answer in zip(question['options'], question['answers'])
+        ]
+    else:
+        for letter, text in zip(OPTION_LETTERS, question['options']):
+            legacy[f'secenek_{letter}'] = text
+        correct = next((i for i, answer in enumerate(question['answers']) if answer), None)
+        legacy['dogru_cevap'] = OPTION_LETTERS[correct].upper() if correct is not None else ''
+    legacy['puan'] = question['points']
+    legacy['etap'] = question['stage']
+    legacy['ipucu'] = question['hint']
+    return legacy
+
+
+def display_payload(question):
+    """Ortak şemadaki soruyu wall'un Unity köprüsüne gönderilecek mesaja çevir.
+
+    ``param`` ``SendMessage``'a verilecek hazır JSON metnidir (JSON.stringify çıktısıyla aynı).
+    """
+    stage = question['stage'] if question['stage'] in DISPLAY_METHODS else (
+        2 if question['kind'] == KIND_TRUE_FALSE else 1)
+    if stage == 2:
+        # Reji 2. etapta correct alanını hep 0 gönderir; D/Y sonuçları ayrıca iletilir
+        params = {'question': question['text'], 'statements': question['options'], 'correct': 0,
+                  'points': question['points'], 'countDown': DISPLAY_COUNTDOWN[2]}
+    elif stage == 3:
+        params = {'title': question['text'], 'statements': question['options']}
+    else:
+        params = {'question': question['text'], 'answers': question['options'], 'countDown': DISPLAY_COUNTDOWN[1]}
+    return {
+        'id': question['id'],
+        'stage': stage,
+        'method': DISPLAY_METHODS[stage],
+        'params': params,
+        'param': json.dumps(params, ensure_ascii=False, separators=(',', ':')),
+    }
+
+
+class StageQuestions:
+    """Tek bir etabın JSON dosyasından yüklenen soruları, indeksleri ve ekran mesajları"""
+    __slots__ = ('questions', 'by_id', 'by_date', 'display', 'mtime')
+
+    def __init__(self, questions, mtime=None, stage=None):
+        self.questions = questions
+        self.by_id = {q['id']: q for q in questions}
+        by_date = {}
+        for q in questions:
+            by_date.setdefault(q['tarih'], []).append(q)
+        self.by_date = by_date
+        self.display = {q['id']: display_payload(normalize_question(q, stage)) for q in questions}
+        self.mtime = mtime
+
+    def get(self, question_id):
+        return self.by_id.get(question_id)
+
+    def on_date(self, date):
+        return self.by_date.get(date, [])
+
+    def display_payload(self, question_id):
+        return self.display.get(question_id)
+
+
+def compile_questions(base_path, output_path=None, stages=STAGES):
+    """Etap dosyalarını tek bir derlenmiş dosyaya yaz, yazılan yolu döndür"""
+    output_path = output_path or os.path.join(base_path, COMPILED_FILENAME)
+
+    pool = bytearray()
+    pooled = {}
+
+    def intern(text):
+        data = (text or '').encode('utf-8')
+        ref = pooled.get(data)
+        if ref is None:
+            ref = pooled[data] = (len(pool), len(data))
+            pool.extend(data)
+        return ref
+
+    stage_entries, records, date_index = [], [], []
+    for stage in stages:
+        path = question_file(base_path, stage)
+        if not os.path.exists(path):
+            continue
+        size, digest = source_digest(path)
+        questions = sorted((normalize_question(q, stage) for q in read_question_file(path, stage)),
+                           key=lambda q: q['id'])
+
+        first = len(records)
+        for q in questions:
+            if len(q['options']) > MAX_OPTIONS:
+                raise ValueError(f"{stage}. etap, soru {q['id']}: en fazla {MAX_OPTIONS} şık desteklenir")
+            answer_mask = sum(1 << i for i, answer in enumerate(q['answers']) if answer)
+            refs = [intern(q['tarih']), intern(q['text']), intern(q['hint'])]
+            refs += [intern(text) for text in q['options']]
+            refs += [(0, 0)] * (MAX_OPTIONS - len(q['options']))
+            records.append((q['id'], stage, q['kind'], len(q['options']), answer_mask, q['points'],
+                            *(value for ref in refs for value in ref)))
+
+        order = sorted(range(len(questions)), key=lambda i: (questions[i]['tarih'].encode('utf-8'), questions[i]['id']))
+        date_index.extend(first + i for i in order)
+        stage_entries.append((stage, first, len(questions), size, digest))
+
+    records_offset = HEADER.size + STAGE_ENTRY.size * len(stage_entries)
+    dates_offset = records_offset + RECORD.size * len(records)
+    pool_offset = dates_offset + DATE_ENTRY.size * len(date_index)
+
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(stage_entries), len(records),
+                            records_offset, dates_offset, pool_offset))
+        for entry in stage_entries:
+            f.write(STAGE_ENTRY.pack(*entry))
+        for record in records:
+            f.write(RECORD.pack(*record))
+        for index in date_index:
+            f.write(DATE_ENTRY.pack(index))
+        f.write(pool)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+class _RecordKeys(Sequence):
+    """Kayıt aralığını bisect için anahtar dizisi gibi gösteren yardımcı"""
+
+    def __init__(self, length, key):
+        self._length = length
+        self._key = key
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, i):
+        return self._key(i)
+
+
+class CompiledStage(Sequence):
+    """Derlenmiş dosyadaki bir etabın soruları (kayıtlar ihtiyaç anında çözülür)"""
+
+    def __init__(self, compiled, first, count, source_size, source_digest):
+        self._compiled = compiled
+        self._first = first
+        self._count = count
+        self._display = {}  # Açılışta hiçbir şey çözülmez; ekran mesajları ilk istendiğinde hazırlanır
+        self.source_size = source_size
+        self.source_digest = source_digest
+        self.mtime = compiled.mtime  # Kaynakla eşleştiğinde kaynağın mtime değeri olur (sürüm/ETag)
+
+    @property
+    def questions(self):
+        return self
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return legacy_question(self._compiled.record(self._first + i))
+
+    @property
+    def compiled_mtime(self):
+        return self._compiled.mtime
+
+    def normalized(self, i):
+        return self._compiled.record(self._first + i)
+
+    def get(self, question_id):
+        i = self._index(question_id)
+        return self[i] if i is not None else None
+
+    def _index(self, question_id):
+        compiled = self._compiled
+        keys = _RecordKeys(self._count, lambda i: compiled.record_id(self._first + i))
+        i = bisect.bisect_left(keys, question_id)
+        return i if i < self._count and keys[i] == question_id else None
+
+    def display_payload(self, question_id):
+        payload = self._display.get(question_id)
+        if payload is None:
+            i = self._index(question_id)
+            if i is None:
+                return None
+            payload = self._display[question_id] = display_payload(self.normalized(i))
+        return payload
+
+    def on_date(self, date):
+        compiled = self._compiled
+        target = date.encode('utf-8')
+        keys = _RecordKeys(self._count, lambda i: compiled.record_tarih(compiled.date_entry(self._first + i)))
+        lo = bisect.bisect_left(keys, target)
+        hi = bisect.bisect_right(keys, target, lo)
+        return [legacy_question(compiled.record(compiled.date_entry(self._first + i))) for i in range(lo, hi)]
+
+
+class CompiledQuestions:
+    """mmap ile açılmış derlenmiş soru dosyası.
+
+    Eşleme ``close()`` ile ya da nesneye (ve etap görünümlerine) başvuran
+    kalmadığında kapanır; eski sürümü okumakta olan bir istek yarıda kalmaz.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime = os.stat(path).st_mtime_ns
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._finalizer = weakref.finalize(self, self._mm.close)
+        (magic, version, stage_count, self.record_count,
+         self._records_offset, self._dates_offset, self._pool_offset) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Geçersiz derlenmiş soru dosyası: {path}")
+        self.stages = {}
+        for i in range(stage_count):
+            stage, first, count, size, digest = STAGE_ENTRY.unpack_from(self._mm, HEADER.size + i * STAGE_ENTRY.size)
+            self.stages[stage] = CompiledStage(self, first, count, size, digest)
+
+    @property
+    def closed(self):
+        return not self._finalizer.alive
+
+    def close(self):
+        self._finalizer()
+
+    def _string(self, offset, length):
+        start = self._pool_offset + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    def record_id(self, index):
+        return _ID.unpack_from(self._mm, self._records_offset + index * RECORD.size)[0]
+
+    def record_tarih(self, index):
+        offset, length = _STRING_REF.unpack_from(self._mm, self._records_offset + index * RECORD.size + _TARIH_OFFSET)
+        start = self._pool_offset + offset
+        return self._mm[start:start + length]
+
+    def date_entry(self, position):
+        return DATE_ENTRY.unpack_from(self._mm, self._dates_offset + position * DATE_ENTRY.size)[0]
+
+    def record(self, index):
+        """Kaydı ortak şemada sözlük olarak çöz"""
+        values = RECORD.unpack_from(self._mm, self._records_offset + index * RECORD.size)
+        question_id, stage, kind, option_count, answer_mask, points = values[:6]
+        refs = values[6:]
+        strings = [self._string(refs[i], refs[i + 1]) for i in range(0, 2 * (3 + option_count), 2)]
+        return {
+            'id': question_id,
+            'stage': stage,
+            'kind': kind,
+            'tarih': strings[0],
+            'text': strings[1],
+            'options': strings[3:],
+            'answers': [bool(answer_mask & (1 << i)) for i in range(option_count)],
+            'points': points,
+            'hint': strings[2],
+        }
+
+
+class QuestionBank:
+    """Bütün etapların sorularını bellekte tutar.
+
+    Güncel bir ``questions.ttqb`` varsa sorular oradan mmap ile okunur,
+    yoksa etap JSON dosyaları kullanılır. Dosya yalnızca mtime değeri
+    değiştiğinde yeniden okunur ve doğrulanır; bozuk ya da geçersiz bir
+    dosya okunursa ya da dosya silinirse son sağlam sürüm kullanılmaya
+    devam eder ve aynı dosya tekrar okunmaz. ``watch()`` ile izleme
+    başlatıldıysa kontrolü arka plan thread'i yapar, istekler yalnızca
+    bellekteki kümeyi okur; başlatılmadıysa kontrol (stat) etap başına en
+    fazla ``check_interval`` saniyede bir istek sırasında yapılır.
+    """
+
+    def __init__(self, base_path, stages=STAGES, compiled_path=None, check_interval=RELOAD_CHECK_INTERVAL):
+        self.base_path = base_path
+        self.stages = tuple(stages)
+        self.compiled_path = compiled_path or os.path.join(base_path, COMPILED_FILENAME)
+        self.check_interval = check_interval
+        self._compiled = None
+        self._stages = {}
+        self._checked = {}  # etap -> son kontrol zamanı (monotonic)
+        self._failed = {}   # etap -> okunamayan dosyanın mtime değeri
+        self._status = {}   # etap -> son yükleme/kontrol bilgisi
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        self.loads = 0           # JSON dosyasından yükleme sayısı
+        self.load_seconds = 0.0  # JSON okuma ve ayrıştırmada geçen toplam süre
+        self.failures = 0        # Geçersiz ya da okunamayan dosya sayısı
+
+    @property
+    def watching(self):
+        return self._watcher is not None and self._watcher.is_alive()
+
+    def load_all(self):
+        for stage in self.stages:
+            self.stage(stage)
+        return self
+
+    def watch(self, interval=None):
+        """Dosyaları arka planda izlemeye başla (soruları önce yükler)"""
+        if self.watching:
+            return self
+        self.load_all()
+        interval = self.check_interval if interval is None else interval
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name='question-watcher', daemon=True)
+        self._watcher.start()
+        log.info("Soru dosyaları izleniyor (%.1f sn aralıkla)", interval)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def close(self):
+        """İzlemeyi durdur ve derlenmiş dosyanın eşlemesini kapat"""
+        self.stop()
+        with self._lock:
+            for stage in [s for s, current in self._stages.items() if isinstance(current, CompiledStage)]:
+                del self._stages[stage]
+            if self._compiled is not None:
+                self._compiled.close()
+                self._compiled = None
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.check()
+            except Exception as e:
+                log.error("Soru dosyası kontrolü başarısız: %s", e)
+
+    def check(self):
+        """Bütün etapların dosyalarını kontrol et, değişenleri yeniden yükle"""
+        for stage in self.stages:
+            self.refresh(stage)
+
+    def status(self):
+        """Etapların yüklenen sürümü ve son yükleme hatası"""
+        return {'watching': self.watching,
+                'stages': {stage: dict(self._status.get(stage) or {'questions': 0}) for stage in self.stages}}
+
+    def _compiled_file_mtime(self):
+        try:
+            return os.stat(self.compiled_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _compiled_stage(self, stage, source_mtime):
+        """Kaynak dosyayla uyumlu derlenmiş etabı döndür, yoksa None"""
+        compiled_mtime = self._compiled_file_mtime()
+        if compiled_mtime is None:
+            # Eski eşleme, onu kullanan son etap da değiştirilince kapanır
+            self._compiled = None
+            return None
+        compiled = self._compiled
+        if compiled is None or compiled.mtime != compiled_mtime:
+            self._compiled = None
+            try:
+                compiled = CompiledQuestions(self.compiled_path)
+            except (OSError, ValueError, struct.error) as e:
+                log.error("Derlenmiş soru dosyası açılamadı (%s): %s", self.compiled_path, e)
+                return None
+            self._compiled = compiled
+        entry = compiled.stages.get(stage)
+        if entry is None:
+            return None
+        if source_mtime is not None:
+            # JSON dosyası derlemeden sonra değiştiyse derlenmiş kaydı kullanma.
+            # Özet yalnızca kaynağın mtime değeri değiştiğinde (refresh) hesaplanır.
+            try:
+                path = question_file(self.base_path, stage)
+                if os.path.getsize(path) != entry.source_size or source_digest(path) != (entry.source_size, entry.source_digest):
+                    return None
+            except OSError:
+                return None
+            entry.mtime = source_mtime
+        return entry
+
+    def stage(self, stage):
+        """Etabın güncel soru kümesini döndür (izlenmiyorsa gerekirse yeniden yükle)"""
+        current = self._stages.get(stage)
+        if current is not None and (self.watching or time.monotonic() - self._checked.get(stage, 0) < self.check_interval):
+            return current
+        return self.refresh(stage)
+
+    def _up_to_date(self, current, mtime, stage):
+        if isinstance(current, CompiledStage):
+            # Dosya yeniden derlendiyse eski eşlemeyi kullanan her etap yenilenir
+            if self._compiled_file_mtime() != current.compiled_mtime:
+                return False
+            return mtime is None or current.mtime == mtime or self._failed.get(stage, -1) == mtime
+        return current is not None and (current.mtime == mtime or self._failed.get(stage, -1) == mtime)
+
+    def refresh(self, stage):
+        """Etap dosyası değiştiyse okuyup doğrula ve soru kümesini yenisiyle değiştir"""
+        self._checked[stage] = time.monotonic()
+        path = question_file(self.base_path, stage)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        current = self._stages.get(stage)
+        if self._up_to_date(current, mtime, stage):
+            return current
+
+        with self._lock:
+            current = self._stages.get(stage)
+            if self._up_to_date(current, mtime, stage):
+                return current
+            compiled = self._compiled_stage(stage, mtime)
+            if compiled is not None:
+                self._stages[stage] = compiled
+                self._loaded(stage, self.compiled_path, 'compiled', len(compiled))
+                return compiled
+
+            if mtime is None:
+                if current is not None:
+                    self._failure(stage, path, mtime, 'dosya bulunamadı', ['dosya bulunamadı'])
+                    log.error("Soru dosyası bulunamadı, son sağlam sürüm (%d soru) kullanılıyor: %s",
+                              len(current.questions), path)
+                    return current
+                log.warning("Soru dosyası bulunamadı: %s", path)
+                loaded = StageQuestions([])
+                self._loaded(stage, path, 'missing', 0)
+            else:
+                try:
+                    started = time.perf_counter()
+                    loaded = StageQuestions(read_question_file(path, stage), mtime, stage)
+                    self.loads += 1
+                    self.load_seconds += time.perf_counter() - started
+                except (OSError, ValueError) as e:
+                    errors = e.errors if isinstance(e, QuestionValidationError) else [str(e)]
+                    self._failure(stage, path, mtime, str(e), errors)
+                    if current is not None:
+                        log.error("Soru dosyası geçersiz, son sağlam sürüm (%d soru) kullanılıyor: %s",
+                                  len(current.questions), e)
+                        return current
+                    log.error("Soru dosyası geçersiz, %s. etap boş: %s", stage, e)
+                    loaded = StageQuestions([])
+                    self._stages[stage] = loaded
+                    return loaded
+                log.info("%s. etap: toplam %d soru yüklendi", stage, len(loaded.questions))
+                self._loaded(stage, path, 'json', len(loaded.questions))
+            # Tek atama: okuyan istekler ya eski ya yeni kümeyi görür
+            self._stages[stage] = loaded
+            self._failed.pop(stage, None)
+            return loaded
+
+    def _failure(self, stage, path, mtime, error, errors):
+        """Okunamayan dosyayı kaydet; aynı mtime ile tekrar okunmaz"""
+        self.failures += 1
+        self._failed[stage] = mtime
+        status = self._status.setdefault(stage, {'path': path, 'source': None, 'questions': 0})
+        status.update(error=error, errors=errors[:MAX_REPORTED_ERRORS],
+                      failed_at=datetime.utcnow().isoformat())
+
+    def _loaded(self, stage, path, source, count):
+        previous = self._status.get(stage) or {}
+        self._status[stage] = {'path': path, 'source': source, 'questions': count,
+                               'loaded_at': datetime.utcnow().isoformat(),
+                               'reloads': previous.get('reloads', -1) + 1, 'error': None, 'errors': []}
+
+    def questions(self, stage):
+        return self.stage(stage).questions
+
+    def get(self, stage, question_id):
+        return self.stage(stage).get(question_id)
+
+    def by_date(self, stage, date):
+        return self.stage(stage).on_date(date)
+
+    def display(self, stage, question_id):
+        """Sorunun ekran mesajı ve soru kümesinin sürümü (ETag için); soru yoksa (None, sürüm)"""
+        questions = self.stage(stage)
+        return questions.display_payload(question_id), questions.mtime
+
+
+def main(argv=None):
+    default_base = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='TimeTunnel soru bankası araçları')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compile_parser = subparsers.add_parser('compile', help='etap*_50soru.json dosyalarını derle')
+    compile_parser.add_argument('--base', default=default_base, help='soru dosyalarının bulunduğu klasör')
+    compile_parser.add_argument('-o', '--output', help=f'çıktı dosyası (varsayılan: <base>/{COMPILED_FILENAME})')
+    args = parser.parse_args(argv)
+
+    if args.command == 'compile':
+        output = compile_questions(args.base, args.output)
+        compiled = CompiledQuestions(output)
+        print(f"{compiled.record_count} soru derlendi: {output}")
+        compiled.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Açılış süresi ölçümü ve ertelenmiş yüklemeler.
+
+``app`` bu modülü ilk satırda içe aktarır; ölçüm o andan başlar. Açılış
+adımları ``timer.mark()`` ile, arka planda yüklenen kaynaklar
+``Deferred`` ile ölçülür. İlk istek tamamlandığında dökümle birlikte
+ilk isteğe kadar geçen süre yazılır; ``TIMETUNNEL_STARTUP_TARGET``
+(saniye) aşılırsa uyarı verilir::
+
+    TIMETUNNEL_STARTUP_TARGET=1.5 python -m timetunnel serve
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from log_config import get_logger
+
+log = get_logger('startup')
+
+STARTED = time.perf_counter()
+TARGET_ENV = 'TIMETUNNEL_STARTUP_TARGET'
+DEFAULT_TARGET = 3.0  # saniye, ilk isteğin tamamlanmasına kadar
+
+
+class StartupTimer:
+    """Açılış adımlarının süreleri ve ilk isteğe kadar geçen süre"""
+
+    def __init__(self, started=STARTED, target=None):
+        self.started = started
+        if target is None:
+            try:
+                target = float(os.environ.get(TARGET_ENV, DEFAULT_TARGET))
+            except ValueError:
+                log.warning("Geçersiz %s değeri, %.1f sn kullanılıyor", TARGET_ENV, DEFAULT_TARGET)
+                target = DEFAULT_TARGET
+        self.target = target
+        self.phases = {}        # adım -> süre (sn)
+        self.background = {}    # arka planda yüklenen kaynak -> süre (sn)
+        self.first_request = None
+        self._last = started
+        self._lock = threading.Lock()
+
+    def mark(self, phase):
+        """Önceki işaretten bu yana geçen süreyi ``phase`` adıyla kaydet"""
+        now = time.perf_counter()
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+            self._last = now
+
+    @contextmanager
+    def measure(self, name):
+        """Diğer adımlarla çakışabilen (arka plan) bir işin süresini ölç"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.background[name] = time.perf_counter() - started
+
+    def install(self, app):
+        app.after_request(self._after_request)
+        return self
+
+    def _after_request(self, response):
+        if self.first_request is None:
+            with self._lock:
+                if self.first_request is not None:
+                    return response
+                self.first_request = time.perf_counter() - self.started
+            self._report()
+        return response
+
+    def _report(self):
+        breakdown = ', '.join(f'{name} {seconds * 1000:.0f} ms'
+                              for name, seconds in list(self.phases.items()) + list(self.background.items()))
+        if self.first_request > self.target:
+            log.warning("⚠️  İlk istek açılıştan %.2f sn sonra tamamlandı (hedef %.1f sn): %s",
+                        self.first_request, self.target, breakdown)
+        else:
+            log.info("İlk istek açılıştan %.2f sn sonra tamamlandı: %s", self.first_request, breakdown)
+
+    def report(self):
+        return {
+            'phases': dict(self.phases),
+            'background': dict(self.background),
+            'first_request': self.first_request,
+            'target': self.target,
+        }
+
+
+timer = StartupTimer()
+
+
+class Deferred:
+    """İlk kullanımda (ya da ``start()`` ile arka planda) bir kez yüklenen değer.
+
+    Arka plan yüklemesi sürerken ``get()`` çağıran istek yüklemenin
+    bitmesini bekler; yükleme hata verirse bir sonraki ``get()`` yeniden dener.
+    """
+
+    def __init__(self, name, loader, startup_timer=timer):
+        self.name = name
+        self._loader = loader
+        self._timer = startup_timer
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._value = None
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def get(self):
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                with self._timer.measure(self.name):
+                    self._value = self._loader()
+                self._loaded = True
+        return self._value
+
+    def start(self):
+        """Değeri ayrı bir thread'de yüklemeye başla"""
+        if not self._loaded:
+            threading.Thread(target=self._load_quietly, name=f'load-{self.name}', daemon=True).start()
+        return self
+
+    def _load_quietly(self):
+        try:
+            self.get()
+        except Exception as e:
+            log.error("%s arka planda yüklenemedi: %s", self.name, e)
@@ -7,6 +7,7 @@ import { QuestionControl } from './modules/QuestionControl.js';
 import { RightWrongControl } from './modules/RightWrongControl.js';
 import { SelectTrueControl } from './modules/SelectTrueControl.js';
 import { BackgroundControl } from './modules/BackgroundControl.js';
+import { EventStream } from './modules/EventStream.js';
 
 export class RejiController {
     constructor() {
@@ -36,6 +37,7 @@ export class RejiController {
         this.rightWrong = new RightWrongControl(this);
         this.selectTrue = new SelectTrueControl(this);
         this.background = new BackgroundControl(this);
+        this.events = new EventStream(this);
 
         // Public API compatibility (proxy methods used by HTML onclicks)
         this.addContestant = () => this.contestant.addContestant();
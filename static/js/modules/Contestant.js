@@ -1,3 +1,5 @@
+import { apiUrl } from './GameApi.js';
+
 export class Contestant {
     constructor(root) {
         this.root = root;
@@ -99,7 +101,7 @@ export class Contestant {
                 photo: this.selectedPhotoBase64 // Base64 fotoğraf verisi
             };
             
-            const response = await fetch('/api/contestants', {
+            const response = await fetch(apiUrl('/contestants'), {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify(contestantData)
@@ -111,7 +113,7 @@ export class Contestant {
             if (result.success) {
                 nameInput.value = '';
                 this.clearPhotoPreview(); // Fotoğraf önizlemesini temizle
-                await this.loadContestants();
+                this.applyEvent('contestant_added', result.contestant);
                 // Contestant added successfully - notification removed
                 nameInput.focus();
             } else {
@@ -125,7 +127,7 @@ export class Contestant {
 
     async loadContestants() {
         try {
-            const response = await fetch('/api/contestants');
+            const response = await fetch(apiUrl('/contestants'));
             
             if (!response.ok) {
                 // HTTP hata kodu kontrolü
@@ -157,6 +159,27 @@ export class Contestant {
         }
     }
 
+    // Sunucu olayını (ya da kendi isteğimizin yanıtını) listeye uygula; aynı olay iki kez gelirse sonuç değişmez
+    applyEvent(type, data) {
+        const contestants = this.root.contestants;
+        const index = contestants.findIndex(c => c.id == data.id);
+
+        if (type === 'contestant_added') {
+            if (index === -1) contestants.push(data);
+        } else if (index === -1) {
+            return;
+        } else if (type === 'score') {
+            contestants[index].score = data.score;
+        } else if (type === 'eliminated') {
+            contestants[index].eliminated = true;
+            contestants[index].active = false;
+        } else if (type === 'contestant_deleted') {
+            contestants.splice(index, 1);
+        }
+
+        this.displayContestants();
+    }
+
     displayContestants() {
         const container = document.getElementById('contestants-management-list');
         const countElement = document.getElementById('contestant-count');
@@ -173,9 +196,10 @@ export class Contestant {
             const div = document.createElement('div');
             div.className = `contestant-management-item ${contestant.eliminated ? 'eliminated' : ''}`;
             
-            // Fotoğraf HTML'i oluştur
-            const photoHtml = contestant.photo ? 
-                `<div class="contestant-photo"><img src="${contestant.photo}" alt="${contestant.name}" /></div>` : 
+            // Fotoğraf HTML'i oluştur (liste küçük resmi kullanır, tarayıcı önbelleğinden gelir)
+            const photoSrc = contestant.thumbnail || contestant.photo;
+            const photoHtml = photoSrc ? 
+                `<div class="contestant-photo"><img src="${photoSrc}" alt="${contestant.name}" /></div>` : 
                 '';
             
             div.innerHTML = `
@@ -216,7 +240,7 @@ export class Contestant {
         }
 
         try {
-            const response = await fetch(`/api/contestants/${contestantId}/score`, {
+            const response = await fetch(apiUrl(`/contestants/${contestantId}/score`), {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({ points: points })
@@ -224,7 +248,7 @@ export class Contestant {
 
             const result = await response.json();
             if (result.success) {
-                await this.loadContestants();
+                this.applyEvent('score', { id: contestantId, score: result.new_score });
                 const action = points > 0 ? 'eklendi' : 'çıkarıldı';
                 // Removed success notification for point adjustments
             }
@@ -247,10 +271,10 @@ export class Contestant {
         }
 
         try {
-            const response = await fetch(`/api/contestants/${contestantId}/eliminate`, { method: 'POST' });
+            const response = await fetch(apiUrl(`/contestants/${contestantId}/eliminate`), { method: 'POST' });
             const result = await response.json();
             if (result.success) {
-                await this.loadContestants();
+                this.applyEvent('eliminated', { id: contestantId });
                 // Contestant eliminated - notification removed
                 if (window.wallRef && !window.wallRef.closed) {
                     window.wallRef.postMessage({ action: 'eliminate', data: { name: contestant.name, id: contestant.id } }, '*');
@@ -275,10 +299,10 @@ export class Contestant {
         }
 
         try {
-            const response = await fetch(`/api/contestants/${contestantId}`, { method: 'DELETE' });
+            const response = await fetch(apiUrl(`/contestants/${contestantId}`), { method: 'DELETE' });
             const result = await response.json();
             if (result.success) {
-                await this.loadContestants();
+                this.applyEvent('contestant_deleted', { id: contestantId });
                 // Removed success notification for deletion
                 if (window.wallRef && !window.wallRef.closed) {
                     window.wallRef.postMessage({ action: 'delete', data: { name: contestant.name, id: contestant.id } }, '*');
@@ -0,0 +1,51 @@
+import { apiUrl } from './GameApi.js';
+
+export class EventStream {
+    constructor(root) {
+        this.root = root;
+        this.source = null;
+        this.disconnected = false;
+        this.connect();
+    }
+
+    // Sunucunun /api/events akışına bağlan; diğer reji konsollarının değişiklikleri de buradan gelir
+    connect() {
+        if (!window.EventSource) {
+            console.warn('[WEB] EventStream : connect : EventSource desteklenmiyor');
+            return;
+        }
+
+        this.source = new EventSource(apiUrl('/events'));
+
+        this.source.addEventListener('open', () => {
+            // Bağlantı koptuysa kaçırılan değişiklikler için listeyi baştan yükle
+            if (this.disconnected) {
+                this.disconnected = false;
+                console.log('[WEB] EventStream : open : Yeniden bağlandı, liste yenileniyor');
+                this.root.loadContestants();
+            }
+        });
+
+        this.source.addEventListener('error', () => {
+            this.disconnected = true;
+        });
+
+        ['contestant_added', 'score', 'eliminated', 'contestant_deleted'].forEach(type => {
+            this.source.addEventListener(type, (event) => {
+                this.root.contestant.applyEvent(type, JSON.parse(event.data));
+            });
+        });
+
+        // Geri alma ve toplu içe aktarmadan sonra liste baştan yüklenir
+        ['game_restored', 'contestants_imported'].forEach(type => {
+            this.source.addEventListener(type, () => {
+                this.root.loadContestants();
+            });
+        });
+
+        this.source.addEventListener('game_reset', () => {
+            this.root.contestants = [];
+            this.root.displayContestants();
+        });
+    }
+}
@@ -0,0 +1,12 @@
+// Sayfa adresindeki ?game=<id> parametresine göre oyunun API adreslerini üretir.
+// Parametre yoksa varsayılan oyunun /api/... adresleri kullanılır.
+export const GAME_ID = new URLSearchParams(window.location.search).get('game');
+
+export function apiUrl(path) {
+    return GAME_ID ? `/api/games/${encodeURIComponent(GAME_ID)}${path}` : `/api${path}`;
+}
+
+// Aynı oyunun wall ekranı adresi
+export function wallUrl() {
+    return GAME_ID ? `/wall?game=${encodeURIComponent(GAME_ID)}` : '/wall';
+}
@@ -1,3 +1,5 @@
+import { apiUrl, wallUrl } from './GameApi.js';
+
 export class QuestionControl {
     constructor(root) {
         this.root = root;
@@ -22,7 +24,7 @@ export class QuestionControl {
             var openWallBtn = document.getElementById('open-wall-btn');
             if (openWallBtn && !openWallBtn.dataset.bound) {
                 openWallBtn.addEventListener('click', function () {
-                    window.wallRef = window.open('http://127.0.0.1:5000/wall', 'wallScreen');
+                    window.wallRef = window.open(wallUrl(), 'wallScreen');
                 });
                 openWallBtn.dataset.bound = 'true';
             }
@@ -45,13 +47,14 @@ export class QuestionControl {
             return;
         }
         try {
-            const response = await fetch(`/api/questions/${this.root.currentStage}/${this.root.wheelResult}`);
+            const response = await fetch(apiUrl(`/questions/${this.root.currentStage}/${this.root.wheelResult}`));
             const result = await response.json();
             if (result.success) {
                 console.log(`[WEB] QuestionControl : loadQuestionForDate : stage=${this.root.currentStage},date=${this.root.wheelResult},id=${result.question?.id}`);
                 const question = result.question;
                 this.sendToWall('hideUnityWheel', {});
                 this.processQuestionData(question);
+                this.loadDisplay(this.root.currentQuestion);
                 this.displayQuestion();
                 
                 // Question-controls bölümünü göster
@@ -77,6 +80,18 @@ export class QuestionControl {
         }
     }
 
+    // Wall'a gönderilecek hazır Unity mesajı sunucudan alınır (soru wall'a 2 sn sonra gider);
+    // alınamazsa mesaj eskisi gibi burada oluşturulur
+    async loadDisplay(question) {
+        try {
+            const response = await fetch(apiUrl(`/questions/${this.root.currentStage}/${question.id}/display`));
+            const result = await response.json();
+            if (result.success) question.display = result;
+        } catch (error) {
+            console.error(`[WEB] QuestionControl : loadDisplay : Hata : error=${error}`);
+        }
+    }
+
     processQuestionData(question) {
         if (this.root.currentStage === 1) {
             this.root.currentQuestion = {
@@ -188,7 +203,8 @@ export class QuestionControl {
             //{"question":"......","statements":["......","......","......","......","......","......"]}
             
             setTimeout(() => {
-                this.sendToWall('showStage2Question', {
+                const display = this.root.currentQuestion.display;
+                this.sendToWall('showStage2Question', display ? display.param : {
                     question: this.root.currentQuestion.soru_metni || this.root.currentQuestion.text,
                     statements: wallOptions,
                     correct: this.root.currentQuestion.correct,
@@ -240,7 +256,8 @@ export class QuestionControl {
                     text: this.root.currentQuestion.soru_metni || this.root.currentQuestion.text,
                     options: wall3Options,
                     contestants: this.root.contestants,
-                    curPlayerIndex : this.root.stage3CurrentPlayer
+                    curPlayerIndex : this.root.stage3CurrentPlayer,
+                    display: this.root.currentQuestion.display?.param
                 });
             }, 2000);
         } else {
@@ -258,7 +275,8 @@ export class QuestionControl {
                 optionsContainer.appendChild(button);
             });
             setTimeout(() => {
-                this.sendToWall('showQuestion', { question: this.root.currentQuestion.text, answers: this.root.currentQuestion.options, countDown: 25 });
+                const display = this.root.currentQuestion.display;
+                this.sendToWall('showQuestion', display ? display.param : { question: this.root.currentQuestion.text, answers: this.root.currentQuestion.options, countDown: 25 });
             }, 2000);
         }
 
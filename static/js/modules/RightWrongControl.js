@@ -1,3 +1,5 @@
+import { apiUrl } from './GameApi.js';
+
 export class RightWrongControl {
     constructor(root) {
         this.root = root;
@@ -54,8 +56,9 @@ export class RightWrongControl {
     
     async setStage2OptionState(optionIndex, state) {
         try {
-            const response = await fetch('/api/stage2/option-state', {
-                method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ optionIndex, state })
+            const questionId = this.root.currentQuestion?.id;
+            const response = await fetch(apiUrl('/stage2/option-state'), {
+                method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ questionId, optionIndex, state })
             });
             const result = await response.json();
             if (result.success) {
@@ -73,7 +76,10 @@ export class RightWrongControl {
 
     async resetStage2Options() {
         try {
-            const response = await fetch('/api/stage2/reset-options', { method: 'POST' });
+            const questionId = this.root.currentQuestion?.id;
+            const response = await fetch(apiUrl('/stage2/reset-options'), {
+                method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ questionId })
+            });
             const result = await response.json();
             if (result.success) {
                 this.root.trueFalseSelections = {};
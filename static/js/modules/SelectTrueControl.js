@@ -1,3 +1,5 @@
+import { apiUrl } from './GameApi.js';
+
 export class SelectTrueControl {
     constructor(root) {
         this.root = root;
@@ -57,23 +59,27 @@ export class SelectTrueControl {
         
         const currentPlayerIndex = this.root.stage3CurrentPlayer;
         const currentPlayer = this.root.contestants[currentPlayerIndex];
-        
-        const newScore = currentPlayer.score + 10;
 
-        console.log("Test::api/contestants::" , currentPlayer);
+        await this.awardPoints([{ id: currentPlayer.id, points: 10 }]);
+    }
+
+    // Puanları tek istekte ver; sunucu tüm yeni puanları döndürür
+    async awardPoints(scores) {
         try {
-            // Update player's score in the database
-            const response = await fetch(`/api/contestants/${currentPlayer.id}/score`, {
+            const response = await fetch(apiUrl('/scores/batch'), {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ points: 10 })
+                body: JSON.stringify({ scores })
             });
             
             const result = await response.json();
             if (result.success) {
                 // Update the local contestant data instead of reloading all contestants
-                currentPlayer.score = newScore;
-                console.log("Test::result.success::" + currentPlayer.id + "_" + newScore);
+                result.scores.forEach(({ id, score }) => {
+                    const contestant = this.root.contestants.find(c => c.id == id);
+                    if (contestant) contestant.score = score;
+                });
+                console.log('[WEB] SelectTrueControl : awardPoints : scores=' + JSON.stringify(result.scores));
                 
                 // Update the display with the new score
                 this.root.displayContestants();
@@ -83,12 +89,12 @@ export class SelectTrueControl {
                 });
 
             } else {
-                console.error('[WEB] RejiController : handleStage3PlayerTimeOut : Failed to update score', result.error);
-                this.showNotification('Puan güncellenirken hata oluştu', 'error');
+                console.error('[WEB] SelectTrueControl : awardPoints : Failed to update score', result.error);
+                this.root.showNotification('Puan güncellenirken hata oluştu', 'error');
             }
         } catch (error) {
-            console.error('[WEB] RejiController : handleStage3PlayerTimeOut : Error updating score', error);
-            this.showNotification('Puan güncellenirken hata oluştu', 'error');
+            console.error('[WEB] SelectTrueControl : awardPoints : Error updating score', error);
+            this.root.showNotification('Puan güncellenirken hata oluştu', 'error');
         }
     }
 
@@ -1,3 +1,5 @@
+import { apiUrl } from './GameApi.js';
+
 export class StageControl {
     constructor(root) {
         this.root = root;
@@ -114,7 +116,7 @@ export class StageControl {
     async resetGame() {
         if (!confirm('Oyunu sıfırlamak istediğinizden emin misiniz? Tüm yarışmacılar ve veriler silinecek!')) return;
         try {
-            const response = await fetch('/api/reset-game', { method: 'POST', headers: { 'Content-Type': 'application/json' } });
+            const response = await fetch(apiUrl('/reset-game'), { method: 'POST', headers: { 'Content-Type': 'application/json' } });
             const result = await response.json();
             if (result.success) {
                 this.root.currentStage = 0;
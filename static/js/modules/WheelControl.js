@@ -1,3 +1,5 @@
+import { apiUrl } from './GameApi.js';
+
 export class WheelControl {
     constructor(root) {
         this.root = root;
@@ -7,7 +9,7 @@ export class WheelControl {
         console.log('[WEB] WheelControl : spinWheel : Çark çevirme başlatılıyor');
 
         try {
-            const response = await fetch('/api/wheel-spin', {
+            const response = await fetch(apiUrl('/wheel-spin'), {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({ stage: this.root.currentStage, user_id: 'reji' })
@@ -23,7 +25,7 @@ export class WheelControl {
                 console.log('[WEB] WheelControl : spinWheel : Unity aktif - Unity çarkı kullanılıyor');
                 this.root.sendToWall('spinUnityWheel', {
                     result: result.result,
-                    stage: this.root.currentStage,
+                    stage: result.stage,
                     targetDate: result.result,
                     spinId: result.spin_id
                 });
@@ -0,0 +1,59 @@
+"""Testler geçici bir SQLite veritabanı kullanır; app modülü yüklenmeden önce ayarlanır."""
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_db_dir = tempfile.mkdtemp(prefix='timetunnel-test-')
+os.environ['TIMETUNNEL_DATABASE_URL'] = 'sqlite:///' + os.path.join(_db_dir, 'timetunnel.db')
+
+import app as timetunnel  # noqa: E402
+import question_bank  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def tt():
+    timetunnel.init_database()
+    yield timetunnel
+    shutil.rmtree(_db_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def client(tt):
+    return tt.app.test_client()
+
+
+@pytest.fixture
+def game(client):
+    """Her test kendi oyununda çalışır; oyunlar birbirinin verisine dokunmaz"""
+    return client.post('/api/games', json={'name': 'test'}).get_json()['game']['id']
+
+
+@pytest.fixture
+def question_dir(tmp_path):
+    """Repodaki etap dosyalarının geçici kopyası"""
+    for stage in question_bank.STAGES:
+        shutil.copy(question_bank.question_file(ROOT, stage), question_bank.question_file(str(tmp_path), stage))
+    return tmp_path
+
+
+def read_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json(path, data, mtime_ns):
+    """Dosyayı yaz ve mtime değerini açıkça ayarla (dosya sistemi çözünürlüğüne bağlı kalmasın)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def repo_questions(stage):
+    return read_json(question_bank.question_file(ROOT, stage))
@@ -0,0 +1,14 @@
+import pytest
+
+from benchmark import percentile
+
+
+@pytest.mark.parametrize('size, fraction, expected', [
+    (500, 0.95, 475), (500, 0.99, 495), (500, 0.5, 250), (20, 0.95, 19), (10, 0.5, 5), (1, 0.99, 1), (3, 1.0, 3),
+])
+def test_nearest_rank_percentile(size, fraction, expected):
+    assert percentile(list(range(1, size + 1)), fraction) == expected
+
+
+def test_percentile_of_empty_list():
+    assert percentile([], 0.5) is None
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+NDJSON = 'application/x-ndjson'
+
+
+def import_contestants(client, game, body, content_type=NDJSON):
+    return client.post(f'/api/games/{game}/contestants/bulk', data=body.encode('utf-8'), content_type=content_type)
+
+
+def test_import_and_export_round_trip(client, game):
+    body = '\n'.join(json.dumps(record, ensure_ascii=False) for record in (
+        {'name': 'Ayşe', 'score': 12}, {'name': 'Mehmet', 'eliminated': True}, {'name': 'Can'}))
+    response = import_contestants(client, game, body).get_json()
+    assert response['success'] and response['count'] == 3
+
+    exported = [json.loads(line) for line in client.get(f'/api/games/{game}/contestants/export').data.splitlines()]
+    assert [(c['name'], c['score'], c['eliminated']) for c in exported] == [
+        ('Ayşe', 12, False), ('Mehmet', 0, True), ('Can', 0, False)]
+
+    csv = client.get(f'/api/games/{game}/contestants/export?format=csv').data.decode('utf-8')
+    other = client.post('/api/games', json={'name': 'kopya'}).get_json()['game']['id']
+    assert import_contestants(client, other, csv, 'text/csv').get_json()['count'] == 3
+
+
+def test_invalid_line_is_reported(client, game):
+    response = import_contestants(client, game, '{"name": "a"}\n{"score": 3}\n')
+    assert response.status_code == 400
+    assert response.get_json()['line'] == 2
+    assert client.get(f'/api/games/{game}/contestants').get_json() == []
+
+
+@pytest.mark.parametrize('error, status', [
+    (IntegrityError('INSERT', {}, Exception('UNIQUE constraint failed')), 400),
+    (RuntimeError('disk dolu'), 500),
+])
+def test_database_errors_return_json(tt, client, game, monkeypatch, error, status):
+    def fail(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(tt, 'log_events', fail)
+    response = import_contestants(client, game, '{"name": "a"}\n')
+    assert response.status_code == status
+    assert response.get_json()['success'] is False
+    monkeypatch.undo()
+    assert client.get(f'/api/games/{game}/contestants').get_json() == []
@@ -0,0 +1,80 @@
+import gc
+import os
+import struct
+import weakref
+
+import pytest
+
+import question_bank as qb
+from conftest import read_json, write_json
+
+
+def bank(directory):
+    return qb.QuestionBank(str(directory), check_interval=0)
+
+
+@pytest.mark.parametrize('stage', qb.STAGES)
+def test_compiled_round_trip(question_dir, stage):
+    qb.compile_questions(str(question_dir))
+    compiled, source = bank(question_dir).stage(stage), qb.StageQuestions(
+        qb.read_question_file(qb.question_file(str(question_dir), stage), stage), stage=stage)
+    assert isinstance(compiled, qb.CompiledStage)
+
+    expected = sorted((qb.normalize_question(q, stage) for q in source.questions), key=lambda q: q['id'])
+    assert [compiled.normalized(i) for i in range(len(compiled))] == expected
+    for question in expected:
+        assert qb.normalize_question(compiled.get(question['id']), stage) == question
+        assert ({q['id'] for q in compiled.on_date(question['tarih'])} ==
+                {q['id'] for q in source.on_date(question['tarih'])})
+    assert compiled.get(10 ** 6) is None
+
+
+def test_compiled_file_survives_copied_mtimes(question_dir):
+    qb.compile_questions(str(question_dir))
+    # Paketlenen (kopyalanan) dosyaların mtime değerleri derleme anından farklıdır
+    for stage in qb.STAGES:
+        os.utime(qb.question_file(str(question_dir), stage), ns=(10 ** 18, 10 ** 18))
+    questions = bank(question_dir)
+    for stage in qb.STAGES:
+        assert isinstance(questions.stage(stage), qb.CompiledStage)
+
+    path = qb.question_file(str(question_dir), 1)
+    data = read_json(path)
+    data[0]['soru_metni'] = 'derlemeden sonra değişti'
+    write_json(path, data, 2 * 10 ** 18)
+    assert isinstance(questions.stage(1), qb.StageQuestions)
+    assert questions.get(1, data[0]['id'])['soru_metni'] == 'derlemeden sonra değişti'
+
+
+def test_old_compiled_format_is_ignored(question_dir):
+    output = qb.compile_questions(str(question_dir))
+    with open(output, 'r+b') as f:
+        f.seek(4)
+        f.write(struct.pack('<H', qb.FORMAT_VERSION - 1))
+    assert isinstance(bank(question_dir).stage(1), qb.StageQuestions)
+
+
+def test_recompiling_swaps_every_stage_and_releases_old_mapping(question_dir):
+    output = qb.compile_questions(str(question_dir))
+    questions = bank(question_dir).load_all()
+    old_view = questions.stage(2)
+    old = weakref.ref(old_view._compiled)
+
+    qb.compile_questions(str(question_dir))
+    os.utime(output, ns=(10 ** 18, 10 ** 18))
+    for stage in qb.STAGES:
+        assert questions.stage(stage).compiled_mtime == 10 ** 18
+    # Eski görünümü tutan istek okumaya devam edebilir; son başvuru gidince eşleme kapanır
+    assert old_view[0]['id'] == questions.stage(2)[0]['id']
+    del old_view
+    gc.collect()
+    assert old() is None
+
+
+def test_close_releases_mapping(question_dir):
+    qb.compile_questions(str(question_dir))
+    questions = bank(question_dir)
+    compiled = questions.stage(1)._compiled
+    questions.close()
+    assert compiled.closed
+    assert questions.status()['watching'] is False
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+
+def add_contestant(tt, game_id, name):
+    contestant = tt.Contestant(game_id=game_id, name=name)
+    tt.db.session.add(contestant)
+    tt.db.session.flush()
+    return contestant.id
+
+
+def contestant_names(tt, game_id):
+    with tt.app.app_context():
+        return sorted(c.name for c in tt.Contestant.query.filter_by(game_id=game_id))
+
+
+def hold_writer(tt):
+    """Yazarı bir işte beklet; bırakılana kadar gelen işler kuyrukta birikir"""
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    blocker = tt.writer.submit(block)
+    assert started.wait(5)
+    return blocker, release
+
+
+def test_queued_jobs_share_one_commit(tt, game):
+    blocker, release = hold_writer(tt)
+    commits = tt.writer.commits
+    futures = [tt.writer.submit(add_contestant, tt, game, f'y{i}') for i in range(10)]
+    release.set()
+    ids = [future.result(5) for future in futures]
+    blocker.result(5)
+
+    # Bekletilen iş ve biriken on iş: iki commit
+    assert tt.writer.commits - commits == 2
+    assert len(set(ids)) == 10
+    assert contestant_names(tt, game) == sorted(f'y{i}' for i in range(10))
+
+
+def test_failing_job_does_not_drop_its_batch(tt, game):
+    def failing():
+        add_contestant(tt, game, 'yarım')
+        raise RuntimeError('iş başarısız')
+
+    blocker, release = hold_writer(tt)
+    futures = [tt.writer.submit(add_contestant, tt, game, 'a'),
+               tt.writer.submit(failing),
+               tt.writer.submit(add_contestant, tt, game, 'b')]
+    release.set()
+    blocker.result(5)
+
+    assert futures[0].result(5) and futures[2].result(5)
+    with pytest.raises(RuntimeError):
+        futures[1].result(5)
+    # Başarısız işin yazdıkları geri alınır, diğerleri tek tek yeniden çalışıp kaydedilir
+    assert contestant_names(tt, game) == ['a', 'b']
+
+
+def test_nested_run_executes_on_writer_thread(tt, game):
+    def outer():
+        return tt.writer.run(add_contestant, tt, game, 'iç')
+
+    assert tt.writer.run(outer)
+    assert contestant_names(tt, game) == ['iç']
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+import question_bank as qb
+from conftest import repo_questions
+
+
+@pytest.mark.parametrize('stage', qb.STAGES)
+def test_payload_matches_unity_bridge(stage):
+    question = qb.normalize_question(repo_questions(stage)[0], stage)
+    payload = qb.display_payload(question)
+    assert payload['method'] == qb.DISPLAY_METHODS[stage]
+    assert json.loads(payload['param']) == payload['params']
+    if stage in qb.DISPLAY_COUNTDOWN:
+        assert payload['params']['countDown'] == qb.DISPLAY_COUNTDOWN[stage]
+
+
+def test_compiled_and_json_payloads_agree(question_dir):
+    qb.compile_questions(str(question_dir))
+    compiled = qb.QuestionBank(str(question_dir), check_interval=0).stage(2)
+    source = qb.StageQuestions(repo_questions(2), stage=2)
+    assert isinstance(compiled, qb.CompiledStage)
+    for question in source.questions:
+        assert compiled.display_payload(question['id']) == source.display_payload(question['id'])
+
+
+def test_display_route_uses_etag(client):
+    question_id = repo_questions(1)[0]['id']
+    response = client.get(f'/api/questions/1/{question_id}/display')
+    assert response.status_code == 200
+    assert response.get_json()['id'] == question_id
+    cached = client.get(f'/api/questions/1/{question_id}/display', headers={'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+    assert client.get('/api/questions/1/100000/display').status_code == 404
@@ -0,0 +1,87 @@
+import pytest
+
+import game_log
+
+
+def play(client, game):
+    """Puan, eleme, silme ve 2. etap şıklarını kapsayan bir oyun akışı"""
+    base = f'/api/games/{game}'
+    ids = [client.post(f'{base}/contestants', json={'name': name}).get_json()['id'] for name in ('a', 'b', 'c', 'd')]
+    client.post(f'{base}/contestants/{ids[0]}/score', json={'points': 10})
+    client.post(f'{base}/scores/batch', json={'scores': [{'id': ids[1], 'points': 7}, {'id': ids[2], 'points': -3}]})
+    client.post(f'{base}/contestants/{ids[2]}/eliminate')
+    client.delete(f'{base}/contestants/{ids[3]}')
+    client.post(f'{base}/stage2/option-states', json={'questionId': 3, 'options': [
+        {'optionIndex': 0, 'state': 'D'}, {'optionIndex': 1, 'state': False}]})
+    client.get(f'{base}/questions/2')
+    client.post(f'{base}/stage2/option-state', json={'optionIndex': 2, 'state': 'Y'})
+    return ids
+
+
+def last_event_id(client, game):
+    return client.get(f'/api/games/{game}/history?limit=5000').get_json()['events'][-1]['id']
+
+
+def states(tt, game, event_id=None):
+    with tt.app.app_context():
+        return tt.reconstruct_state(game, event_id), tt.capture_state(game)
+
+
+def test_replay_matches_tables(tt, client, game):
+    play(client, game)
+    replayed, stored = states(tt, game)
+    assert replayed == stored
+    assert stored['contestants'] and stored['stage2_options']
+
+
+def test_replay_from_intermediate_snapshots(tt, client, game, monkeypatch):
+    monkeypatch.setattr(tt, 'SNAPSHOT_INTERVAL', 3)
+    play(client, game)
+    replayed, stored = states(tt, game)
+    assert replayed == stored
+
+
+def test_restore_returns_to_earlier_state(tt, client, game):
+    ids = play(client, game)
+    event_id = last_event_id(client, game)
+    before = states(tt, game)[1]
+
+    base = f'/api/games/{game}'
+    client.post(f'{base}/contestants/{ids[1]}/score', json={'points': 100})
+    client.delete(f'{base}/contestants/{ids[0]}')
+    client.post(f'{base}/stage2/reset-options')
+    assert states(tt, game, event_id)[0] == before
+
+    response = client.post(f'{base}/history/restore', json={'event_id': event_id}).get_json()
+    assert response['success']
+    replayed, stored = states(tt, game)
+    assert stored == before
+    assert replayed == stored
+    assert client.get(f'{base}/leaderboard').get_json()['total'] == len(before['contestants'])
+
+
+def test_reset_clears_state(tt, client, game):
+    play(client, game)
+    client.post(f'/api/games/{game}/reset-game')
+    replayed, stored = states(tt, game)
+    assert replayed == stored == game_log.empty_state()
+
+
+def test_upgrade_legacy_snapshot():
+    state = game_log.upgrade_state({'contestants': {}, 'stage2_option_states': {'1': True, '2': 'def'}})
+    assert state['stage2_options'] == {'0': {'1': 'D', '2': 'def'}}
+    with pytest.raises(ValueError):
+        game_log.option_state('X')
+
+
+def test_snapshot_every_interval(tt, client, game, monkeypatch):
+    monkeypatch.setattr(tt, 'SNAPSHOT_INTERVAL', 4)
+    contestant = client.post(f'/api/games/{game}/contestants', json={'name': 'a'}).get_json()['id']
+    for _ in range(9):
+        client.post(f'/api/games/{game}/contestants/{contestant}/score', json={'points': 1})
+    with tt.app.app_context():
+        marks = [m for (m,) in tt.db.session.query(tt.GameSnapshot.last_event_id)
+                 .filter_by(game_id=game).order_by(tt.GameSnapshot.last_event_id)]
+    # Açılış snapshot'ı, ilk olay ve sonra her dört olayda bir
+    assert [b - a for a, b in zip(marks[1:], marks[2:])] == [4, 4]
+    assert marks[-1] == tt.last_snapshot_event_id(game)
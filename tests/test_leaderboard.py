@@ -0,0 +1,62 @@
+from leaderboard import Standings
+
+
+def entry(contestant_id, score, active=True):
+    return {'id': contestant_id, 'name': f'y{contestant_id}', 'score': score, 'active': active}
+
+
+def ranks(standings, **kwargs):
+    entries, _ = standings.top(None, **kwargs)
+    return [(e['id'], e['rank'], e['position']) for e in entries]
+
+
+def test_ties_share_rank_and_keep_registration_order():
+    standings = Standings([entry(3, 5), entry(1, 10), entry(2, 5), entry(4, 1)])
+    assert ranks(standings) == [(1, 1, 1), (2, 2, 2), (3, 2, 3), (4, 4, 4)]
+    assert standings.rank(3)['rank'] == 2
+
+
+def test_update_moves_contestant_and_ignores_stale_events():
+    standings = Standings([entry(1, 10), entry(2, 5)], built_at=10)
+    assert standings.update(12, 2, score=20)
+    assert ranks(standings) == [(2, 1, 1), (1, 2, 2)]
+    # Daha eski olay (ya da tablolar okunurken dahil olmuş olay) yeniyi ezmez
+    assert standings.update(11, 2, score=0)
+    assert standings.update(9, 1, score=50)
+    assert ranks(standings) == [(2, 1, 1), (1, 2, 2)]
+    assert standings.update(13, 99, score=1) is False
+
+
+def test_active_only_and_paging():
+    standings = Standings([entry(1, 10), entry(2, 8, active=False), entry(3, 6), entry(4, 4)])
+    assert ranks(standings, active_only=True) == [(1, 1, 1), (3, 2, 2), (4, 3, 3)]
+    assert standings.rank(2, active_only=True) is None
+    page, total = standings.top(2, offset=1)
+    assert [e['id'] for e in page] == [2, 3] and total == 4
+
+    standings.remove(1, 3)
+    standings.put(2, entry(5, 9))
+    assert ranks(standings) == [(1, 1, 1), (5, 2, 2), (2, 3, 3), (4, 4, 4)]
+
+
+def test_api_cache_matches_sql_fallback(tt, client, game):
+    base = f'/api/games/{game}'
+    ids = [client.post(f'{base}/contestants', json={'name': name}).get_json()['id'] for name in 'abcde']
+    client.post(f'{base}/scores/batch', json={'scores': [
+        {'id': ids[0], 'points': 5}, {'id': ids[1], 'points': 9}, {'id': ids[2], 'points': 5}]})
+    client.post(f'{base}/contestants/{ids[1]}/eliminate')
+    client.delete(f'{base}/contestants/{ids[4]}')
+
+    cached = [client.get(f'{base}/leaderboard?active={active}').get_json() for active in (0, 1)]
+    tt.game_cache.enabled = False
+    try:
+        fallback = [client.get(f'{base}/leaderboard?active={active}').get_json() for active in (0, 1)]
+        rank = client.get(f'{base}/contestants/{ids[2]}/rank').get_json()['contestant']
+    finally:
+        tt.game_cache.enabled = True
+
+    assert cached == fallback
+    assert [(e['id'], e['rank']) for e in cached[0]['leaderboard']] == [
+        (ids[1], 1), (ids[0], 2), (ids[2], 2), (ids[3], 4)]
+    assert [e['id'] for e in cached[1]['leaderboard']] == [ids[0], ids[2], ids[3]]
+    assert (rank['rank'], rank['position']) == (2, 3)
@@ -0,0 +1,29 @@
+import pytest
+
+REMOTE = {'REMOTE_ADDR': '192.0.2.10'}
+
+
+def test_metrics_render_counters(client):
+    client.get('/api/contestants')
+    response = client.get('/api/metrics')
+    assert response.status_code == 200
+    assert 'timetunnel_db_writer_commits_total' in response.data.decode('utf-8')
+
+
+@pytest.mark.parametrize('method, path', [
+    ('GET', '/api/metrics'), ('GET', '/api/metrics/profile'), ('POST', '/api/metrics/profile'),
+])
+def test_remote_clients_need_a_token(tt, client, monkeypatch, method, path):
+    assert client.open(path, method=method, environ_base=REMOTE).status_code == 403
+
+    monkeypatch.setattr(tt, 'METRICS_TOKEN', 'gizli')
+    wrong = client.open(path, method=method, environ_base=REMOTE, headers={'Authorization': 'Bearer yanlış'})
+    assert wrong.status_code == 403
+    allowed = client.open(path, method=method, environ_base=REMOTE, headers={'Authorization': 'Bearer gizli'})
+    assert allowed.status_code != 403
+
+
+def test_profiler_arms_from_localhost(client):
+    assert client.post('/api/metrics/profile', json={'path': '/api/contestants'}).get_json()['armed']
+    client.get('/api/contestants')
+    assert client.get('/api/metrics/profile').get_json()['success']
@@ -0,0 +1,64 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from conftest import ROOT
+from migrations import Migrator
+
+# Sürüm takibinden önceki (tek oyunlu) veritabanının şeması
+LEGACY_SCHEMA = """
+CREATE TABLE wheel_spin (id INTEGER PRIMARY KEY, timestamp DATETIME, result VARCHAR(100) NOT NULL, user_id VARCHAR(50));
+CREATE TABLE contestant (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, score INTEGER, eliminated BOOLEAN,
+                         active BOOLEAN, photo TEXT);
+CREATE TABLE game_state (id INTEGER PRIMARY KEY, current_stage INTEGER, current_question_id INTEGER,
+                         used_questions TEXT, stage2_option_states TEXT, created_at DATETIME);
+"""
+
+
+def test_steps_run_once_in_order():
+    migrator, calls = Migrator(), []
+    for version in (1, 2, 5):
+        migrator.step(version, f'adım {version}')(lambda version=version: calls.append(version))
+    with pytest.raises(ValueError):
+        migrator.step(4, 'geride kalan adım')(lambda: None)
+
+    with Session(create_engine('sqlite://')) as session:
+        assert migrator.run(session) == [1, 2, 5]
+        assert Migrator.version(session) == 5
+        assert migrator.run(session, prepare=lambda: calls.append('prepare')) == []
+    assert calls == [1, 2, 5]
+
+
+def test_legacy_database_is_migrated_in_place(tmp_path, tt):
+    path = tmp_path / 'legacy.db'
+    db = sqlite3.connect(path)
+    db.executescript(LEGACY_SCHEMA)
+    db.executemany("INSERT INTO contestant (id, name, score, eliminated, active) VALUES (?, ?, ?, 0, 1)",
+                   [(1, 'eski', 7), (2, 'puansız', None)])
+    db.execute("INSERT INTO game_state (id, current_stage, current_question_id, stage2_option_states) "
+               "VALUES (1, 2, 5, ?)", (json.dumps({'0': 'D', '3': False}),))
+    db.execute("INSERT INTO wheel_spin (id, result, user_id) VALUES (1, '29-10-1923', 'reji')")
+    db.commit()
+    db.close()
+
+    env = dict(os.environ, TIMETUNNEL_DATABASE_URL=f'sqlite:///{path}')
+    for _ in range(2):  # İkinci açılışta çalışacak adım kalmaz
+        subprocess.run([sys.executable, '-c', 'import app; app.init_database()'], cwd=ROOT, env=env, check=True)
+
+    db = sqlite3.connect(path)
+    assert db.execute('PRAGMA user_version').fetchone()[0] == tt.migrations.latest
+    assert db.execute('SELECT id, name, score, game_id FROM contestant ORDER BY id').fetchall() == [
+        (1, 'eski', 7, 1), (2, 'puansız', 0, 1)]
+    assert db.execute('SELECT game_id FROM wheel_spin').fetchall() == [(1,)]
+    assert sorted(db.execute('SELECT game_id, question_id, option_index, state FROM stage2_option_state')) == [
+        (1, 5, 0, 'D'), (1, 5, 3, 'Y')]
+    assert db.execute('SELECT stage2_option_states FROM game_state').fetchone()[0] == '{}'
+    assert db.execute('SELECT count(*) FROM game_snapshot WHERE game_id = 1').fetchone()[0] == 1
+    assert 'question_hash' in {row[1] for row in db.execute('PRAGMA table_info(question_deck)')}
+    db.close()
@@ -0,0 +1,136 @@
+import os
+
+import pytest
+
+import question_bank as qb
+from conftest import read_json, repo_questions, write_json
+
+
+def bank(directory):
+    return qb.QuestionBank(str(directory), check_interval=0)
+
+
+@pytest.mark.parametrize('stage', qb.STAGES)
+def test_repo_files_are_valid(stage):
+    assert qb.validate_questions(repo_questions(stage), stage) == []
+
+
+@pytest.mark.parametrize('tarih, valid', [
+    ('29-10-1923', True), ('31-02-1923', False), ('29-02', True), ('1453', True),
+    ('1923-10-29', False), ('29.10.1923', False),
+])
+def test_valid_date(tarih, valid):
+    assert qb.valid_date(tarih) is valid
+
+
+def test_validator_reports_every_error():
+    questions = repo_questions(1)[:3]
+    questions[1]['id'] = questions[0]['id']
+    questions[2]['tarih'] = '31-02-2020'
+    del questions[2]['dogru_cevap']
+    errors = qb.validate_questions(questions, 1)
+    assert any('id tekrar ediyor' in e for e in errors)
+    assert any('geçersiz tarih' in e for e in errors)
+    assert any('dogru_cevap' in e for e in errors)
+    assert qb.validate_questions({'id': 1}) == ['dosya bir soru listesi olmalı']
+
+
+def test_validator_rejects_wrong_kind_for_stage():
+    errors = qb.validate_questions(repo_questions(2)[:1], 1)
+    assert any('1. etap soruları' in e for e in errors)
+
+
+def test_string_ids_are_normalized():
+    questions = repo_questions(1)
+    question_id = questions[0]['id']
+    questions[0]['id'] = f' {question_id}'
+    assert qb.validate_questions(questions, 1) == []
+    loaded = qb.StageQuestions(questions, stage=1)
+    assert loaded.get(question_id) is questions[0]
+    assert loaded.display_payload(question_id)['id'] == question_id
+
+
+def test_changed_file_is_reloaded(question_dir):
+    path = qb.question_file(str(question_dir), 1)
+    questions = bank(question_dir)
+    assert len(questions.questions(1)) == len(read_json(path))
+
+    data = read_json(path)
+    data[0]['soru_metni'] = 'yeni metin'
+    write_json(path, data, 10 ** 18)
+    assert questions.get(1, data[0]['id'])['soru_metni'] == 'yeni metin'
+    assert questions.status()['stages'][1]['reloads'] == 1
+
+
+def test_invalid_file_keeps_last_good_version(question_dir):
+    path = qb.question_file(str(question_dir), 1)
+    questions = bank(question_dir)
+    loaded = questions.stage(1)
+
+    data = read_json(path)
+    data[0]['tarih'] = 'dün'
+    write_json(path, data, 10 ** 18)
+    assert questions.stage(1) is loaded
+    assert questions.stage(1) is loaded
+    status = questions.status()['stages'][1]
+    assert status['error'] and any('dün' in e for e in status['errors'])
+    # Aynı bozuk dosya bir kez okunur
+    assert questions.failures == 1
+
+    data[0]['tarih'] = '01-01-2000'
+    write_json(path, data, 2 * 10 ** 18)
+    assert questions.stage(1) is not loaded
+    assert questions.status()['stages'][1]['error'] is None
+
+
+def test_missing_file_keeps_last_good_version(question_dir):
+    path = qb.question_file(str(question_dir), 1)
+    questions = bank(question_dir)
+    loaded = questions.stage(1)
+
+    os.rename(path, path + '.bak')
+    assert questions.stage(1) is loaded
+    assert questions.status()['stages'][1]['error']
+    os.rename(path + '.bak', path)
+    os.utime(path, ns=(10 ** 18, 10 ** 18))
+    assert len(questions.questions(1)) == len(loaded.questions)
+    assert questions.status()['stages'][1]['error'] is None
+
+
+def test_missing_file_without_previous_version_is_empty(tmp_path):
+    questions = bank(tmp_path)
+    assert questions.questions(1) == []
+    assert questions.status()['stages'][1]['source'] == 'missing'
+
+
+def test_watcher_reloads_in_background(question_dir):
+    path = qb.question_file(str(question_dir), 3)
+    questions = bank(question_dir).watch(interval=0.01)
+    try:
+        data = read_json(path)[:5]
+        write_json(path, data, 10 ** 18)
+        for _ in range(500):
+            if len(questions.questions(3)) == 5:
+                break
+            questions._stop.wait(0.01)
+        assert len(questions.questions(3)) == 5
+    finally:
+        questions.stop()
+
+
+def test_invalid_edit_keeps_compiled_version(question_dir):
+    qb.compile_questions(str(question_dir))
+    questions = bank(question_dir)
+    loaded = questions.stage(1)
+    assert isinstance(loaded, qb.CompiledStage)
+
+    path = qb.question_file(str(question_dir), 1)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{bozuk')
+    os.utime(path, ns=(10 ** 18, 10 ** 18))
+    assert questions.stage(1) is loaded
+    assert questions.stage(1) is loaded
+    assert len(questions.questions(1)) == len(loaded)
+    status = questions.status()['stages'][1]
+    assert status['source'] == 'compiled' and status['questions'] == len(loaded)
+    assert status['error'] and questions.failures == 1
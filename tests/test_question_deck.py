@@ -0,0 +1,60 @@
+import pytest
+
+import question_bank as qb
+from conftest import read_json, write_json
+
+
+@pytest.fixture
+def questions(tt, question_dir, monkeypatch):
+    """Uygulamanın soru bankasını geçici kopyayla değiştir"""
+    bank = qb.QuestionBank(str(question_dir), check_interval=0)
+    monkeypatch.setattr(tt, 'question_bank', bank)
+    return bank
+
+
+def rewrite(bank, stage, change, mtime_ns):
+    path = qb.question_file(bank.base_path, stage)
+    data = read_json(path)
+    change(data)
+    write_json(path, data, mtime_ns)
+    return data
+
+
+def draw(client, game, stage=1):
+    return client.get(f'/api/games/{game}/questions/{stage}').get_json()['question']['id']
+
+
+def test_deck_draws_every_question_once_per_cycle(client, game, questions):
+    ids = sorted(q['id'] for q in questions.questions(1))
+    assert sorted(draw(client, game) for _ in ids) == ids
+    assert sorted(draw(client, game) for _ in ids) == ids
+
+
+def test_deck_survives_reordering_and_reshuffles_on_new_ids(client, game, questions):
+    ids = sorted(q['id'] for q in questions.questions(1))
+    drawn = [draw(client, game) for _ in range(3)]
+
+    rewrite(questions, 1, list.reverse, 10 ** 18)
+    drawn += [draw(client, game) for _ in range(len(ids) - 3)]
+    assert sorted(drawn) == ids
+
+    data = rewrite(questions, 1, lambda data: data[0].update(id=1000), 2 * 10 ** 18)
+    drawn = [draw(client, game) for _ in range(len(ids))]
+    assert sorted(drawn) == sorted(q['id'] for q in data)
+
+
+def test_draw_sets_current_question(client, game, questions):
+    question_id = draw(client, game, 2)
+    state = client.get(f'/api/games/{game}/game-state').get_json()
+    assert (state['current_stage'], state['stage2_question_id']) == (2, question_id)
+
+    client.post(f'/api/games/{game}/stage2/option-state', json={'optionIndex': 1, 'state': 'D'})
+    state = client.get(f'/api/games/{game}/game-state').get_json()
+    assert state['stage2_option_states'] == {'1': 'D'}
+
+
+def test_reset_deck_starts_a_new_cycle(client, game, questions):
+    ids = sorted(q['id'] for q in questions.questions(3))
+    draw(client, game, 3)
+    assert client.post(f'/api/games/{game}/questions/3/reset-deck').get_json()['success']
+    assert sorted(draw(client, game, 3) for _ in ids) == ids
@@ -0,0 +1,100 @@
+import os
+import random
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+
+from conftest import ROOT, repo_questions
+from wheel_engine import SpinBuffer, WheelEngine
+
+
+def test_no_repeat_spins_cover_every_date_before_repeating():
+    questions = repo_questions(1)
+    dates = sorted({q['tarih'] for q in questions})
+    wheel = WheelEngine(no_repeat=True, rng=random.Random(1))
+    assert sorted(wheel.spin(1, 1, questions) for _ in dates) == dates
+    assert sorted(wheel.spin(1, 1, questions) for _ in dates) == dates
+
+
+def test_uniform_weighting_ignores_question_counts():
+    questions = repo_questions(1)
+    questions = questions + [dict(questions[0], id=1000 + i) for i in range(20)]
+    segments = WheelEngine(weighting='uniform').segments(1, questions)
+    assert set(segments.weights) == {1}
+    counts = Counter(WheelEngine(rng=random.Random(2)).spin(1, 1, questions) for _ in range(2000))
+    assert counts.most_common(1)[0][0] == questions[0]['tarih']
+    with pytest.raises(ValueError):
+        WheelEngine(weighting='rastgele')
+
+
+@pytest.mark.parametrize('stage', [4, -1, '1', True, False])
+def test_wheel_spin_rejects_unknown_stage(client, game, stage):
+    response = client.post(f'/api/games/{game}/wheel-spin', json={'stage': stage})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('body', [{'stage': 0}, {'stage': None}, {'user_id': 'reji'}])
+def test_wheel_spin_without_stage_uses_default(client, game, body):
+    # Reji bir etap başlatılmadan önce currentStage olarak 0 gönderir
+    response = client.post(f'/api/games/{game}/wheel-spin', json=body).get_json()
+    assert response['success'] and response['stage'] == 1
+
+
+def exported_spins(client, game):
+    return client.get(f'/api/games/{game}/wheel-spins/export').data.splitlines()
+
+
+def test_spins_are_exported_in_order(client, game):
+    spin_ids = [client.post(f'/api/games/{game}/wheel-spin', json={'stage': 2}).get_json()['spin_id']
+                for _ in range(3)]
+    assert spin_ids == sorted(spin_ids)
+    assert len(exported_spins(client, game)) == 3
+
+
+def test_reset_drops_buffered_spins(tt, client, game, monkeypatch):
+    other = client.post('/api/games', json={'name': 'diğer'}).get_json()['game']['id']
+    monkeypatch.setattr(tt.spin_buffer, 'interval', 60)
+    for game_id in (game, game, other):
+        assert client.post(f'/api/games/{game_id}/wheel-spin', json={'stage': 1}).get_json()['success']
+
+    assert client.post(f'/api/games/{game}/reset-game').get_json()['success']
+    assert exported_spins(client, game) == []
+    assert len(exported_spins(client, other)) == 1
+
+
+def test_failed_spin_flush_is_retried():
+    calls = []
+
+    def write(rows):
+        calls.append([row['id'] for row in rows])
+        if len(calls) == 1:
+            raise RuntimeError('veritabanı kilitli')
+        return calls[-1]
+
+    buffer = SpinBuffer(write, lambda: 41, interval=60)
+    ids = [buffer.add({'game_id': 1}) for _ in range(3)]
+    buffer.flush()
+    assert buffer.pending() == 3
+    buffer.add({'game_id': 1})
+    buffer.flush()
+    assert buffer.pending() == 0
+    assert calls == [ids, ids + [45]]
+
+
+def test_wheel_settings_come_from_environment():
+    env = dict(os.environ, TIMETUNNEL_WHEEL_WEIGHTING='uniform', TIMETUNNEL_WHEEL_NO_REPEAT='1',
+               TIMETUNNEL_LOG_LEVEL='WARNING')
+    output = subprocess.run([sys.executable, '-c', 'import app; print(app.wheel.weighting, app.wheel.no_repeat)'],
+                            cwd=ROOT, env=env, check=True, capture_output=True, text=True).stdout
+    assert output.split() == ['uniform', 'True']
+
+
+def test_spin_writes_stage_before_the_buffer_flushes(tt, client, game, monkeypatch):
+    monkeypatch.setattr(tt.spin_buffer, 'interval', 60)
+    client.get(f'/api/games/{game}/game-state')
+    assert client.post(f'/api/games/{game}/wheel-spin', json={'stage': 3}).get_json()['success']
+    assert client.get(f'/api/games/{game}/game-state').get_json()['current_stage'] == 3
+    with tt.app.app_context():
+        assert tt.db.session.query(tt.GameState.current_stage).filter_by(game_id=game).scalar() == 3
@@ -0,0 +1,9 @@
+"""Sunucu komut satırı.
+
+    python -m timetunnel serve --workers 1 --threads 32
+    python -m timetunnel dev
+"""
+from app import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""Çark motoru: etap başına önceden hesaplanmış dilim tablosu ve toplu yazılan çark kayıtları.
+
+Dilim tablosu etabın farklı tarihlerinden ve her tarihteki soru sayısından
+oluşur; soru dosyası değişmedikçe yeniden hesaplanmaz. Ağırlıklı seçim
+alias yöntemiyle O(1) yapılır. Tekrarsız modda her oyun/etap için tarihler
+ağırlıklı olarak bir kez karıştırılır ve sırayla çekilir; tüm tarihler
+çıkınca yeniden karıştırılır.
+"""
+import atexit
+import random
+import threading
+from collections import Counter
+
+from log_config import get_logger
+
+log = get_logger('wheel_engine')
+
+# Dilim ağırlıkları: 'questions' tarihin soru sayısı (her soruyu eşit olasılıkla
+# seçmekle aynı dağılım), 'uniform' her tarih eşit
+WEIGHTINGS = ('questions', 'uniform')
+
+FLUSH_SIZE = 50        # Bu kadar kayıt birikince hemen yazılır
+FLUSH_INTERVAL = 1.0   # Biriken kayıtlar en geç bu kadar saniyede bir yazılır
+
+
+class AliasTable:
+    """Vose alias yöntemiyle O(1) ağırlıklı örnekleme"""
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        self.size = n
+        self.prob = [w * n / total for w in weights]
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(self.prob) if p < 1.0]
+        large = [i for i, p in enumerate(self.prob) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.alias[s] = l
+            self.prob[l] += self.prob[s] - 1.0
+            (small if self.prob[l] < 1.0 else large).append(l)
+        # Yuvarlama artıkları her zaman kendini seçer
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def sample(self, rng=random):
+        i = int(rng.random() * self.size)
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class Segments:
+    """Bir etabın dilim tablosu: tarihler, soru sayıları ve örnekleme tablosu"""
+
+    def __init__(self, questions, weighting='questions'):
+        counts = Counter(q['tarih'] for q in questions)
+        self.dates = sorted(counts)
+        self.counts = [counts[date] for date in self.dates]
+        self.weights = self.counts if weighting == 'questions' else [1] * len(self.dates)
+        self.table = AliasTable(self.weights) if self.dates else None
+
+    def __len__(self):
+        return len(self.dates)
+
+    def sample(self, rng=random):
+        return self.dates[self.table.sample(rng)]
+
+    def shuffled(self, rng=random):
+        """Ağırlıklı rastgele permütasyon (Efraimidis-Spirakis anahtarları)"""
+        keys = [(rng.random() ** (1.0 / w), date) for date, w in zip(self.dates, self.weights)]
+        keys.sort(reverse=True)
+        return [date for _, date in keys]
+
+    def as_dict(self):
+        return [{'tarih': date, 'questions': count, 'weight': weight}
+                for date, count, weight in zip(self.dates, self.counts, self.weights)]
+
+
+class WheelEngine:
+    """Etapların dilim tablolarını önbellekte tutar ve çarkı çevirir"""
+
+    def __init__(self, weighting='questions', no_repeat=False, rng=None):
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f'Geçersiz çark ağırlığı: {weighting}')
+        self.weighting = weighting
+        self.no_repeat = no_repeat
+        self.rng = rng or random.Random()
+        self._segments = {}  # etap -> (soru kümesi, Segments)
+        self._decks = {}     # (oyun, etap) -> kalan tarihler (sondan çekilir)
+        self._lock = threading.Lock()
+
+    def segments(self, stage, questions):
+        """Etabın dilim tablosu; soru kümesi değiştiyse yeniden hesaplanır"""
+        cached = self._segments.get(stage)
+        if cached is not None and cached[0] is questions:
+            return cached[1]
+        segments = Segments(questions, self.weighting)
+        with self._lock:
+            self._segments[stage] = (questions, segments)
+            # Eski tablodan karıştırılmış desteler geçersiz
+            for key in [k for k in self._decks if k[1] == stage]:
+                del self._decks[key]
+        log.debug("%s. etap çark tablosu: %d dilim", stage, len(segments))
+        return segments
+
+    def spin(self, game_id, stage, questions):
+        """Çarkı çevir ve gelen tarihi döndür (soru yoksa None)"""
+        segments = self.segments(stage, questions)
+        if not segments:
+            return None
+        if not self.no_repeat:
+            return segments.sample(self.rng)
+        with self._lock:
+            deck = self._decks.get((game_id, stage))
+            if not deck:
+                deck = self._decks[(game_id, stage)] = segments.shuffled(self.rng)[::-1]
+            return deck.pop()
+
+    def reset(self, game_id):
+        """Oyunun tekrarsız destelerini sıfırla"""
+        with self._lock:
+            for key in [k for k in self._decks if k[0] == game_id]:
+                del self._decks[key]
+
+
+class SpinBuffer:
+    """Çark kayıtlarını bellekte biriktirip toplu olarak yazar.
+
+    Kayıt id'leri bellekte verilir (veritabanındaki en büyük id'den devam
+    edilir), böylece çevirme isteği yazmayı beklemez. ``write_func(rows)``
+    satırları tek transaction'da yazar. Birden fazla worker süreciyle id'ler
+    çakışacağı için ``enabled`` kapatılır; o durumda her kayıt hemen yazılır
+    ve id'yi veritabanı verir. Yazılamayan kayıtlar kaybolmaz, tamponun
+    başına geri konur ve sonraki yazmada tekrar denenir.
+    """
+
+    def __init__(self, write_func, last_id_func, max_items=FLUSH_SIZE, interval=FLUSH_INTERVAL):
+        self.write_func = write_func
+        self.last_id_func = last_id_func
+        self.max_items = max_items
+        self.interval = interval
+        self.enabled = True
+        self._rows = []
+        self._next_id = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='spin-flusher', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def add(self, row):
+        """Kaydı kuyruğa ekle ve id'sini döndür"""
+        if not self.enabled:
+            return self.write_func([row])[0]
+        self._ensure_started()
+        with self._lock:
+            if self._next_id is None:
+                self._next_id = (self.last_id_func() or 0) + 1
+            row['id'] = self._next_id
+            self._next_id += 1
+            self._rows.append(row)
+            full = len(self._rows) >= self.max_items
+        if full:
+            self._wakeup.set()
+        return row['id']
+
+    def flush(self):
+        """Biriken kayıtları yaz"""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return
+            try:
+                self.write_func(rows)
+            except Exception:
+                log.exception("%d çark kaydı yazılamadı, tekrar denenecek", len(rows))
+                with self._lock:
+                    self._rows[:0] = rows
+
+    def discard(self, game_id):
+        """Oyunun yazılmamış kayıtlarını at (oyun sıfırlanırken)"""
+        with self._lock:
+            self._rows = [row for row in self._rows if row['game_id'] != game_id]
+
+    def paused(self):
+        """Bu blok boyunca yazma yapılmaz; sıfırlama, yazılmakta olan bir toplu kayıtla yarışmaz"""
+        return self._flush_lock
+
+    def pending(self):
+        return len(self._rows)